@@ -17,6 +17,7 @@ matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
 import scipy.linalg
+import scipy.sparse
 import networkx as nx
 from fpdf import FPDF # Importar FPDF
 from flask_cors import CORS
@@ -39,12 +40,33 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 from src.database.db_manager import DatabaseManager
 from src.utils.file_loader import FileLoader
 from src.chemical.chemicalgraphs.atomic_graphs import AtomicGraphs
-from src.quantum.graph_circuit import generate_circuit_diagram_figure
+from src.quantum.graph_circuit import DIAGRAM_MODES
+from src.quantum.circuit_execution import parse_simulation_options
+from src.quantum.circuit_batch import MAX_BATCH_CIRCUITS, MAX_SYNC_BATCH_SHOTS, check_batch_budget
+from src.quantum.parameter_sweep import MAX_SYNC_SWEEP_SHOTS, build_parameter_table, check_sweep_budget
+from src.quantum.noise_profiles import list_noise_profiles
+from src.services.job_queue import JobQueue, QueueFullError
+from src.services.circuit_service import get_circuit_service
 import pandas as pd
 import numpy as np
 import seaborn as sns
 from src.math.matrix_tools import MatrixTools
+from src.math.matrix_batch import MatrixBatch
+from src.math.large_matrix import LargeMatrixTools, MemoryBudgetError
+from src.utils.array_transport import (encode_matrix, encode_npz, decode_matrix, decoded_nbytes,
+                                       encode_float32_base64, pack_float32_arrays, NPZ_MIMETYPE,
+                                       FLOAT32_PACK_MIMETYPE)
+from src.utils.sse import format_sse, paced, SSE_MIMETYPE, SSE_HEADERS
 from src.math.graph_tools import GraphTools
+from src.math.graph_session import (GraphSession, GraphSessionStore, MAX_SESSION_NODES, MAX_SESSION_EDGES,
+                                    MAX_DENSE_SESSION_NODES)
+from src.math.graph_analytics import GraphAnalytics
+from src.physics.wave_stream import traveling_wave_frames, packet_frames, evaluate_wave_type
+from src.physics.wave_spectrum import time_grid, analyze_spectrum
+from src.physics.electromagnetism import ElectroMagUtil
+from src.physics.nbody import NBodySimulation
+from src.physics.physics_batch import PhysicsBatch
+from src.physics.quantum_wave import PhysicsConstants
 
 # Create Flask app with custom template loading
 template_dirs = [
@@ -73,6 +95,11 @@ CORS(app)
 # Initialize database
 db_manager = DatabaseManager()
 file_loader = FileLoader()
+graph_sessions = GraphSessionStore()
+matrix_tools = MatrixTools()
+large_matrix_tools = LargeMatrixTools()
+circuit_jobs = JobQueue(max_workers=2, result_ttl=600)
+circuit_service = get_circuit_service()
 
 def format_python_code(code):
     """Format Python code with basic syntax highlighting."""
@@ -166,126 +193,346 @@ def load_circuit_file(filename):
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+def parse_diagram_mode(data):
+    """Diagram mode from a request ('auto' picks mpl, text or summary by circuit size)."""
+    mode = data.get('diagram') or 'auto'
+    if mode not in DIAGRAM_MODES:
+        raise ValueError(f"Unknown diagram mode: {mode}. Available: {', '.join(DIAGRAM_MODES)}")
+    return mode
+
+@app.route('/api/circuits/noise-profiles')
+def get_noise_profiles():
+    """Named noise profiles accepted by the 'noise' simulation option."""
+    return jsonify({'success': True, 'profiles': list_noise_profiles()})
+
 @app.route('/api/circuits/execute/<filename>')
 def execute_circuit(filename):
-    """Execute circuit file and return results."""
+    """
+    Execute circuit file and return results.
+
+    Query args: shots, seed, method, precision, noise, optimization_level,
+    basis and diagram.
+    """
     file_path = os.path.join(CIRCUITS_BASE_DIR, filename)
     
     try:
-        # Load and execute the circuit
-        circuit_data = file_loader.load_circuit_file(file_path)
-        circuit = circuit_data['circuit']
-        
-        # Create circuit diagram using the dedicated function
-        fig = generate_circuit_diagram_figure(circuit)
+        options = parse_simulation_options(request.args)
+        options['diagram_mode'] = parse_diagram_mode(request.args)
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
 
-        circuit_img = None
-        if fig:
-            try:
-                # Convert to base64
-                img_buffer = io.BytesIO()
-                fig.savefig(img_buffer, format='png', bbox_inches='tight', dpi=100)
-                img_buffer.seek(0)
-                circuit_img = base64.b64encode(img_buffer.getvalue()).decode()
-                print("[DEBUG-CIRCUIT] Circuit image generated successfully from fig.")
-            except Exception as e_fig_to_base64:
-                print(f"[DEBUG-CIRCUIT] Error converting figure to base64: {e_fig_to_base64}")
-                print(traceback.format_exc())
-                # Si la conversión de la figura falla, es un problema, no deberíamos continuar con una imagen vacía.
-                # Podríamos intentar generar una imagen de error aquí si es necesario.
-                # Por ahora, dejaremos circuit_img como None y el frontend no la mostrará.
-        else:
-            # Esto sucedería si generate_circuit_diagram_figure devuelve None o una figura de error
-            # que no queremos procesar como una imagen de circuito válida.
-            # O si devuelve una figura que ya es un error (como en tu código de graph_circuit.py)
-            # Necesitamos manejar esto con más gracia si la figura de error de generate_circuit_diagram_figure
-            # ya es una imagen que queremos mostrar.
-            # Por simplicidad ahora, si fig es None o ya es una fig de error, no intentamos convertirla.
-            # La lógica de generate_circuit_diagram_figure ya imprime errores.
-            print("[DEBUG-CIRCUIT] generate_circuit_diagram_figure did not return a valid figure for direct conversion.")
-            # Si generate_circuit_diagram_figure devuelve una figura de error pre-renderizada,
-            # podríamos intentar convertirla aquí también. Pero el código original ya hace un fallback.
-            # Vamos a intentar generar una imagen de texto como fallback si fig es None.
-            if fig is None: # Solo si es None, si es una figura de error, ya se manejo.
-                fallback_fig = Figure(figsize=(12, 6), dpi=100)
-                ax_fallback = fallback_fig.add_subplot(111)
-                ax_fallback.text(0.5, 0.5, str(circuit), transform=ax_fallback.transAxes, 
-                       fontsize=10, ha='center', va='center', fontfamily='monospace')
-                ax_fallback.set_title("Circuit Text Representation (Fallback)", fontsize=14)
-                ax_fallback.axis('off')
-                img_buffer = io.BytesIO()
-                fallback_fig.savefig(img_buffer, format='png', bbox_inches='tight', dpi=100)
-                img_buffer.seek(0)
-                circuit_img = base64.b64encode(img_buffer.getvalue()).decode()
-                print("[DEBUG-CIRCUIT] Fallback text representation image generated.")
-
-        # Execute circuit if it has measurements
-        result_img = None
-        result_text = ""
-        
-        if circuit.num_clbits > 0:
-            try:
-                from qiskit import transpile
-                from qiskit_aer import AerSimulator
-                
-                simulator = AerSimulator()
-                transpiled_circuit = transpile(circuit, simulator)
-                job = simulator.run(transpiled_circuit, shots=1024)
-                result = job.result()
-                counts = result.get_counts()
-                
-                # Create histogram
-                result_fig = Figure(figsize=(10, 6), dpi=100)
-                result_ax = result_fig.add_subplot(111)
-                
-                states = list(counts.keys())
-                values = list(counts.values())
-                
-                bars = result_ax.bar(states, values, color='skyblue', edgecolor='navy', alpha=0.7)
-                result_ax.set_xlabel('Measurement States', fontsize=12)
-                result_ax.set_ylabel('Counts', fontsize=12)
-                result_ax.set_title('Measurement Results', fontsize=14, fontweight='bold')
-                result_ax.grid(True, alpha=0.3)
-                
-                # Add value labels on bars
-                for bar, value in zip(bars, values):
-                    height = bar.get_height()
-                    result_ax.text(bar.get_x() + bar.get_width()/2., height + 0.01*max(values),
-                                 f'{value}', ha='center', va='bottom', fontweight='bold')
-                
-                result_fig.tight_layout()
-                
-                # Convert to base64
-                result_buffer = io.BytesIO()
-                result_fig.savefig(result_buffer, format='png', bbox_inches='tight', dpi=100)
-                result_buffer.seek(0)
-                result_img = base64.b64encode(result_buffer.getvalue()).decode()
-                
-                # Create text summary
-                total_shots = sum(values)
-                result_text = f"Total shots: {total_shots}\nMeasurement probabilities:\n"
-                for state, count in counts.items():
-                    probability = count / total_shots
-                    result_text += f"  |{state}⟩: {count}/{total_shots} ({probability:.3f})\n"
-                    
-            except Exception as e:
-                result_text = f"Execution error: {str(e)}"
-        
+    try:
+        result = circuit_service.execute_file(file_path, **options)
         plt.close('all')  # Clean up
-        
-        return jsonify({
-            'success': True,
-            'circuit_info': f"Circuit: {circuit.num_qubits} qubits, {circuit.num_clbits} classical bits",
-            'circuit_image': circuit_img,
-            'result_image': result_img,
-            'result_text': result_text
-        })
+        return jsonify({'success': True, **result})
         
     except Exception as e:
         print(f"[ERROR] execute_circuit failed for {filename}: {e}")
         print(traceback.format_exc())
         return jsonify({'success': False, 'error': str(e)})
 
+def run_circuit_job(job, file_path, options):
+    """Job body for /api/circuits/jobs: the execute pipeline with progress reported to the job."""
+    try:
+        return circuit_service.execute_file(file_path, progress=job.report, **options)
+    finally:
+        plt.close('all')
+
+@app.route('/api/circuits/jobs', methods=['POST'])
+def submit_circuit_job():
+    """
+    Queue a circuit execution and return its job ID without waiting.
+
+    JSON body: filename, optional priority (-10..10, higher runs first),
+    simulation options (shots, seed, method, precision, noise,
+    optimization_level, basis), diagram mode and force (re-run even if an
+    unexpired result for the same file version and options is stored). Poll /api/circuits/jobs/<job_id> or follow .../events (SSE).
+    """
+    data = request.get_json() or {}
+    filename = os.path.basename(data.get('filename', ''))
+    file_path = os.path.join(CIRCUITS_BASE_DIR, filename)
+    if not filename or not os.path.isfile(file_path):
+        return jsonify({'success': False, 'error': f"Circuit file '{filename}' not found"}), 404
+
+    try:
+        priority = min(max(int(data.get('priority', 0)), -10), 10)
+        options = parse_simulation_options(data)
+        options['diagram_mode'] = parse_diagram_mode(data)
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    # Same file contents and options -> same result, so refreshes reuse the stored job
+    key = ('execute', filename, os.path.getmtime(file_path), tuple(sorted(options.items())))
+    job = None if data.get('force') else circuit_jobs.find(key)
+    reused = job is not None
+    if job is None:
+        try:
+            job = circuit_jobs.submit(run_circuit_job, file_path, options, priority=priority, name=filename, key=key)
+        except QueueFullError as e:
+            return jsonify({'success': False, 'error': str(e)}), 503
+
+    print(f"[DEBUG-CIRCUIT] Job {job.id} for {filename}: {'reused' if reused else 'queued'} (priority {priority})")
+    return jsonify({'success': True, 'reused': reused, **job.to_dict()}), 200 if reused else 202
+
+@app.route('/api/circuits/jobs', methods=['GET'])
+def list_circuit_jobs():
+    """Status of every job still held by the queue, newest first."""
+    jobs = sorted(circuit_jobs.jobs(), key=lambda job: job.created_at, reverse=True)
+    return jsonify({'success': True, 'jobs': [job.to_dict() for job in jobs]})
+
+@app.route('/api/circuits/jobs/<job_id>', methods=['GET'])
+def get_circuit_job(job_id):
+    """Job status and progress, plus the execution result once completed."""
+    job = circuit_jobs.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found or expired'}), 404
+    return jsonify({'success': True, **job.to_dict(include_result=True)})
+
+@app.route('/api/circuits/jobs/<job_id>', methods=['DELETE'])
+def cancel_circuit_job(job_id):
+    """Cancel a queued job, or stop a running one at its next stage boundary."""
+    job = circuit_jobs.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found or expired'}), 404
+    if not circuit_jobs.cancel(job_id):
+        return jsonify({'success': False, 'error': f'Job already {job.status}'}), 409
+    return jsonify({'success': True, **job.to_dict()})
+
+@app.route('/api/circuits/jobs/<job_id>/events')
+def circuit_job_events(job_id):
+    """Server-Sent Events: a 'status' event per change and a final 'done' event with the result."""
+    job = circuit_jobs.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found or expired'}), 404
+
+    def generate():
+        version = -1
+        while True:
+            if job.version != version:
+                version = job.version
+                if job.finished:
+                    yield format_sse(job.to_dict(include_result=True), event='done', event_id=version)
+                    return
+                yield format_sse(job.to_dict(), event='status', event_id=version)
+            elif not circuit_jobs.wait_for_change(job, version, timeout=15):
+                yield ': keep-alive\n\n'
+
+    return Response(generate(), mimetype=SSE_MIMETYPE, headers=SSE_HEADERS)
+
+def run_batch_job(job, file_paths, options):
+    """Job body for asynchronous circuit batches."""
+    return circuit_service.batch(file_paths, progress=job.report, **options)
+
+@app.route('/api/circuits/batch', methods=['POST'])
+def batch_circuits_api():
+    """
+    Run several circuit files in one request and return per-circuit counts.
+
+    JSON body: filenames (defaults to every .py file in the circuits
+    directory), simulation options (shots, seed, method, precision, noise,
+    optimization_level, basis) and async (queue as a job and return its ID
+    instead). Circuits sharing a target and qubit count are transpiled
+    together and every method gets a single multi-experiment simulator run. Files that fail to load or have
+    nothing to sample are listed under 'skipped'. Batches above
+    MAX_SYNC_BATCH_SHOTS total shots (circuits x shots) are always queued as
+    jobs ('forced_async' in the response).
+    """
+    data = request.get_json() or {}
+    filenames = data.get('filenames')
+    if filenames is None:
+        filenames = sorted(name for name in os.listdir(CIRCUITS_BASE_DIR) if name.endswith('.py'))
+    if not isinstance(filenames, list) or not filenames:
+        return jsonify({'success': False, 'error': 'filenames must be a non-empty list'}), 400
+    if len(filenames) > MAX_BATCH_CIRCUITS:
+        return jsonify({'success': False,
+                        'error': f"Batch has {len(filenames)} circuits, the limit is {MAX_BATCH_CIRCUITS}"}), 400
+
+    filenames = list(dict.fromkeys(os.path.basename(str(name)) for name in filenames))
+    missing = [name for name in filenames if not os.path.isfile(os.path.join(CIRCUITS_BASE_DIR, name))]
+    if missing:
+        return jsonify({'success': False, 'error': f"Circuit file(s) not found: {', '.join(missing)}"}), 404
+    file_paths = [os.path.join(CIRCUITS_BASE_DIR, name) for name in filenames]
+
+    try:
+        options = parse_simulation_options(data)
+        total_shots = check_batch_budget(len(file_paths), options['shots'])
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    forced_async = not data.get('async') and total_shots > MAX_SYNC_BATCH_SHOTS
+    if data.get('async') or forced_async:
+        key = ('batch', tuple((path, os.path.getmtime(path)) for path in file_paths), tuple(sorted(options.items())))
+        job = circuit_jobs.find(key)
+        reused = job is not None
+        if job is None:
+            try:
+                job = circuit_jobs.submit(run_batch_job, file_paths, options,
+                                          name=f"batch:{len(file_paths)} circuits", key=key)
+            except QueueFullError as e:
+                return jsonify({'success': False, 'error': str(e)}), 503
+        return jsonify({'success': True, 'reused': reused, 'forced_async': forced_async,
+                        'total_shots': total_shots, **job.to_dict()}), 200 if reused else 202
+
+    try:
+        batch = circuit_service.batch(file_paths, **options)
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        print(f"[ERROR] batch_circuits_api failed: {e}")
+        print(traceback.format_exc())
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+    simulation = batch['simulation']
+    print(f"[DEBUG-CIRCUIT] Batch of {simulation['circuits']} circuits in {len(batch['groups'])} groups: "
+          f"transpile {simulation['transpile_time']:.3f}s, simulate {simulation['simulation_time']:.3f}s")
+    return jsonify({'success': True, **batch})
+
+def sweep_to_json(sweep):
+    """JSON-ready form of a run_parameter_sweep result."""
+    return {
+        'parameters': sweep['parameters'],
+        'values': sweep['values'].tolist(),
+        'outcomes': sweep['outcomes'],
+        'counts': sweep['counts'].tolist(),
+        'simulation': sweep['simulation']
+    }
+
+def run_sweep_job(job, file_path, parameters, mode, options):
+    """Job body for asynchronous parameter sweeps."""
+    artifact = circuit_service.load_file(file_path)
+    return sweep_to_json(circuit_service.sweep(artifact, parameters, mode=mode, progress=job.report, **options))
+
+@app.route('/api/circuits/sweep', methods=['POST'])
+def sweep_circuit_api():
+    """
+    Run a Parameter-based circuit for many parameter sets in one batched simulation.
+
+    JSON body: filename, parameters ({name: [values] or {start, stop, num}}),
+    mode ('zip' or 'product'), simulation options (shots, seed, method,
+    precision, noise, optimization_level, basis), format ('json' or 'binary'
+    float32 pack with values and counts arrays) and async (queue as a job and return its ID instead).
+    Counts come back as a (sets x outcomes) table next to the outcome bitstrings.
+    Sweeps above MAX_SYNC_SWEEP_SHOTS total shots (sets x shots) are always
+    queued as jobs ('forced_async' in the response).
+    """
+    data = request.get_json() or {}
+    filename = os.path.basename(data.get('filename', ''))
+    file_path = os.path.join(CIRCUITS_BASE_DIR, filename)
+    if not filename or not os.path.isfile(file_path):
+        return jsonify({'success': False, 'error': f"Circuit file '{filename}' not found"}), 404
+
+    parameters = data.get('parameters') or {}
+    mode = data.get('mode', 'zip')
+    try:
+        options = parse_simulation_options(data)
+        artifact = circuit_service.load_file(file_path)
+        table = build_parameter_table(artifact.circuit, parameters, mode)
+        total_shots = check_sweep_budget(len(next(iter(table.values()), ())), options['shots'])
+    except (AttributeError, TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        print(f"[ERROR] sweep_circuit_api failed for {filename}: {e}")
+        print(traceback.format_exc())
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+    forced_async = not data.get('async') and total_shots > MAX_SYNC_SWEEP_SHOTS
+    if data.get('async') or forced_async:
+        key = ('sweep', filename, os.path.getmtime(file_path), json.dumps(parameters, sort_keys=True), mode,
+               tuple(sorted(options.items())))
+        job = circuit_jobs.find(key)
+        reused = job is not None
+        if job is None:
+            try:
+                job = circuit_jobs.submit(run_sweep_job, file_path, parameters, mode, options,
+                                          name=f"sweep:{filename}", key=key)
+            except QueueFullError as e:
+                return jsonify({'success': False, 'error': str(e)}), 503
+        return jsonify({'success': True, 'reused': reused, 'forced_async': forced_async,
+                        'total_shots': total_shots, **job.to_dict()}), 200 if reused else 202
+
+    try:
+        sweep = circuit_service.sweep(artifact, parameters, mode=mode, **options)
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        print(f"[ERROR] sweep_circuit_api failed for {filename}: {e}")
+        print(traceback.format_exc())
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+    simulation = sweep['simulation']
+    print(f"[DEBUG-CIRCUIT] Sweep {filename}: {simulation['num_sets']} sets x {simulation['shots']} shots, "
+          f"{simulation['method']} in {simulation['simulation_time']:.3f}s")
+
+    if data.get('format') == 'binary':
+        payload = pack_float32_arrays(
+            {'values': sweep['values'], 'counts': sweep['counts']},
+            {'success': True, 'parameters': sweep['parameters'], 'outcomes': sweep['outcomes'],
+             'simulation': simulation}
+        )
+        response = make_response(payload)
+        response.headers['Content-Type'] = FLOAT32_PACK_MIMETYPE
+        return response
+
+    return jsonify({'success': True, **sweep_to_json(sweep)})
+
+@app.route('/api/circuits/state', methods=['POST'])
+def circuit_state_api():
+    """
+    Exact outputs of a circuit without shot sampling.
+
+    JSON body: filename, outputs (any of 'statevector', 'probabilities',
+    'expectation'), observables (Pauli labels such as "ZZ" or lists of
+    [label, coefficient] terms), method, precision and format. With
+    format 'binary' the arrays come as a float32 pack: 'statevector' is
+    complex64 viewed as interleaved (real, imag) float32 pairs.
+    """
+    data = request.get_json() or {}
+    filename = os.path.basename(data.get('filename', ''))
+    file_path = os.path.join(CIRCUITS_BASE_DIR, filename)
+    if not filename or not os.path.isfile(file_path):
+        return jsonify({'success': False, 'error': f"Circuit file '{filename}' not found"}), 404
+
+    try:
+        options = parse_simulation_options(data)
+        artifact = circuit_service.load_file(file_path)
+        if artifact.circuit.parameters:
+            raise ValueError("Circuit has unbound parameters; use /api/circuits/sweep")
+        exact = circuit_service.exact(artifact, data.get('outputs') or ['probabilities'],
+                                      observables=data.get('observables'),
+                                      method=options['method'], precision=options['precision'])
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        print(f"[ERROR] circuit_state_api failed for {filename}: {e}")
+        print(traceback.format_exc())
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+    simulation = exact['simulation']
+    print(f"[DEBUG-CIRCUIT] Exact outputs for {filename}: {simulation['num_qubits']} qubits, "
+          f"{simulation['method']} in {simulation['simulation_time']:.3f}s")
+    metadata = {'success': True, 'simulation': simulation}
+    if 'expectation_values' in exact:
+        metadata['expectation_values'] = exact['expectation_values']
+
+    if data.get('format') == 'binary':
+        arrays = {}
+        if 'statevector' in exact:
+            # The pack is float32 by design; JSON output keeps the requested precision
+            arrays['statevector'] = exact['statevector'].astype(np.complex64).view(np.float32).reshape(-1, 2)
+            metadata['statevector_dtype'] = 'complex64'
+        if 'probabilities' in exact:
+            arrays['probabilities'] = exact['probabilities']
+        response = make_response(pack_float32_arrays(arrays, metadata))
+        response.headers['Content-Type'] = FLOAT32_PACK_MIMETYPE
+        return response
+
+    if 'statevector' in exact:
+        metadata['statevector'] = {'real': exact['statevector'].real.tolist(),
+                                   'imag': exact['statevector'].imag.tolist()}
+    if 'probabilities' in exact:
+        metadata['probabilities'] = exact['probabilities'].tolist()
+    return jsonify(metadata)
+
 @app.route('/api/graphics/files')
 def get_graphics_files():
     """Get list of available graphics files."""
@@ -678,38 +925,97 @@ def visualize_element(atomic_number):
 # Waves Module Routes
 @app.route('/api/waves/generate', methods=['POST'])
 def generate_wave():
-    """Generate quantum wave visualization."""
+    """
+    Generate quantum wave visualization.
+
+    "samples" sets the resolution (16 to 1,000,000). The spectrum uses
+    rfft (samples // 2 bins, as before), or a Welch PSD above 8192 samples
+    ("spectrum": "fft"/"welch"/"auto", "window": rectangular/hann/hamming/blackman).
+
+    With "format": "binary" the plots are skipped and the arrays (t, wave,
+    derivative, frequencies, magnitude, energy) are returned as packed
+    little-endian float32 with the title, info text and stats in the header,
+    for the browser to draw itself.
+    """
     try:
         data = request.get_json()
         frequency = data.get('frequency', 1.0)
         amplitude = data.get('amplitude', 1.0)
         phase = data.get('phase', 0.0)
         wave_type = data.get('wave_type', 'sine')
+        output_format = data.get('format', 'png')
+        samples = min(max(int(data.get('samples', 1000)), 16), 1_000_000)
+        spectrum_method = data.get('spectrum', 'auto')
+        window_name = data.get('window', 'rectangular')
         
-        # Create wave visualization
-        fig = Figure(figsize=(12, 8), dpi=100)
-        fig.patch.set_facecolor('white')
-        
-        # Time array for quantum-scale visualization
-        t = np.linspace(0, 4 * np.pi, 1000)
+        # Time array for quantum-scale visualization (cached per sample count)
+        t = time_grid(samples)
+        spacing = t[1] - t[0]
         
-        # Calculate wave based on type
-        if wave_type == 'sine':
-            wave = amplitude * np.sin(frequency * t + phase * np.pi)
-            wave_title = f"Quantum Sine Wave (f={frequency}Hz, A={amplitude}, φ={phase}π)"
-        elif wave_type == 'cosine':
-            wave = amplitude * np.cos(frequency * t + phase * np.pi)
-            wave_title = f"Quantum Cosine Wave (f={frequency}Hz, A={amplitude}, φ={phase}π)"
-        elif wave_type == 'square':
-            wave = amplitude * np.sign(np.sin(frequency * t + phase * np.pi))
-            wave_title = f"Quantum Square Wave (f={frequency}Hz, A={amplitude}, φ={phase}π)"
-        elif wave_type == 'probability':
-            wave = amplitude * np.sin(frequency * t + phase * np.pi)**2
-            wave_title = f"Quantum Probability Wave (f={frequency}Hz, A={amplitude}, φ={phase}π)"
+        # Calculate wave based on type (in place over the phase argument)
+        wave = frequency * t
+        wave += phase * np.pi
+        evaluate_wave_type(wave_type, wave, amplitude, out=wave)
+        type_names = {'sine': 'Sine', 'cosine': 'Cosine', 'square': 'Square', 'probability': 'Probability'}
+        if wave_type in type_names:
+            wave_title = f"Quantum {type_names[wave_type]} Wave (f={frequency}Hz, A={amplitude}, φ={phase}π)"
         else:
-            wave = amplitude * np.sin(frequency * t + phase * np.pi)
             wave_title = f"Default Quantum Wave (f={frequency}Hz, A={amplitude}, φ={phase}π)"
         
+        # Derived series: phase space, spectrum (rfft or Welch) and energy
+        derivative = np.gradient(wave, spacing)
+        spectrum = analyze_spectrum(wave, spacing, method=spectrum_method, window_name=window_name)
+        energy = np.square(wave)
+        
+        # Calculate wave properties
+        max_amplitude = np.max(np.abs(wave))
+        rms_value = np.sqrt(np.mean(wave**2))
+        total_energy = np.sum(energy)
+        
+        info_text = f"""Wave Analysis:
+Type: {wave_type.capitalize()}
+Frequency: {frequency} Hz
+Amplitude: {amplitude}
+Phase: {phase}π radians
+Maximum Amplitude: {max_amplitude:.3f}
+RMS Value: {rms_value:.3f}
+Total Energy: {total_energy:.3f}
+Period: {2*np.pi/frequency:.3f} quantum units
+Samples: {samples}"""
+        
+        # Data-only mode: the client renders the plots
+        if output_format == 'binary':
+            payload = pack_float32_arrays(
+                {
+                    't': t,
+                    'wave': wave,
+                    'derivative': derivative,
+                    'frequencies': spectrum['frequencies'],
+                    'magnitude': spectrum['values'],
+                    'energy': energy
+                },
+                {
+                    'success': True,
+                    'wave_type': wave_type,
+                    'title': wave_title,
+                    'info_text': info_text,
+                    'samples': samples,
+                    'spectrum': {'method': spectrum['method'], 'kind': spectrum['kind'], 'window': window_name},
+                    'stats': {
+                        'max_amplitude': float(max_amplitude),
+                        'rms_value': float(rms_value),
+                        'total_energy': float(total_energy)
+                    }
+                }
+            )
+            response = make_response(payload)
+            response.headers['Content-Type'] = FLOAT32_PACK_MIMETYPE
+            return response
+        
+        # Create wave visualization
+        fig = Figure(figsize=(12, 8), dpi=100)
+        fig.patch.set_facecolor('white')
+        
         # Create subplots
         ax1 = fig.add_subplot(2, 2, 1)
         ax1.plot(t, wave, 'b-', linewidth=2, label=f'{wave_type.capitalize()} Wave')
@@ -721,7 +1027,6 @@ def generate_wave():
         
         # Phase space representation
         ax2 = fig.add_subplot(2, 2, 2)
-        derivative = np.gradient(wave, t)
         ax2.plot(wave, derivative, 'r-', linewidth=2, alpha=0.7)
         ax2.set_xlabel('Position')
         ax2.set_ylabel('Momentum')
@@ -730,18 +1035,18 @@ def generate_wave():
         
         # Frequency spectrum
         ax3 = fig.add_subplot(2, 2, 3)
-        fft_wave = np.fft.fft(wave)
-        frequencies = np.fft.fftfreq(len(t), t[1] - t[0])
-        magnitude = np.abs(fft_wave)
-        ax3.plot(frequencies[:len(frequencies)//2], magnitude[:len(magnitude)//2], 'g-', linewidth=2)
+        ax3.plot(spectrum['frequencies'], spectrum['values'], 'g-', linewidth=2)
         ax3.set_xlabel('Frequency (Hz)')
-        ax3.set_ylabel('Magnitude')
-        ax3.set_title('Frequency Spectrum')
+        if spectrum['kind'] == 'psd':
+            ax3.set_ylabel('Power Spectral Density')
+            ax3.set_title('Frequency Spectrum (Welch)')
+        else:
+            ax3.set_ylabel('Magnitude')
+            ax3.set_title('Frequency Spectrum')
         ax3.grid(True, alpha=0.3)
         
         # Energy distribution
         ax4 = fig.add_subplot(2, 2, 4)
-        energy = wave**2
         ax4.fill_between(t, energy, alpha=0.6, color='purple')
         ax4.plot(t, energy, 'purple', linewidth=2)
         ax4.set_xlabel('Time (quantum units)')
@@ -759,21 +1064,6 @@ def generate_wave():
         
         plt.close('all')
         
-        # Calculate wave properties
-        max_amplitude = np.max(np.abs(wave))
-        rms_value = np.sqrt(np.mean(wave**2))
-        total_energy = np.sum(energy)
-        
-        info_text = f"""Wave Analysis:
-Type: {wave_type.capitalize()}
-Frequency: {frequency} Hz
-Amplitude: {amplitude}
-Phase: {phase}π radians
-Maximum Amplitude: {max_amplitude:.3f}
-RMS Value: {rms_value:.3f}
-Total Energy: {total_energy:.3f}
-Period: {2*np.pi/frequency:.3f} quantum units"""
-        
         return jsonify({
             'success': True,
             'plot_image': plot_img,
@@ -783,6 +1073,328 @@ Period: {2*np.pi/frequency:.3f} quantum units"""
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/api/waves/stream')
+def stream_wave():
+    """
+    Stream animation frames over Server-Sent Events.
+
+    Query parameters: frequency, amplitude, phase, wave_type ('packet' runs
+    the Schrödinger wave packet simulation), potential (packet only), fps
+    (1-60), frames (max 3600) and points. Each 'frame' event carries the
+    values as base64 float32.
+    """
+    try:
+        frequency = float(request.args.get('frequency', 1.0))
+        amplitude = float(request.args.get('amplitude', 1.0))
+        phase = float(request.args.get('phase', 0.0))
+        wave_type = request.args.get('wave_type', 'sine')
+        fps = min(max(float(request.args.get('fps', 30)), 1.0), 60.0)
+        num_frames = min(max(int(request.args.get('frames', 300)), 1), 3600)
+        points = min(max(int(request.args.get('points', 512)), 16), 8192)
+        if frequency <= 0:
+            raise ValueError("Frequency must be positive")
+        if wave_type == 'packet':
+            simulation, frames = packet_frames(frequency, num_frames=num_frames, points=points,
+                                               potential=request.args.get('potential', 'free'))
+            meta = {'wave_type': wave_type, 'grid': simulation.grid_info(), 'fps': fps, 'frames': num_frames}
+        else:
+            frames = traveling_wave_frames(frequency, amplitude, phase, wave_type, points=points,
+                                           num_frames=num_frames, time_per_frame=1.0 / fps)
+            meta = {'wave_type': wave_type, 'x_range': [0.0, 4 * np.pi], 'points': points,
+                    'fps': fps, 'frames': num_frames, 'amplitude': amplitude}
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    print(f"[DEBUG-WAVES] Streaming {num_frames} '{wave_type}' frames at {fps} fps")
+
+    def generate():
+        yield format_sse(meta, event='meta')
+        try:
+            for frame in paced(frames, fps):
+                payload = {key: value for key, value in frame.items() if key != 'values'}
+                payload['values'] = encode_float32_base64(frame['values'])
+                yield format_sse(payload, event='frame', event_id=frame['frame'])
+            yield format_sse({'frames': num_frames}, event='end')
+        except Exception as e:
+            yield format_sse({'error': str(e)}, event='error')
+
+    return Response(generate(), mimetype=SSE_MIMETYPE, headers=SSE_HEADERS)
+
+# Physics Module Routes
+def parse_point_charges(data):
+    """Read charges as [{q, x, y}, ...] or as parallel 'charges' and 'positions' lists."""
+    charges = data.get('charges', [])
+    if charges and isinstance(charges[0], dict):
+        values = [float(c['q']) for c in charges]
+        positions = [(float(c['x']), float(c['y'])) for c in charges]
+    else:
+        values = [float(c) for c in charges]
+        positions = [(float(p[0]), float(p[1])) for p in data.get('positions', [])]
+    if not values:
+        raise ValueError("At least one charge is required")
+    if len(values) != len(positions):
+        raise ValueError("Each charge needs exactly one (x, y) position")
+    return values, positions
+
+@app.route('/api/physics/field-map', methods=['POST'])
+def field_map_api():
+    """
+    Electric field and potential map for a set of point charges.
+
+    JSON body: charges ([{q, x, y}] or 'charges' + 'positions'), bounds
+    [xmin, xmax, ymin, ymax] (default: around the charges), resolution
+    (int or [nx, ny], max 2000), dtype ('float64'/'float32'), field_lines
+    (lines per charge, 1-256, at most 2048 lines in total: traced field
+    lines instead of streamlines) and format ('png' or 'binary' for packed
+    float32 Ex, Ey, potential, x and y). At most 1000 charges.
+    """
+    print("[DEBUG-PHYSICS] API /api/physics/field-map called")
+    try:
+        data = request.get_json()
+        charges, positions = parse_point_charges(data)
+        if len(charges) > 1000:
+            return jsonify({'success': False, 'error': 'At most 1000 charges are supported.'})
+        resolution = data.get('resolution', 200)
+        nx_points, ny_points = (resolution, resolution) if isinstance(resolution, int) else resolution
+        nx_points, ny_points = int(nx_points), int(ny_points)
+        if not (2 <= nx_points <= 2000 and 2 <= ny_points <= 2000):
+            return jsonify({'success': False, 'error': 'Resolution must be between 2 and 2000 per axis.'})
+
+        bounds = data.get('bounds')
+        if bounds is None:
+            coordinates = np.asarray(positions)
+            margin = max(1.0, 0.5 * float(np.ptp(coordinates, axis=0).max()))
+            low = coordinates.min(axis=0) - margin
+            high = coordinates.max(axis=0) + margin
+            bounds = [low[0], high[0], low[1], high[1]]
+        x_min, x_max, y_min, y_max = (float(b) for b in bounds)
+        x = np.linspace(x_min, x_max, nx_points)
+        y = np.linspace(y_min, y_max, ny_points)
+
+        start = time.time()
+        field = ElectroMagUtil.calculate_field_grid(charges, positions, x, y,
+                                                    dtype=data.get('dtype', 'float64'))
+        elapsed = time.time() - start
+        magnitude = np.hypot(field['Ex'], field['Ey'])
+        stats = {
+            'grid': [ny_points, nx_points],
+            'charges': len(charges),
+            'max_field': float(magnitude.max()),
+            'min_potential': float(field['potential'].min()),
+            'max_potential': float(field['potential'].max()),
+            'chunk_size': field['chunk_size'],
+            'compute_time': elapsed
+        }
+        print(f"[DEBUG-PHYSICS] Field grid {ny_points}x{nx_points} for {len(charges)} charges in {elapsed:.3f}s")
+
+        if data.get('format') == 'binary':
+            payload = pack_float32_arrays(
+                {'x': x, 'y': y, 'Ex': field['Ex'], 'Ey': field['Ey'], 'potential': field['potential']},
+                {'success': True, 'bounds': [x_min, x_max, y_min, y_max], 'stats': stats}
+            )
+            response = make_response(payload)
+            response.headers['Content-Type'] = FLOAT32_PACK_MIMETYPE
+            return response
+
+        fig = Figure(figsize=(10, 8), dpi=100)
+        ax = fig.add_subplot(1, 1, 1)
+
+        # Potential on a signed log scale so both polarities stay visible
+        potential = field['potential'].astype(float)
+        scale = max(np.percentile(np.abs(potential), 5), 1e-30)
+        shaded = np.sign(potential) * np.log10(1 + np.abs(potential) / scale)
+        limit = float(np.abs(shaded).max()) or 1.0
+        image = ax.imshow(shaded, extent=[x_min, x_max, y_min, y_max], origin='lower',
+                          cmap='RdBu_r', vmin=-limit, vmax=limit, aspect='auto')
+        fig.colorbar(image, ax=ax, label='sign(V) · log₁₀(1 + |V|/V₀)')
+
+        lines_per_charge = data.get('field_lines')
+        if lines_per_charge:
+            # Field lines integrated from the charges (RK45, all lines batched); every line
+            # preallocates its whole path, so the total is capped at 2048 lines
+            lines_per_charge = min(max(int(lines_per_charge), 1), 256, max(1, 2048 // len(charges)))
+            traced = ElectroMagUtil.trace_field_lines(charges, positions, lines_per_charge,
+                                                      bounds=(x_min, x_max, y_min, y_max))
+            for line in traced['field_lines']:
+                ax.plot(line['x'], line['y'], color='black', linewidth=0.7)
+            stats['field_lines'] = len(traced['field_lines'])
+        else:
+            # Streamlines on a coarser grid (streamplot cost grows with the grid)
+            step_x = max(1, nx_points // 80)
+            step_y = max(1, ny_points // 80)
+            ax.streamplot(x[::step_x], y[::step_y], field['Ex'][::step_y, ::step_x].astype(float),
+                          field['Ey'][::step_y, ::step_x].astype(float), color='black',
+                          linewidth=0.6, density=1.5, arrowsize=0.8)
+
+        for value, (cx, cy) in zip(charges, positions):
+            ax.scatter(cx, cy, s=120, c='red' if value > 0 else 'blue', edgecolors='black', zorder=3)
+        ax.set_xlim(x_min, x_max)
+        ax.set_ylim(y_min, y_max)
+        ax.set_xlabel('x (m)')
+        ax.set_ylabel('y (m)')
+        ax.set_title(f'Electric Field Map ({len(charges)} charges)')
+        fig.tight_layout()
+
+        img_buffer = io.BytesIO()
+        fig.savefig(img_buffer, format='png', bbox_inches='tight', dpi=100)
+        img_buffer.seek(0)
+        plot_img = base64.b64encode(img_buffer.getvalue()).decode()
+        plt.close('all')
+
+        return jsonify({'success': True, 'plot_image': plot_img, 'stats': stats})
+
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)})
+    except Exception as e:
+        print(f"[DEBUG-PHYSICS] Error in field map: {str(e)}")
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/physics/nbody/stream', methods=['GET', 'POST'])
+def nbody_stream_api():
+    """
+    Run an N-body simulation and stream its trajectory in chunks (SSE framing).
+
+    JSON body (POST) or query parameters (GET): preset ('plummer', 'disk' or,
+    POST only, 'custom' with positions, velocities and masses), num_bodies
+    (2-50000), G, time_step, softening, method ('auto', 'direct',
+    'barnes_hut'), theta, seed, frames (max 5000), steps_per_frame,
+    frames_per_chunk and max_seconds (wall-clock budget, max 60). Each
+    'chunk' event carries positions as base64 float32 of shape
+    (frames, num_bodies, dimensions).
+
+    Browsers open the GET form with EventSource; POST responses have to be
+    read with fetch() and a stream reader.
+    """
+    print("[DEBUG-PHYSICS] API /api/physics/nbody/stream called")
+    try:
+        data = request.get_json() if request.method == 'POST' else request.args.to_dict()
+        preset = data.get('preset', 'plummer')
+        if preset == 'custom' and request.method == 'GET':
+            return jsonify({'success': False, 'error': "The 'custom' preset needs a POST body."}), 400
+        # 'custom' takes its size from the arrays; check it before the first (O(n²) direct) force sum
+        num_bodies = len(data['positions']) if preset == 'custom' else int(data.get('num_bodies', 1000))
+        if not 2 <= num_bodies <= 50000:
+            return jsonify({'success': False, 'error': 'num_bodies must be between 2 and 50000.'}), 400
+        options = {key: data[key] for key in ('time_step', 'softening', 'method', 'theta') if key in data}
+        G = float(data.get('G', PhysicsConstants.G))
+        seed = None if data.get('seed') in (None, '') else int(data['seed'])
+
+        if preset == 'plummer':
+            simulation = NBodySimulation.plummer(num_bodies, total_mass=float(data.get('total_mass', 1.0)),
+                                                 scale_radius=float(data.get('radius', 1.0)), G=G,
+                                                 seed=seed, **options)
+        elif preset == 'disk':
+            simulation = NBodySimulation.disk(num_bodies, central_mass=float(data.get('central_mass', 1.0)),
+                                              disk_mass=float(data.get('disk_mass', 0.01)),
+                                              radius=float(data.get('radius', 1.0)), G=G,
+                                              dimensions=int(data.get('dimensions', 2)),
+                                              seed=seed, **options)
+        elif preset == 'custom':
+            simulation = NBodySimulation(data['positions'], data['velocities'], data['masses'], G=G, **options)
+        else:
+            return jsonify({'success': False, 'error': f'Unknown preset: {preset}'}), 400
+
+        num_frames = min(max(int(data.get('frames', 100)), 1), 5000)
+        steps_per_frame = min(max(int(data.get('steps_per_frame', 10)), 1), 1000)
+        frames_per_chunk = min(max(int(data.get('frames_per_chunk', 10)), 1), 500)
+        max_seconds = min(float(data.get('max_seconds', 20)), 60.0)
+
+        measure_energy = simulation.num_bodies <= 5000  # O(n²) potential energy
+        initial_energy = simulation.total_energy() if measure_energy else None
+        if initial_energy is not None and not np.isfinite(initial_energy):
+            raise ValueError('Initial energy is not finite; check the masses or increase softening')
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        print(f"[DEBUG-PHYSICS] Error in nbody_stream_api: {str(e)}\n{traceback.format_exc()}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+    print(f"[DEBUG-PHYSICS] N-body {preset}: {simulation.num_bodies} bodies, {simulation.method}, "
+          f"{num_frames} frames x {steps_per_frame} steps")
+
+    def generate():
+        started = time.time()
+        deadline = time.monotonic() + max_seconds
+        meta = simulation.summary()
+        meta.update({'preset': preset, 'frames': num_frames, 'steps_per_frame': steps_per_frame,
+                     'masses': encode_float32_base64(simulation.masses), 'initial_energy': initial_energy})
+        yield format_sse(meta, event='meta')
+        frames_sent = 0
+        try:
+            for chunk in simulation.trajectory_chunks(num_frames, steps_per_frame, frames_per_chunk,
+                                                      deadline=deadline):
+                frames_sent += len(chunk['times'])
+                yield format_sse({
+                    'first_frame': chunk['first_frame'],
+                    'times': chunk['times'],
+                    'shape': list(chunk['positions'].shape),
+                    'positions': encode_float32_base64(chunk['positions'])
+                }, event='chunk', event_id=chunk['first_frame'])
+            truncated = frames_sent < num_frames
+            summary = {'frames_sent': frames_sent, 'truncated': truncated,
+                       'elapsed': time.time() - started, 'time': simulation.time}
+            if measure_energy:
+                final_energy = simulation.total_energy()
+                summary['final_energy'] = final_energy
+                summary['relative_energy_error'] = (abs((final_energy - initial_energy) / initial_energy)
+                                                    if initial_energy else None)
+            yield format_sse(summary, event='end')
+        except Exception as e:
+            yield format_sse({'error': str(e)}, event='error')
+
+    return Response(generate(), mimetype=SSE_MIMETYPE, headers=SSE_HEADERS)
+
+@app.route('/api/physics/batch/formulas', methods=['GET'])
+def physics_batch_formulas_api():
+    """List the formulas available to /api/physics/batch."""
+    return jsonify({'success': True, 'formulas': PhysicsBatch.describe()})
+
+@app.route('/api/physics/batch', methods=['POST'])
+def physics_batch_api():
+    """
+    Evaluate ElectroMag/GravityUtil formulas over columns of inputs.
+
+    JSON body: formulas (list of names, see /api/physics/batch/formulas),
+    columns ({name: [values] or scalar}), optional mapping
+    ({formula_input: column_name}) and optional dataset (a CSV from the
+    datasets folder whose numeric columns are added; explicit columns win).
+    Returns one result column per formula; non-finite values are null.
+    """
+    print("[DEBUG-PHYSICS] API /api/physics/batch called")
+    try:
+        data = request.get_json()
+        formulas = data.get('formulas') or ([data['formula']] if data.get('formula') else [])
+        if not formulas:
+            return jsonify({'success': False, 'error': 'Missing formulas'}), 400
+
+        columns = {}
+        dataset = data.get('dataset')
+        if dataset:
+            file_path = os.path.join(DATASETS_BASE_DIR, f"{os.path.basename(dataset)}.csv")
+            if not os.path.exists(file_path):
+                return jsonify({'success': False, 'error': f"Dataset '{dataset}' not found"}), 404
+            df = pd.read_csv(file_path).select_dtypes(include=[np.number])
+            columns.update({name: df[name].to_numpy(dtype=float) for name in df.columns})
+        columns.update(data.get('columns') or {})
+
+        batch = PhysicsBatch(columns, data.get('mapping'))
+        start_time = time.time()
+        results = batch.evaluate(formulas)
+        elapsed = time.time() - start_time
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        print(f"[DEBUG-PHYSICS] Error in physics_batch_api: {str(e)}\n{traceback.format_exc()}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+    print(f"[DEBUG-PHYSICS] Batch: {len(formulas)} formulas x {batch.length} rows in {elapsed * 1000:.2f} ms")
+    return jsonify({
+        'success': True,
+        'count': batch.length,
+        'results': {name: PhysicsBatch.to_json_column(values) for name, values in results.items()},
+        'computation_time': elapsed
+    })
+
 # Pandas Module Routes
 @app.route('/api/pandas/load/<dataset>')
 def load_dataset(dataset):
@@ -950,7 +1562,23 @@ def create_matrix_api():
         data = request.get_json()
         matrix_type = data.get('matrix_type', 'random')
         size = int(data.get('size', 3))
-        
+        output_format = data.get('format', 'json')
+
+        # Binary output (npy for dense, npz for sparse): size is bounded by the memory budget only
+        if output_format == 'binary' or matrix_type in LargeMatrixTools.SPARSE_TYPES:
+            if size < 1:
+                return jsonify({'success': False, 'error': 'Matrix size must be at least 1.'})
+            matrix = large_matrix_tools.create_matrix(matrix_type, size,
+                                                      density=float(data.get('density', 0.001)),
+                                                      seed=data.get('seed'))
+            payload, mimetype = encode_matrix(matrix)
+            response = make_response(payload)
+            response.headers['Content-Type'] = mimetype
+            response.headers['X-Matrix-Shape'] = f"{matrix.shape[0]}x{matrix.shape[1]}"
+            response.headers['X-Matrix-Type'] = matrix_type
+            print(f"[DEBUG-MATH] Binary matrix created: {matrix_type} {matrix.shape}, {len(payload)} bytes")
+            return response
+
         if size < 1 or size > 10: # Limitar tamaño por seguridad/rendimiento
             return jsonify({'success': False, 'error': 'Matrix size must be between 1 and 10.'})
 
@@ -985,6 +1613,8 @@ def create_matrix_api():
         
         print(f"[DEBUG-MATH] Matrix created: {matrix_list}")
         return jsonify({'success': True, 'matrix': matrix_list, 'size': size, 'type': matrix_type})
+    except MemoryBudgetError as me:
+        return jsonify({'success': False, 'error': str(me)}), 413
     except Exception as e:
         print(f"[DEBUG-MATH] Error in create_matrix_api: {str(e)}\n{traceback.format_exc()}")
         return jsonify({'success': False, 'error': str(e)})
@@ -994,13 +1624,19 @@ def analyze_matrix_api():
     print("[DEBUG-MATH] API /api/math/matrix/analyze called")
     try:
         data = request.get_json()
+        # Batched mode: many matrices and/or many operations in one request
+        if 'matrices' in data or 'operations' in data:
+            return analyze_matrix_batch(data)
+
         matrix_list = data.get('matrix')
         operation = data.get('operation')
         
         if not matrix_list or not operation:
             return jsonify({'success': False, 'error': 'Missing matrix or operation'})
             
-        matrix = np.array(matrix_list)
+        matrix = np.array(matrix_list, dtype=float)
+        # Factorizations are cached per matrix, so follow-up operations on the same matrix reuse them
+        factorization = matrix_tools.factorize(matrix)
         result_description = ""
         # Placeholder para visualizaciones si fueran necesarias más adelante
         # visualization_img = None 
@@ -1009,7 +1645,7 @@ def analyze_matrix_api():
             if matrix.shape[0] != matrix.shape[1]:
                 return jsonify({'success': False, 'error': 'Eigenvalues require a square matrix.'})
             try:
-                eigenvalues, eigenvectors = scipy.linalg.eig(matrix)
+                eigenvalues = factorization.eigenvalues()
                 # Convertir complex a string para JSON si es necesario
                 eigenvalues_str = [str(e) for e in eigenvalues]
                 result_description = f"Eigenvalues: {eigenvalues_str}"
@@ -1018,7 +1654,7 @@ def analyze_matrix_api():
                 return jsonify({'success': False, 'error': f'Linear algebra error: {str(lae)}'})
         elif operation == 'svd':
             try:
-                U, s, Vh = scipy.linalg.svd(matrix)
+                U, s, Vh = factorization.svd()
                 singular_values_str = [str(round(val, 3)) for val in s]
                 result_description = f"Singular Values: {singular_values_str}\nU shape: {U.shape}, Vh shape: {Vh.shape}"
             except scipy.linalg.LinAlgError as lae:
@@ -1027,7 +1663,7 @@ def analyze_matrix_api():
             if matrix.shape[0] != matrix.shape[1]:
                 return jsonify({'success': False, 'error': 'Determinant requires a square matrix.'})
             try:
-                det = scipy.linalg.det(matrix)
+                det = factorization.determinant()
                 result_description = f"Determinant: {det:.3f}"
             except scipy.linalg.LinAlgError as lae:
                 return jsonify({'success': False, 'error': f'Linear algebra error: {str(lae)}'})
@@ -1035,7 +1671,7 @@ def analyze_matrix_api():
             if matrix.shape[0] != matrix.shape[1]:
                 return jsonify({'success': False, 'error': 'Inverse requires a square matrix.'})
             try:
-                inv_matrix = scipy.linalg.inv(matrix)
+                inv_matrix = factorization.inverse()
                 inv_matrix_list = [[round(val, 3) for val in row] for row in inv_matrix.tolist()]
                 result_description = f"Inverse Matrix: {inv_matrix_list}"
             except scipy.linalg.LinAlgError:
@@ -1043,10 +1679,10 @@ def analyze_matrix_api():
             except ValueError as ve: # Por si la matriz no es cuadrada antes de inv
                  return jsonify({'success': False, 'error': str(ve)})
         elif operation == 'rank':
-            rank = np.linalg.matrix_rank(matrix)
+            rank = factorization.rank()
             result_description = f"Rank: {rank}"
         elif operation == 'condition':
-            cond = np.linalg.cond(matrix)
+            cond = factorization.condition_number()
             result_description = f"Condition Number: {cond:.3e}"
         elif operation == 'trace':
             if matrix.shape[0] != matrix.shape[1]:
@@ -1066,6 +1702,90 @@ def analyze_matrix_api():
         print(f"[DEBUG-MATH] Error in analyze_matrix_api: {str(e)}\n{traceback.format_exc()}")
         return jsonify({'success': False, 'error': str(e)})
 
+def analyze_matrix_batch(data):
+    """Analyze a list of matrices with a list of operations, sharing factorizations."""
+    matrices = data.get('matrices')
+    if matrices is None and data.get('matrix') is not None:
+        matrices = [data['matrix']]
+    operations = data.get('operations')
+    if operations is None and data.get('operation'):
+        operations = [data['operation']]
+
+    if not matrices or not operations:
+        return jsonify({'success': False, 'error': 'Missing matrices or operations'})
+
+    try:
+        batch_result = MatrixBatch(matrices).analyze(operations)
+    except ValueError as ve:
+        return jsonify({'success': False, 'error': str(ve)})
+
+    print(f"[DEBUG-MATH] Batch analysis: {len(matrices)} matrices, operations={operations}, groups={batch_result['groups']}")
+    return jsonify({'success': True, **batch_result})
+
+@app.route('/api/math/matrix/large/analyze', methods=['POST'])
+def analyze_large_matrix_api():
+    """
+    Top-k spectra and scalar properties of large dense or sparse matrices.
+
+    The matrix is sent as a raw .npy/.npz body (operation, k and format in
+    the query string) or as JSON with 'matrix' or COO 'rows'/'cols'/'values'/'shape'.
+    With format=npz the numeric results come back as an .npz archive that
+    loads without allow_pickle; the remaining entries (method names, None
+    for undefined values) are sent as JSON in the X-Result-Metadata header.
+    """
+    print("[DEBUG-MATH] API /api/math/matrix/large/analyze called")
+    try:
+        # Check the declared sizes before anything is read or decoded
+        large_matrix_tools.check_budget(request.content_length or 0, "The request body")
+        if request.is_json:
+            data = request.get_json()
+            if data.get('rows') is not None:
+                matrix = scipy.sparse.csr_matrix(
+                    (data['values'], (data['rows'], data['cols'])), shape=tuple(data['shape']))
+            else:
+                matrix = np.array(data.get('matrix'), dtype=float)
+        else:
+            data = request.args
+            payload = request.get_data()
+            large_matrix_tools.check_budget(decoded_nbytes(payload), "The uploaded matrix")
+            matrix = decode_matrix(payload)
+
+        operation = data.get('operation', 'eigenvalues')
+        k = int(data.get('k', 6))
+        output_format = data.get('format', 'json')
+        result = large_matrix_tools.analyze(matrix, operation, k=k,
+                                            return_vectors=output_format == 'npz')
+
+        if output_format == 'npz':
+            arrays, metadata = {}, {'operation': operation}
+            for key, value in result.items():
+                array = np.asarray(value) if value is not None else None
+                # Object and string arrays would need pickling to load
+                if array is not None and array.dtype.kind in 'biufc':
+                    arrays[key] = array
+                else:
+                    metadata[key] = value
+            response = make_response(encode_npz(**arrays))
+            response.headers['Content-Type'] = NPZ_MIMETYPE
+            response.headers['X-Result-Metadata'] = json.dumps(metadata)
+            return response
+
+        serialized = {}
+        for key, value in result.items():
+            if isinstance(value, np.ndarray):
+                if np.iscomplexobj(value):
+                    value = {'real': value.real.tolist(), 'imag': value.imag.tolist()}
+                else:
+                    value = value.tolist()
+            serialized[key] = value
+        print(f"[DEBUG-MATH] Large matrix {operation} on {matrix.shape} done")
+        return jsonify({'success': True, 'operation': operation, 'shape': list(matrix.shape), 'result': serialized})
+    except MemoryBudgetError as me:
+        return jsonify({'success': False, 'error': str(me)}), 413
+    except Exception as e:
+        print(f"[DEBUG-MATH] Error in analyze_large_matrix_api: {str(e)}\n{traceback.format_exc()}")
+        return jsonify({'success': False, 'error': str(e)})
+
 @app.route('/api/math/graph/create', methods=['POST'])
 def create_graph_api():
     print("[DEBUG-MATH-GRAPH] API /api/math/graph/create called")
@@ -1159,17 +1879,128 @@ def analyze_graph_api():
                 print(f"[DEBUG-MATH-GRAPH] Error generating graph visualization: {viz_err}")
                 # No enviar imagen si falla la visualización, pero el resto puede ser exitoso
 
+        # Optional analytics: betweenness, pagerank, clustering, spectrum
+        analytics_data = None
+        analyses = data.get('analytics')
+        if analyses:
+            analyses, analytics_options = GraphAnalytics.parse_request(analyses, data.get('analytics_options'))
+            analytics_data = GraphAnalytics(adj_matrix_np).analyze(analyses, **analytics_options)
+
         print(f"[DEBUG-MATH-GRAPH] Graph properties: {properties}")
         return jsonify({
             'success': True, 
             'properties': properties,
             'shortest_paths': shortest_paths_data,
+            'analytics': analytics_data,
             'visualization': graph_viz_img 
         })
     except Exception as e:
         print(f"[DEBUG-MATH-GRAPH] Error in analyze_graph_api: {str(e)}\n{traceback.format_exc()}")
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/api/math/graph/session', methods=['POST'])
+def create_graph_session_api():
+    """Start an editable graph session from an adjacency matrix, an edge list or a graph type."""
+    print("[DEBUG-MATH-GRAPH] API /api/math/graph/session called")
+    try:
+        data = request.get_json() or {}
+        if data.get('adjacency_matrix') is not None:
+            matrix = data['adjacency_matrix']
+            if not isinstance(matrix, list) or len(matrix) > MAX_DENSE_SESSION_NODES:
+                return jsonify({'success': False, 'error': f'Adjacency matrix must be a list of at most '
+                                                           f'{MAX_DENSE_SESSION_NODES} rows'}), 400
+            session = GraphSession.from_adjacency(matrix)
+        elif data.get('edges') is not None:
+            num_nodes = int(data.get('num_nodes', 0))
+            edges = data['edges']
+            if not 0 <= num_nodes <= MAX_SESSION_NODES:
+                return jsonify({'success': False,
+                                'error': f'num_nodes must be between 0 and {MAX_SESSION_NODES}'}), 400
+            if not isinstance(edges, list) or len(edges) > MAX_SESSION_EDGES:
+                return jsonify({'success': False,
+                                'error': f'edges must be a list of at most {MAX_SESSION_EDGES} pairs'}), 400
+            session = GraphSession.from_edges(num_nodes, edges)
+        else:
+            num_nodes = int(data.get('num_nodes', 5))
+            if not 1 <= num_nodes <= MAX_DENSE_SESSION_NODES:
+                return jsonify({'success': False,
+                                'error': f'num_nodes must be between 1 and {MAX_DENSE_SESSION_NODES}'}), 400
+            graph_tools = GraphTools()
+            graph_tools.create_graph(data.get('graph_type', 'random'), num_nodes,
+                                     probability=float(data.get('probability', 0.3)))
+            session = graph_tools.create_session()
+
+        session_id = graph_sessions.create(session)
+        return jsonify({'success': True, 'session_id': session_id, 'properties': session.summary()})
+    except Exception as e:
+        print(f"[DEBUG-MATH-GRAPH] Error in create_graph_session_api: {str(e)}\n{traceback.format_exc()}")
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/math/graph/session/<session_id>', methods=['GET'])
+def get_graph_session_api(session_id):
+    """Return the full state of a graph session (nodes, edges and degree sequence)."""
+    session = graph_sessions.get(session_id)
+    if session is None:
+        return jsonify({'success': False, 'error': 'Graph session not found'}), 404
+    return jsonify({
+        'success': True,
+        'session_id': session_id,
+        'properties': session.graph_properties(),
+        'edges': session.edges()
+    })
+
+@app.route('/api/math/graph/session/<session_id>/edit', methods=['POST'])
+def edit_graph_session_api(session_id):
+    """
+    Apply add/remove node or edge operations as one all-or-nothing batch.
+
+    Degree and edge metrics are updated incrementally. Connectivity is only
+    reported while it is still current: after a removal num_components and
+    is_connected come back as null until the session properties are
+    requested, which rebuilds them once.
+    """
+    session = graph_sessions.get(session_id)
+    if session is None:
+        return jsonify({'success': False, 'error': 'Graph session not found'}), 404
+    try:
+        data = request.get_json() or {}
+        operations = data.get('operations')
+        if operations is None:
+            operations = [data]
+        if isinstance(operations, list) and len(operations) > MAX_SESSION_EDGES:
+            return jsonify({'success': False, 'applied': 0,
+                            'error': f'At most {MAX_SESSION_EDGES} operations per edit'}), 400
+        results = session.apply(operations)
+        return jsonify({'success': True, 'results': results, 'properties': session.summary(connectivity=False)})
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e), 'applied': 0,
+                        'properties': session.summary(connectivity=False)}), 400
+
+@app.route('/api/math/graph/session/<session_id>/analytics', methods=['POST'])
+def graph_session_analytics_api(session_id):
+    """Run centrality, clustering or spectral analyses on the current session graph."""
+    session = graph_sessions.get(session_id)
+    if session is None:
+        return jsonify({'success': False, 'error': 'Graph session not found'}), 404
+    try:
+        data = request.get_json() or {}
+        analyses, analytics_options = GraphAnalytics.parse_request(
+            data.get('analytics', ['betweenness', 'pagerank', 'clustering', 'spectrum']),
+            data.get('analytics_options'))
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    try:
+        results = GraphAnalytics.from_session(session).analyze(analyses, **analytics_options)
+        return jsonify({'success': True, 'analytics': results, 'properties': session.summary()})
+    except Exception as e:
+        print(f"[DEBUG-MATH-GRAPH] Error in graph_session_analytics_api: {str(e)}\n{traceback.format_exc()}")
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/math/graph/session/<session_id>', methods=['DELETE'])
+def delete_graph_session_api(session_id):
+    """Discard a graph session."""
+    return jsonify({'success': graph_sessions.delete(session_id)})
+
 # --- Rutas para el Módulo Notebooks ---
 @app.route('/api/notebooks/files', methods=['GET'])
 def get_notebook_files_api():
@@ -6,8 +6,30 @@ let currentCode = '';
 // Initialize when page loads
 document.addEventListener('DOMContentLoaded', function() {
     loadFileList();
+    loadNoiseProfiles();
 });
 
+// Fill the noise selector with the server's named profiles
+async function loadNoiseProfiles() {
+    try {
+        const response = await fetch('/api/circuits/noise-profiles');
+        const data = await response.json();
+        if (!data.success) return;
+        
+        const select = document.getElementById('noise-select');
+        for (const profile of data.profiles) {
+            if (profile.name === 'ideal') continue;
+            const option = document.createElement('option');
+            option.value = profile.name;
+            option.textContent = profile.name;
+            option.title = profile.description;
+            select.appendChild(option);
+        }
+    } catch (error) {
+        console.error('Error loading noise profiles:', error);
+    }
+}
+
 // Load list of circuit files
 async function loadFileList() {
     try {
@@ -93,64 +115,44 @@ async function loadCircuitCode() {
     }
 }
 
-// Execute circuit
+// Execute circuit as a background job and follow its progress over SSE
+let currentJobId = null;
+let jobEvents = null;
+
+const JOB_STAGE_LABELS = {
+    queued: 'En cola...',
+    running: 'Iniciando...',
+    load: 'Cargando circuito...',
+    draw: 'Dibujando diagrama...',
+    transpile: 'Transpilando...',
+    simulate: 'Simulando...',
+    plot: 'Generando histograma...',
+    collect: 'Recopilando resultados...',
+    done: 'Finalizando...'
+};
+
 async function executeCircuit() {
     if (!selectedFile) return;
     
     showLoadingOverlay();
+    updateJobProgress({ stage: 'queued', progress: 0 });
     
     try {
-        const response = await fetch(`/api/circuits/execute/${selectedFile}`);
-        const data = await response.json();
-        
-        hideLoadingOverlay();
+        const response = await fetch('/api/circuits/jobs', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ filename: selectedFile, ...getSimulationOptions() })
+        });
+        const job = await response.json();
         
-        if (data.success) {
-            // Show circuit info
-            document.getElementById('circuit-info').innerHTML = `
-                <p class="text-sm font-semibold mb-1">${data.circuit_info}</p>
-                <p class="text-xs opacity-70">Circuito ejecutado exitosamente</p>
-            `;
-            
-            // Show circuit diagram
-            if (data.circuit_image) {
-                document.getElementById('circuit-diagram').innerHTML = `
-                    <img src="data:image/png;base64,${data.circuit_image}" 
-                         class="max-w-full h-auto" 
-                         alt="Circuit Diagram">
-                `;
-            }
-            
-            // Show results
-            if (data.result_image || data.result_text) {
-                const resultsContainer = document.getElementById('results-container');
-                resultsContainer.innerHTML = '';
-                
-                if (data.result_image) {
-                    resultsContainer.innerHTML = `
-                        <img src="data:image/png;base64,${data.result_image}" 
-                             class="max-w-full h-auto rounded" 
-                             alt="Measurement Results">
-                    `;
-                }
-                
-                if (data.result_text) {
-                    document.getElementById('results-text').style.display = 'block';
-                    document.getElementById('results-text').textContent = data.result_text;
-                }
-            } else {
-                document.getElementById('results-container').innerHTML = `
-                    <div class="text-center py-4">
-                        <i class="ti ti-info-circle text-3xl text-warning mb-2"></i>
-                        <p class="text-sm">Este circuito no tiene mediciones</p>
-                    </div>
-                `;
-            }
-            
-            showToast('Circuito ejecutado correctamente', 'success');
-        } else {
-            showError(data.error || 'Error al ejecutar el circuito');
+        if (!job.success) {
+            hideLoadingOverlay();
+            showError(job.error || 'Error al ejecutar el circuito');
+            return;
         }
+        
+        currentJobId = job.job_id;
+        followJob(job.job_id);
     } catch (error) {
         hideLoadingOverlay();
         console.error('Error executing circuit:', error);
@@ -158,6 +160,242 @@ async function executeCircuit() {
     }
 }
 
+async function executeAllCircuits() {
+    showLoadingOverlay();
+    updateJobProgress({ stage: 'queued', progress: 0 });
+    
+    try {
+        // Every file in the circuits directory, sampled in one batched job
+        const response = await fetch('/api/circuits/batch', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ async: true, ...getSimulationOptions() })
+        });
+        const job = await response.json();
+        
+        if (!job.success) {
+            hideLoadingOverlay();
+            showError(job.error || 'Error al ejecutar los circuitos');
+            return;
+        }
+        
+        currentJobId = job.job_id;
+        followJob(job.job_id);
+    } catch (error) {
+        hideLoadingOverlay();
+        console.error('Error executing circuit batch:', error);
+        showError('Error de conexión al ejecutar los circuitos');
+    }
+}
+
+function getSimulationOptions() {
+    const options = {
+        shots: parseInt(document.getElementById('shots-input').value, 10) || 1024,
+        method: document.getElementById('method-select').value,
+        precision: document.getElementById('precision-select').value,
+        noise: document.getElementById('noise-select').value,
+        optimization_level: parseInt(document.getElementById('optimization-select').value, 10),
+        basis: document.getElementById('basis-select').value
+    };
+    const seed = document.getElementById('seed-input').value;
+    if (seed !== '') options.seed = parseInt(seed, 10);
+    return options;
+}
+
+function followJob(jobId) {
+    closeJobEvents();
+    jobEvents = new EventSource(`/api/circuits/jobs/${jobId}/events`);
+    
+    jobEvents.addEventListener('status', (event) => {
+        updateJobProgress(JSON.parse(event.data));
+    });
+    
+    jobEvents.addEventListener('done', (event) => {
+        closeJobEvents();
+        finishJob(JSON.parse(event.data));
+    });
+    
+    jobEvents.onerror = () => {
+        // Stream dropped: fall back to polling the job status
+        closeJobEvents();
+        pollJob(jobId);
+    };
+}
+
+async function pollJob(jobId) {
+    try {
+        const response = await fetch(`/api/circuits/jobs/${jobId}`);
+        const job = await response.json();
+        
+        if (!job.success) {
+            hideLoadingOverlay();
+            showError(job.error || 'Trabajo no encontrado');
+            return;
+        }
+        if (['completed', 'failed', 'cancelled'].includes(job.status)) {
+            finishJob(job);
+            return;
+        }
+        updateJobProgress(job);
+        setTimeout(() => pollJob(jobId), 1000);
+    } catch (error) {
+        hideLoadingOverlay();
+        console.error('Error polling job:', error);
+        showError('Error de conexión al consultar el trabajo');
+    }
+}
+
+function closeJobEvents() {
+    if (jobEvents) {
+        jobEvents.close();
+        jobEvents = null;
+    }
+}
+
+function updateJobProgress(job) {
+    const label = document.getElementById('job-stage');
+    const bar = document.getElementById('job-progress');
+    if (label) label.textContent = JOB_STAGE_LABELS[job.stage] || job.stage;
+    if (bar) bar.value = Math.round((job.progress || 0) * 100);
+}
+
+async function cancelCurrentJob() {
+    if (!currentJobId) return;
+    
+    try {
+        await fetch(`/api/circuits/jobs/${currentJobId}`, { method: 'DELETE' });
+    } catch (error) {
+        console.error('Error cancelling job:', error);
+    }
+}
+
+function finishJob(job) {
+    currentJobId = null;
+    hideLoadingOverlay();
+    
+    if (job.status === 'completed' && job.result.results) {
+        renderBatchResult(job.result);
+        showToast(`${job.result.simulation.circuits} circuitos ejecutados`, 'success');
+    } else if (job.status === 'completed') {
+        renderExecutionResult(job.result);
+        showToast('Circuito ejecutado correctamente', 'success');
+    } else if (job.status === 'cancelled') {
+        showToast('Ejecución cancelada', 'warning');
+    } else {
+        showError(job.error || 'Error al ejecutar el circuito');
+    }
+}
+
+function renderExecutionResult(data) {
+    // Show circuit info
+    const simulation = data.simulation
+        ? `<p class="text-xs opacity-70">Método: ${data.simulation.method} (${data.simulation.reason}), ` +
+          `${data.simulation.shots ? data.simulation.shots + ' shots' : 'exacto'}, ` +
+          `${data.simulation.noise && data.simulation.noise !== 'ideal' ? 'ruido ' + data.simulation.noise + ', ' : ''}` +
+          `${(data.simulation.simulation_time * 1000).toFixed(1)} ms</p>` +
+          formatTranspileInfo(data.simulation)
+        : '';
+    document.getElementById('circuit-info').innerHTML = `
+        <p class="text-sm font-semibold mb-1">${data.circuit_info}</p>
+        <p class="text-xs opacity-70">Circuito ejecutado exitosamente</p>
+        ${simulation}
+    `;
+    
+    // Show circuit diagram (PNG for small circuits, folded text or summary for large ones)
+    const diagramDiv = document.getElementById('circuit-diagram');
+    if (data.circuit_image) {
+        diagramDiv.innerHTML = `
+            <img src="data:image/png;base64,${data.circuit_image}" 
+                 class="max-w-full h-auto" 
+                 alt="Circuit Diagram">
+        `;
+    } else if (data.circuit_text) {
+        const pre = document.createElement('pre');
+        pre.className = 'text-xs font-mono overflow-auto max-h-96';
+        pre.textContent = data.circuit_text;
+        diagramDiv.innerHTML = '';
+        diagramDiv.appendChild(pre);
+    }
+    
+    // Show results
+    if (data.result_image || data.result_text) {
+        const resultsContainer = document.getElementById('results-container');
+        resultsContainer.innerHTML = '';
+        
+        if (data.result_image) {
+            resultsContainer.innerHTML = `
+                <img src="data:image/png;base64,${data.result_image}" 
+                     class="max-w-full h-auto rounded" 
+                     alt="Measurement Results">
+            `;
+        }
+        
+        if (data.result_text) {
+            document.getElementById('results-text').style.display = 'block';
+            document.getElementById('results-text').textContent = data.result_text;
+        }
+    } else {
+        document.getElementById('results-container').innerHTML = `
+            <div class="text-center py-4">
+                <i class="ti ti-info-circle text-3xl text-warning mb-2"></i>
+                <p class="text-sm">Este circuito no tiene mediciones</p>
+            </div>
+        `;
+    }
+}
+
+function formatTranspileInfo(simulation) {
+    if (simulation.transpile_time === undefined || simulation.optimization_level === undefined) return '';
+    
+    // Slowest transpiler passes, e.g. "BasisTranslator 1.2 ms"
+    const passes = (simulation.passes || []).slice(0, 3)
+        .map(entry => `${entry.pass} ${(entry.time * 1000).toFixed(1)} ms`).join(', ');
+    const compile = simulation.transpile_cached
+        ? 'transpilación en caché'
+        : `transpilación ${(simulation.transpile_time * 1000).toFixed(1)} ms` +
+          (simulation.pass_manager_time > 0.001
+              ? ` + ${(simulation.pass_manager_time * 1000).toFixed(0)} ms preparando el pass manager` : '');
+    return `<p class="text-xs opacity-70">Optimización ${simulation.optimization_level}, base ${simulation.basis}: ` +
+           `${compile}${passes ? ' (' + passes + ')' : ''}</p>`;
+}
+
+function renderBatchResult(data) {
+    const simulation = data.simulation;
+    document.getElementById('circuit-info').innerHTML = `
+        <p class="text-sm font-semibold mb-1">Lote de ${simulation.circuits} circuitos</p>
+        <p class="text-xs opacity-70">${data.groups.length} grupos, ${simulation.shots} shots, ` +
+        `transpilación ${(simulation.transpile_time * 1000).toFixed(1)} ms, ` +
+        `simulación ${(simulation.simulation_time * 1000).toFixed(1)} ms</p>
+    `;
+    
+    // One row per circuit with its most frequent outcomes
+    const table = document.createElement('table');
+    table.className = 'table table-xs';
+    table.innerHTML = '<thead><tr><th>Circuito</th><th>Qubits</th><th>Método</th><th>Resultados</th></tr></thead>';
+    const body = document.createElement('tbody');
+    for (const [name, result] of Object.entries(data.results)) {
+        const top = Object.entries(result.counts).sort((a, b) => b[1] - a[1]).slice(0, 4)
+            .map(([state, count]) => `|${state}⟩: ${count}`).join(', ');
+        const row = document.createElement('tr');
+        for (const value of [name, result.num_qubits, result.method, top]) {
+            const cell = document.createElement('td');
+            cell.textContent = value;
+            row.appendChild(cell);
+        }
+        body.appendChild(row);
+    }
+    table.appendChild(body);
+    
+    const resultsContainer = document.getElementById('results-container');
+    resultsContainer.innerHTML = '';
+    resultsContainer.appendChild(table);
+    
+    const skipped = Object.entries(data.skipped);
+    const resultsText = document.getElementById('results-text');
+    resultsText.style.display = skipped.length ? 'block' : 'none';
+    resultsText.textContent = skipped.map(([name, reason]) => `${name}: ${reason}`).join('\n');
+}
+
 // Copy code to clipboard
 async function copyCode() {
     if (!currentCode) {
@@ -16,6 +16,11 @@ function updatePhaseLabel() {
     document.getElementById('phase-value').textContent = parseFloat(value).toFixed(1) + 'π';
 }
 
+function updateFpsLabel() {
+    const value = document.getElementById('animation-fps').value;
+    document.getElementById('fps-value').textContent = value + ' fps';
+}
+
 // Generate wave function
 async function generateWave() {
     // Get parameters
@@ -24,16 +29,21 @@ async function generateWave() {
     const phase = parseFloat(document.getElementById('wave-phase').value);
     const waveType = document.getElementById('wave-type').value;
 
+    stopWaveAnimation();
+
     // Show loading state
     showLoading();
 
     try {
+        const clientRender = document.getElementById('client-render').checked;
+
         // Prepare data for API
         const data = {
             frequency: frequency,
             amplitude: amplitude,
             phase: phase,
-            wave_type: waveType
+            wave_type: waveType,
+            format: clientRender ? 'binary' : 'png'
         };
 
         // Call API
@@ -45,6 +55,14 @@ async function generateWave() {
             body: JSON.stringify(data)
         });
 
+        // Binary payload: float32 arrays drawn in the browser
+        if (response.headers.get('Content-Type') === 'application/x-float32-pack') {
+            const packed = unpackFloat32Arrays(await response.arrayBuffer());
+            showClientPlots(packed.metadata, packed.arrays);
+            showWaveInfo(packed.metadata.info_text);
+            return;
+        }
+
         const result = await response.json();
 
         if (result.success) {
@@ -62,8 +80,247 @@ async function generateWave() {
     }
 }
 
+// Client-side rendering of the packed float32 payload
+function unpackFloat32Arrays(buffer) {
+    const headerLength = new DataView(buffer).getUint32(0, true);
+    const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 4, headerLength)));
+    const dataStart = 4 + headerLength;
+    const arrays = {};
+    header.arrays.forEach(entry => {
+        arrays[entry.name] = new Float32Array(buffer, dataStart + 4 * entry.offset, entry.length);
+    });
+    delete header.arrays;
+    return { metadata: header, arrays: arrays };
+}
+
+function showClientPlots(metadata, arrays) {
+    const vizContainer = document.getElementById('wave-visualization');
+    const isPsd = metadata.spectrum && metadata.spectrum.kind === 'psd';
+    const panels = [
+        { title: metadata.title, x: arrays.t, y: arrays.wave, color: '#2563eb', xLabel: 'Time (quantum units)', yLabel: 'Amplitude' },
+        { title: 'Phase Space Trajectory', x: arrays.wave, y: arrays.derivative, color: '#dc2626', xLabel: 'Position', yLabel: 'Momentum' },
+        { title: isPsd ? 'Frequency Spectrum (Welch)' : 'Frequency Spectrum', x: arrays.frequencies, y: arrays.magnitude, color: '#16a34a', xLabel: 'Frequency (Hz)', yLabel: isPsd ? 'Power Spectral Density' : 'Magnitude' },
+        { title: 'Quantum Energy Distribution', x: arrays.t, y: arrays.energy, color: '#7e22ce', xLabel: 'Time (quantum units)', yLabel: 'Energy Density', fill: true }
+    ];
+    vizContainer.innerHTML = '<div class="grid grid-cols-1 md:grid-cols-2 gap-4 w-full">' +
+        panels.map((_, i) => `<canvas id="wave-panel-${i}" class="w-full bg-white rounded-lg" width="560" height="360"></canvas>`).join('') +
+        '</div>';
+    panels.forEach((panel, i) => drawPanel(document.getElementById(`wave-panel-${i}`), panel));
+
+    vizContainer.style.display = 'block';
+    document.getElementById('loading-state').style.display = 'none';
+}
+
+function arrayRange(values) {
+    let low = Infinity;
+    let high = -Infinity;
+    for (let i = 0; i < values.length; i++) {
+        if (values[i] < low) low = values[i];
+        if (values[i] > high) high = values[i];
+    }
+    if (low === high) {
+        low -= 1;
+        high += 1;
+    }
+    return [low, high];
+}
+
+function drawPanel(canvas, panel) {
+    const ctx = canvas.getContext('2d');
+    const margin = { left: 55, right: 15, top: 30, bottom: 40 };
+    const width = canvas.width - margin.left - margin.right;
+    const height = canvas.height - margin.top - margin.bottom;
+    const [xLow, xHigh] = arrayRange(panel.x);
+    const [yLow, yHigh] = arrayRange(panel.y);
+    const toX = v => margin.left + ((v - xLow) / (xHigh - xLow)) * width;
+    const toY = v => margin.top + height - ((v - yLow) / (yHigh - yLow)) * height;
+
+    // Axes, grid and labels
+    ctx.strokeStyle = 'rgba(0, 0, 0, 0.12)';
+    ctx.fillStyle = '#374151';
+    ctx.font = '11px sans-serif';
+    for (let i = 0; i <= 4; i++) {
+        const yValue = yLow + (i / 4) * (yHigh - yLow);
+        const xValue = xLow + (i / 4) * (xHigh - xLow);
+        ctx.beginPath();
+        ctx.moveTo(margin.left, toY(yValue));
+        ctx.lineTo(margin.left + width, toY(yValue));
+        ctx.moveTo(toX(xValue), margin.top);
+        ctx.lineTo(toX(xValue), margin.top + height);
+        ctx.stroke();
+        ctx.textAlign = 'right';
+        ctx.fillText(yValue.toPrecision(3), margin.left - 5, toY(yValue) + 4);
+        ctx.textAlign = 'center';
+        ctx.fillText(xValue.toPrecision(3), toX(xValue), margin.top + height + 15);
+    }
+    ctx.font = '12px sans-serif';
+    ctx.fillText(panel.xLabel, margin.left + width / 2, canvas.height - 6);
+    ctx.font = 'bold 13px sans-serif';
+    ctx.fillText(panel.title, margin.left + width / 2, 18);
+    ctx.save();
+    ctx.translate(14, margin.top + height / 2);
+    ctx.rotate(-Math.PI / 2);
+    ctx.font = '12px sans-serif';
+    ctx.fillText(panel.yLabel, 0, 0);
+    ctx.restore();
+
+    // Series
+    ctx.beginPath();
+    for (let i = 0; i < panel.x.length; i++) {
+        const x = toX(panel.x[i]);
+        const y = toY(panel.y[i]);
+        if (i === 0) {
+            ctx.moveTo(x, y);
+        } else {
+            ctx.lineTo(x, y);
+        }
+    }
+    ctx.strokeStyle = panel.color;
+    ctx.lineWidth = 2;
+    ctx.stroke();
+    if (panel.fill) {
+        ctx.lineTo(toX(panel.x[panel.x.length - 1]), toY(Math.max(yLow, 0)));
+        ctx.lineTo(toX(panel.x[0]), toY(Math.max(yLow, 0)));
+        ctx.closePath();
+        ctx.globalAlpha = 0.35;
+        ctx.fillStyle = panel.color;
+        ctx.fill();
+        ctx.globalAlpha = 1;
+    }
+}
+
+// Streaming animation (Server-Sent Events)
+let waveStream = null;
+let pendingFrame = null;
+let waveStreamMeta = null;
+
+function toggleWaveAnimation() {
+    if (waveStream) {
+        stopWaveAnimation();
+    } else {
+        startWaveAnimation();
+    }
+}
+
+function startWaveAnimation() {
+    const source = document.getElementById('animation-source').value;
+    const params = new URLSearchParams({
+        frequency: document.getElementById('wave-frequency').value,
+        amplitude: document.getElementById('wave-amplitude').value,
+        phase: document.getElementById('wave-phase').value,
+        wave_type: source === 'packet' ? 'packet' : document.getElementById('wave-type').value,
+        fps: document.getElementById('animation-fps').value,
+        frames: 3600
+    });
+
+    const vizContainer = document.getElementById('wave-visualization');
+    vizContainer.innerHTML = '<canvas id="wave-canvas" class="w-full rounded-lg" width="800" height="400"></canvas>';
+    vizContainer.style.display = 'block';
+    document.getElementById('loading-state').style.display = 'none';
+    document.getElementById('error-state').style.display = 'none';
+    setAnimateButton(true);
+
+    waveStream = new EventSource('/api/waves/stream?' + params.toString());
+    waveStream.addEventListener('meta', event => {
+        waveStreamMeta = JSON.parse(event.data);
+    });
+    waveStream.addEventListener('frame', event => {
+        // Keep only the newest frame; drawing happens on the next animation frame
+        const scheduled = pendingFrame !== null;
+        pendingFrame = JSON.parse(event.data);
+        if (!scheduled) {
+            requestAnimationFrame(drawPendingFrame);
+        }
+    });
+    waveStream.addEventListener('end', () => stopWaveAnimation());
+    waveStream.addEventListener('error', event => {
+        const message = event.data ? JSON.parse(event.data).error : null;
+        stopWaveAnimation();
+        if (message) {
+            showError(message);
+        }
+    });
+}
+
+function stopWaveAnimation() {
+    if (waveStream) {
+        waveStream.close();
+        waveStream = null;
+    }
+    pendingFrame = null;
+    setAnimateButton(false);
+}
+
+function setAnimateButton(running) {
+    const button = document.getElementById('animate-button');
+    button.innerHTML = running
+        ? '<i class="ti ti-player-stop"></i> Detener'
+        : '<i class="ti ti-player-play"></i> Animar';
+}
+
+function decodeFloat32(base64) {
+    const binary = atob(base64);
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) {
+        bytes[i] = binary.charCodeAt(i);
+    }
+    return new Float32Array(bytes.buffer);
+}
+
+function drawPendingFrame() {
+    const frame = pendingFrame;
+    pendingFrame = null;
+    const canvas = document.getElementById('wave-canvas');
+    if (!frame || !canvas) {
+        return;
+    }
+
+    const values = decodeFloat32(frame.values);
+    const ctx = canvas.getContext('2d');
+    const width = canvas.width;
+    const height = canvas.height;
+    const isPacket = waveStreamMeta && waveStreamMeta.wave_type === 'packet';
+
+    // Fixed range for closed-form waves, running peak for the packet density
+    let low = -1;
+    let high = 1;
+    if (isPacket) {
+        low = 0;
+        high = values.reduce((max, v) => Math.max(max, v), 0) || 1;
+    } else if (waveStreamMeta) {
+        low = -waveStreamMeta.amplitude;
+        high = waveStreamMeta.amplitude;
+    }
+
+    ctx.clearRect(0, 0, width, height);
+    ctx.strokeStyle = 'rgba(128, 128, 128, 0.4)';
+    ctx.beginPath();
+    ctx.moveTo(0, height / 2);
+    ctx.lineTo(width, height / 2);
+    ctx.stroke();
+
+    ctx.strokeStyle = isPacket ? '#8b5cf6' : '#3b82f6';
+    ctx.lineWidth = 2;
+    ctx.beginPath();
+    for (let i = 0; i < values.length; i++) {
+        const x = (i / (values.length - 1)) * width;
+        const y = height - 10 - ((values[i] - low) / (high - low)) * (height - 20);
+        if (i === 0) {
+            ctx.moveTo(x, y);
+        } else {
+            ctx.lineTo(x, y);
+        }
+    }
+    ctx.stroke();
+
+    ctx.fillStyle = 'rgba(100, 100, 100, 0.9)';
+    ctx.font = '12px sans-serif';
+    ctx.fillText(`frame ${frame.frame}  t = ${frame.time.toExponential(3)}`, 10, 16);
+}
+
 // Clear visualization
 function clearWaveVisualization() {
+    stopWaveAnimation();
     const vizContainer = document.getElementById('wave-visualization');
     vizContainer.innerHTML = `
         <div class="text-center">
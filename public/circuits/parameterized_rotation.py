@@ -0,0 +1,35 @@
+"""
+Parameterized rotation circuit for the AppSpyder Circuits module.
+Two qubits rotated by theta and phi and entangled with a CNOT; sweep the
+angles with /api/circuits/sweep.
+"""
+
+def create_circuit():
+    """Create a two-qubit circuit with Parameter rotation angles."""
+    try:
+        from qiskit import QuantumCircuit
+        from qiskit.circuit import Parameter
+        
+        theta = Parameter('theta')
+        phi = Parameter('phi')
+        
+        # Create a 2-qubit circuit with 2 classical bits for measurement
+        qc = QuantumCircuit(2, 2)
+        
+        # Parameterized rotations
+        qc.ry(theta, 0)
+        qc.rx(phi, 1)
+        
+        # Entangle the qubits
+        qc.cx(0, 1)
+        
+        # Measure both qubits
+        qc.measure([0, 1], [0, 1])
+        
+        return qc
+        
+    except ImportError:
+        # Fallback if Qiskit is not available
+        return "Qiskit not available - install with: pip install qiskit"
+    except Exception as e:
+        return f"Error creating circuit: {str(e)}"
@@ -0,0 +1,297 @@
+"""
+Scalable graph analytics on sparse adjacency matrices using SciPy.
+"""
+import warnings
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import eigsh, lobpcg, ArpackNoConvergence
+from typing import Dict, Any, List, Optional, Tuple
+
+# Options a request may set for each analysis, as (type, minimum, maximum).
+# The maxima are the cost bounds the routines are sized for.
+REQUEST_OPTIONS = {
+    'betweenness': {'max_sources': (int, 1, 256), 'batch_size': (int, 1, 64), 'seed': (int, 0, 2**32 - 1)},
+    'pagerank': {'alpha': (float, 0.0, 0.99), 'tol': (float, 1e-12, 1e-2), 'max_iter': (int, 1, 1000)},
+    'clustering': {'max_work': (int, 1, 50_000_000), 'seed': (int, 0, 2**32 - 1)},
+    'spectrum': {'k': (int, 1, 50), 'dense_threshold': (int, 100, 2000), 'max_iter': (int, 1, 500),
+                 'seed': (int, 0, 2**32 - 1)}
+}
+
+class GraphAnalytics:
+    """
+    Centrality, clustering and spectral measures for undirected graphs.
+
+    Every routine works on a CSR adjacency matrix and has an explicit cost
+    bound so it can run on large graphs inside a request:
+
+    - betweenness: O(k * (n + m)) for k sampled BFS sources
+    - pagerank: O(max_iter * m)
+    - clustering: O(sum of squared degrees), or of the sampled rows only
+    - spectrum: dense O(n^3) up to dense_threshold nodes, otherwise
+      O(k * m) per iteration with at most max_iter iterations
+    """
+
+    def __init__(self, adjacency, nodes: Optional[List[int]] = None):
+        matrix = sparse.csr_matrix(adjacency, dtype=float)
+        if matrix.shape[0] != matrix.shape[1]:
+            raise ValueError("Adjacency matrix must be square")
+        # Unweighted, symmetric, no self-loops
+        matrix = ((matrix + matrix.T) != 0).astype(float)
+        matrix.setdiag(0)
+        matrix.eliminate_zeros()
+        self.adjacency = matrix.tocsr()
+        self.num_nodes = matrix.shape[0]
+        self.nodes = nodes if nodes is not None else list(range(self.num_nodes))
+        self.degrees = np.asarray(self.adjacency.sum(axis=1)).ravel()
+
+    @classmethod
+    def from_session(cls, session) -> 'GraphAnalytics':
+        """Build from a GraphSession, indexing nodes in sorted order."""
+        with session.lock:
+            nodes = session.nodes()
+            edges = session.edges()
+        index = {node: i for i, node in enumerate(nodes)}
+        rows = np.fromiter((index[u] for u, _ in edges), dtype=np.int64, count=len(edges))
+        cols = np.fromiter((index[v] for _, v in edges), dtype=np.int64, count=len(edges))
+        adjacency = sparse.coo_matrix((np.ones(len(edges)), (rows, cols)), shape=(len(nodes), len(nodes)))
+        return cls(adjacency, nodes)
+
+    def betweenness_centrality(self, max_sources: int = 64, batch_size: int = 32,
+                               seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Normalized betweenness centrality using Brandes' algorithm.
+
+        BFS runs level-synchronously from a block of sources at once, so each
+        level is one sparse-times-dense product. When n exceeds max_sources,
+        a uniform sample of sources is used and the result is rescaled by
+        n / k (an unbiased estimate).
+        """
+        n = self.num_nodes
+        if n < 3:
+            return {'values': [0.0] * n, 'sources': n, 'exact': True}
+
+        if n <= max_sources:
+            sources = np.arange(n)
+        else:
+            rng = np.random.default_rng(seed)
+            sources = rng.choice(n, size=max_sources, replace=False)
+
+        A = self.adjacency
+        centrality = np.zeros(n)
+        for start in range(0, len(sources), batch_size):
+            block = sources[start:start + batch_size]
+            cols = np.arange(len(block))
+            sigma = np.zeros((n, len(block)))
+            dist = np.full((n, len(block)), -1, dtype=np.int64)
+            sigma[block, cols] = 1.0
+            dist[block, cols] = 0
+            frontier = sigma.copy()
+
+            # Forward sweep: count shortest paths level by level
+            depth = 0
+            while True:
+                reached = A @ frontier
+                reached[dist >= 0] = 0
+                new_mask = reached > 0
+                if not new_mask.any():
+                    break
+                depth += 1
+                dist[new_mask] = depth
+                sigma[new_mask] = reached[new_mask]
+                frontier = np.where(new_mask, reached, 0.0)
+
+            # Backward sweep: accumulate dependencies from the deepest level
+            delta = np.zeros_like(sigma)
+            for level in range(depth, 0, -1):
+                coeff = np.where(dist == level, (1.0 + delta) / np.where(sigma > 0, sigma, 1.0), 0.0)
+                contrib = A @ coeff
+                delta += np.where(dist == level - 1, sigma * contrib, 0.0)
+            delta[block, cols] = 0.0
+            centrality += delta.sum(axis=1)
+
+        scale = (n / len(sources)) / ((n - 1) * (n - 2))
+        centrality *= scale
+        return {
+            'values': centrality.tolist(),
+            'sources': int(len(sources)),
+            'exact': bool(len(sources) == n)
+        }
+
+    def pagerank(self, alpha: float = 0.85, tol: float = 1e-8, max_iter: int = 100) -> Dict[str, Any]:
+        """PageRank by sparse power iteration; dangling nodes spread their rank uniformly."""
+        n = self.num_nodes
+        if n == 0:
+            return {'values': [], 'iterations': 0, 'converged': True}
+
+        inv_degree = np.divide(1.0, self.degrees, out=np.zeros(n), where=self.degrees > 0)
+        dangling = self.degrees == 0
+        transition_t = self.adjacency.T.tocsr()
+        rank = np.full(n, 1.0 / n)
+        converged = False
+        iteration = 0
+        for iteration in range(1, max_iter + 1):
+            previous = rank
+            rank = alpha * (transition_t @ (previous * inv_degree))
+            rank += (alpha * previous[dangling].sum() + (1.0 - alpha)) / n
+            if np.abs(rank - previous).sum() < n * tol:
+                converged = True
+                break
+
+        return {'values': rank.tolist(), 'iterations': iteration, 'converged': converged}
+
+    def clustering(self, max_work: int = 50_000_000, seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Local clustering coefficients via sparse triangle counting.
+
+        Triangles at node i are diag(A^3)_i / 2, computed as the row sums of
+        (A @ A) .* A. The product costs about sum(d_i^2); when that exceeds
+        max_work, only a random subset of rows is evaluated and the average
+        clustering is estimated from it.
+        """
+        n = self.num_nodes
+        if n == 0:
+            return {'values': [], 'average_clustering': 0.0, 'triangles': 0, 'sampled_nodes': 0}
+
+        A = self.adjacency
+        wedge_work = float(np.sum(self.degrees ** 2))
+        if wedge_work <= max_work:
+            rows = np.arange(n)
+        else:
+            rng = np.random.default_rng(seed)
+            sample_size = max(1, int(n * max_work / wedge_work))
+            rows = np.sort(rng.choice(n, size=min(n, sample_size), replace=False))
+
+        sub = A[rows]
+        triangles = np.asarray((sub @ A).multiply(sub).sum(axis=1)).ravel() / 2.0
+        degrees = self.degrees[rows]
+        pairs = degrees * (degrees - 1) / 2.0
+        local = np.divide(triangles, pairs, out=np.zeros_like(triangles), where=pairs > 0)
+
+        result = {
+            'average_clustering': float(local.mean()),
+            'sampled_nodes': int(len(rows))
+        }
+        if len(rows) == n:
+            result['values'] = local.tolist()
+            result['triangles'] = int(round(triangles.sum() / 3))
+        else:
+            result['values'] = None
+            result['triangles'] = None
+        return result
+
+    def laplacian_spectrum(self, k: int = 6, dense_threshold: int = 500,
+                           max_iter: int = 100, seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Extreme eigenvalues of the graph Laplacian L = D - A.
+
+        Small graphs get the full spectrum from a dense eigvalsh. Larger graphs
+        use Lanczos (eigsh) for the largest eigenvalues, which converge fast.
+        The smallest ones are clustered near zero, where plain Lanczos stalls
+        and shift-invert fill-in explodes on hub nodes, so they come from
+        LOBPCG with a Jacobi (inverse degree) preconditioner. Both solvers
+        are capped at max_iter iterations (Lanczos restarts for eigsh). When
+        either stops at its cap 'converged' is False: eigsh then returns only
+        the eigenvalues that converged, and LOBPCG's estimates are judged by
+        the residual norms ||L v - lambda v|| of the returned pairs.
+        """
+        n = self.num_nodes
+        if n == 0:
+            return {'smallest': [], 'largest': [], 'algebraic_connectivity': 0.0, 'method': 'dense'}
+
+        laplacian = (sparse.diags(self.degrees) - self.adjacency).tocsr()
+        if n <= dense_threshold:
+            eigenvalues = np.linalg.eigvalsh(laplacian.toarray())
+            k = min(k, n)
+            return {
+                'smallest': eigenvalues[:k].tolist(),
+                'largest': eigenvalues[-k:][::-1].tolist(),
+                'algebraic_connectivity': float(eigenvalues[1]) if n > 1 else 0.0,
+                'spectrum': eigenvalues.tolist(),
+                'method': 'dense',
+                'converged': True
+            }
+
+        k = max(1, min(k, n // 5))
+        converged = True
+        try:
+            largest = np.sort(eigsh(laplacian, k=k, which='LA', maxiter=max_iter,
+                                    return_eigenvectors=False))[::-1]
+        except ArpackNoConvergence as e:
+            # Only the eigenvalues that did converge, possibly fewer than k
+            largest = np.sort(e.eigenvalues)[::-1]
+            converged = False
+
+        rng = np.random.default_rng(seed)
+        initial = rng.standard_normal((n, k))
+        preconditioner = sparse.diags(1.0 / np.maximum(self.degrees, 1.0))
+        tolerance = 1e-6
+        with warnings.catch_warnings():
+            # LOBPCG warns when it stops at max_iter; the estimate is still returned
+            warnings.simplefilter('ignore')
+            smallest, vectors = lobpcg(laplacian, initial, M=preconditioner, largest=False,
+                                       tol=tolerance, maxiter=max_iter)
+        residual_norms = np.linalg.norm(laplacian @ vectors - vectors * smallest, axis=0)
+        converged = converged and bool(np.all(residual_norms <= tolerance))
+        smallest = np.clip(np.sort(smallest), 0.0, None)
+
+        return {
+            'smallest': smallest.tolist(),
+            'largest': largest.tolist(),
+            'algebraic_connectivity': float(smallest[1]) if k > 1 else None,
+            'method': 'eigsh+lobpcg',
+            'converged': converged,
+            'max_residual': float(residual_norms.max())
+        }
+
+    @staticmethod
+    def parse_request(analyses, options=None) -> Tuple[List[str], Dict[str, Dict[str, Any]]]:
+        """
+        Validate client-supplied analyses and options for analyze.
+
+        Only the options in REQUEST_OPTIONS are accepted, and numeric values
+        are clamped to their bounds so a request cannot lift a routine's cost
+        limit.
+
+        Raises:
+            ValueError: If analyses is not a list of names or an option is unknown
+        """
+        if not isinstance(analyses, list) or not all(isinstance(name, str) for name in analyses):
+            raise ValueError("analytics must be a list of analysis names")
+        options = options or {}
+        if not isinstance(options, dict):
+            raise ValueError("analytics_options must be an object keyed by analysis")
+
+        parsed = {}
+        for name, values in options.items():
+            allowed = REQUEST_OPTIONS.get(name)
+            if allowed is None:
+                raise ValueError(f"Unknown analysis in analytics_options: {name}")
+            if not isinstance(values, dict):
+                raise ValueError(f"analytics_options['{name}'] must be an object")
+            parsed[name] = {}
+            for option, value in values.items():
+                if option not in allowed:
+                    raise ValueError(f"Unsupported option for {name}: {option}. "
+                                     f"Allowed: {', '.join(allowed)}")
+                kind, low, high = allowed[option]
+                value = kind(value)
+                if not np.isfinite(value):
+                    raise ValueError(f"Option {name}.{option} must be finite")
+                parsed[name][option] = min(max(value, low), high)
+        return list(analyses), parsed
+
+    def analyze(self, analyses: List[str], **kwargs) -> Dict[str, Any]:
+        """Run the requested analyses ('betweenness', 'pagerank', 'clustering', 'spectrum')."""
+        dispatch = {
+            'betweenness': self.betweenness_centrality,
+            'pagerank': self.pagerank,
+            'clustering': self.clustering,
+            'spectrum': self.laplacian_spectrum
+        }
+        results = {'nodes': self.nodes}
+        for name in analyses:
+            if name not in dispatch:
+                results[name] = {'error': f'Unknown analysis: {name}'}
+                continue
+            results[name] = dispatch[name](**kwargs.get(name, {}))
+        return results
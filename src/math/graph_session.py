@@ -0,0 +1,367 @@
+"""
+Stateful graph editing sessions with incrementally maintained metrics.
+"""
+import uuid
+import threading
+from collections import OrderedDict
+import numpy as np
+from typing import Dict, Any, List, Iterable, Optional, Tuple
+
+# Request-size limits for sessions: edge lists are stored sparsely, while
+# adjacency matrices and generated graph types are built densely (n^2)
+MAX_SESSION_NODES = 100_000
+MAX_SESSION_EDGES = 500_000
+MAX_DENSE_SESSION_NODES = 2_000
+
+class DisjointSet:
+    """Union-find with path halving and union by size."""
+
+    def __init__(self):
+        self.parent = {}
+        self.size = {}
+        self.components = 0
+
+    def add(self, item: int) -> None:
+        """Register a new singleton set."""
+        if item not in self.parent:
+            self.parent[item] = item
+            self.size[item] = 1
+            self.components += 1
+
+    def find(self, item: int) -> int:
+        """Return the representative of the set containing item."""
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a: int, b: int) -> bool:
+        """Merge the sets of a and b. Returns True if they were separate."""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+        self.components -= 1
+        return True
+
+class GraphSession:
+    """
+    Undirected simple graph that keeps its basic metrics up to date on every edit.
+
+    Node count, edge count, degrees, the degree histogram (for min/max/average)
+    and density are updated in O(1) per edge change. Connectivity uses a
+    union-find that absorbs insertions incrementally; a deletion can split a
+    component, so it only marks the structure stale and it is rebuilt in
+    O(n + m) the next time connectivity is requested.
+
+    A session stored in a GraphSessionStore is shared by concurrent requests:
+    apply and the read methods hold the session's lock, so a batch is never
+    interleaved with another batch or observed half-applied. The single-edit
+    methods (add_node, add_edge, ...) do not lock and are meant for building
+    a session before it is shared.
+    """
+
+    def __init__(self, num_nodes: int = 0):
+        self.adjacency: Dict[int, set] = {}
+        self.num_edges = 0
+        self.degree_histogram: Dict[int, int] = {}
+        self.version = 0
+        self._next_node = 0
+        self._components = DisjointSet()
+        self._components_stale = False
+        self.lock = threading.RLock()
+        for _ in range(num_nodes):
+            self.add_node()
+
+    @classmethod
+    def from_adjacency(cls, adjacency_matrix) -> 'GraphSession':
+        """Build a session from a (possibly weighted) square adjacency matrix."""
+        matrix = np.asarray(adjacency_matrix)
+        if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+            raise ValueError("Adjacency matrix must be square")
+        rows, cols = np.nonzero(np.triu(matrix, k=1))
+        return cls.from_edges(matrix.shape[0], zip(rows.tolist(), cols.tolist()))
+
+    @classmethod
+    def from_edges(cls, num_nodes: int, edges: Iterable[Tuple[int, int]]) -> 'GraphSession':
+        """Build a session with nodes 0..num_nodes-1 and the given edge list."""
+        session = cls(num_nodes)
+        for u, v in edges:
+            session.add_edge(int(u), int(v))
+        return session
+
+    # --- Mutations ---
+
+    def add_node(self, node: Optional[int] = None) -> int:
+        """Add an isolated node and return its id."""
+        if node is None:
+            node = self._next_node
+        elif node in self.adjacency:
+            raise ValueError(f"Node {node} already exists")
+        self._next_node = max(self._next_node, node + 1)
+        self.adjacency[node] = set()
+        self._shift_degree(None, 0)
+        if not self._components_stale:
+            self._components.add(node)
+        self.version += 1
+        return node
+
+    def remove_node(self, node: int) -> None:
+        """Remove a node together with its incident edges."""
+        self._require_node(node)
+        for neighbor in list(self.adjacency[node]):
+            self._drop_edge(node, neighbor)
+        del self.adjacency[node]
+        self._shift_degree(0, None)
+        self._components_stale = True
+        self.version += 1
+
+    def add_edge(self, u: int, v: int) -> bool:
+        """Add edge (u, v), creating missing endpoints. Returns False if it already existed."""
+        if u == v:
+            raise ValueError("Self-loops are not supported")
+        for node in (u, v):
+            if node not in self.adjacency:
+                self.add_node(node)
+        if v in self.adjacency[u]:
+            return False
+        self.adjacency[u].add(v)
+        self.adjacency[v].add(u)
+        self._shift_degree(len(self.adjacency[u]) - 1, len(self.adjacency[u]))
+        self._shift_degree(len(self.adjacency[v]) - 1, len(self.adjacency[v]))
+        self.num_edges += 1
+        if not self._components_stale:
+            self._components.union(u, v)
+        self.version += 1
+        return True
+
+    def remove_edge(self, u: int, v: int) -> bool:
+        """Remove edge (u, v). Returns False if it did not exist."""
+        self._require_node(u)
+        self._require_node(v)
+        if v not in self.adjacency[u]:
+            return False
+        self._drop_edge(u, v)
+        self._components_stale = True
+        self.version += 1
+        return True
+
+    def apply(self, operations: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Apply a list of edit operations in order, all or nothing.
+
+        Each operation is a dict with an 'op' key ('add_node', 'remove_node',
+        'add_edge', 'remove_edge') and 'node' or 'u'/'v' arguments. The whole
+        list is validated against the graph as it would evolve before any
+        operation is applied, so a rejected batch leaves the graph untouched.
+
+        Raises:
+            ValueError: On the first invalid operation (with its index)
+        """
+        with self.lock:
+            steps = self._validate(operations)
+            results = []
+            for op, args in steps:
+                if op == 'add_node':
+                    results.append(self.add_node(*args))
+                elif op == 'remove_node':
+                    self.remove_node(*args)
+                    results.append(True)
+                elif op == 'add_edge':
+                    results.append(self.add_edge(*args))
+                else:
+                    results.append(self.remove_edge(*args))
+            return results
+
+    def _validate(self, operations: List[Dict[str, Any]]) -> List[Tuple[str, tuple]]:
+        """Parse operations and check them against the pending node set, without touching the graph."""
+        if not isinstance(operations, list):
+            raise ValueError("operations must be a list")
+        added, removed = set(), set()
+        next_node = self._next_node
+
+        def exists(node: int) -> bool:
+            return node not in removed and (node in added or node in self.adjacency)
+
+        def create(node: int) -> None:
+            nonlocal next_node
+            added.add(node)
+            removed.discard(node)
+            next_node = max(next_node, node + 1)
+
+        steps = []
+        for index, operation in enumerate(operations):
+            try:
+                op = operation.get('op')
+                if op == 'add_node':
+                    node = operation.get('node')
+                    node = next_node if node is None else int(node)
+                    if exists(node):
+                        raise ValueError(f"Node {node} already exists")
+                    create(node)
+                    steps.append((op, (node,)))
+                elif op == 'remove_node':
+                    node = int(operation['node'])
+                    if not exists(node):
+                        raise ValueError(f"Node {node} does not exist")
+                    removed.add(node)
+                    added.discard(node)
+                    steps.append((op, (node,)))
+                elif op in ('add_edge', 'remove_edge'):
+                    u, v = int(operation['u']), int(operation['v'])
+                    if op == 'add_edge':
+                        if u == v:
+                            raise ValueError("Self-loops are not supported")
+                        for node in (u, v):
+                            if not exists(node):
+                                create(node)
+                    else:
+                        for node in (u, v):
+                            if not exists(node):
+                                raise ValueError(f"Node {node} does not exist")
+                    steps.append((op, (u, v)))
+                else:
+                    raise ValueError(f"Unknown graph operation: {op}")
+            except (AttributeError, KeyError, TypeError, ValueError) as e:
+                detail = f"missing argument {e}" if isinstance(e, KeyError) else str(e)
+                raise ValueError(f"Operation {index}: {detail}; no operations were applied") from e
+        return steps
+
+    # --- Metrics ---
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.adjacency)
+
+    def density(self) -> float:
+        n = self.num_nodes
+        return 2 * self.num_edges / (n * (n - 1)) if n > 1 else 0
+
+    def num_components(self) -> int:
+        """Number of connected components, rebuilding the union-find if a deletion made it stale."""
+        if self._components_stale:
+            self._rebuild_components()
+        return self._components.components
+
+    def is_connected(self) -> bool:
+        return self.num_nodes > 0 and self.num_components() == 1
+
+    @property
+    def components_stale(self) -> bool:
+        """Whether a deletion invalidated the union-find (the next connectivity query costs O(n + m))."""
+        return self._components_stale
+
+    def summary(self, connectivity: bool = True) -> Dict[str, Any]:
+        """
+        Incrementally maintained metrics, reported without visiting every node.
+
+        With connectivity=False the component count is only reported while
+        the union-find is fresh; after a deletion num_components and
+        is_connected are None instead of triggering an O(n + m) rebuild.
+        """
+        with self.lock:
+            n = self.num_nodes
+            degrees = [d for d, count in self.degree_histogram.items() if count > 0]
+            fresh = connectivity or not self._components_stale
+            return {
+                'num_nodes': n,
+                'num_edges': self.num_edges,
+                'density': self.density(),
+                'max_degree': max(degrees) if degrees else 0,
+                'min_degree': min(degrees) if degrees else 0,
+                'average_degree': 2 * self.num_edges / n if n > 0 else 0,
+                'num_components': self.num_components() if fresh else None,
+                'is_connected': self.is_connected() if fresh else None,
+                'version': self.version
+            }
+
+    def graph_properties(self) -> Dict[str, Any]:
+        """Summary plus the per-node degree sequence, matching GraphTools.graph_properties."""
+        with self.lock:
+            properties = self.summary()
+            properties['nodes'] = self.nodes()
+            properties['degree_sequence'] = [len(self.adjacency[node]) for node in properties['nodes']]
+            return properties
+
+    def nodes(self) -> List[int]:
+        with self.lock:
+            return sorted(self.adjacency)
+
+    def edges(self) -> List[Tuple[int, int]]:
+        with self.lock:
+            return [(u, v) for u in self.nodes() for v in sorted(self.adjacency[u]) if u < v]
+
+    def to_adjacency_matrix(self) -> np.ndarray:
+        """Dense adjacency matrix in sorted node order."""
+        with self.lock:
+            nodes = self.nodes()
+            edges = self.edges()
+        index = {node: i for i, node in enumerate(nodes)}
+        matrix = np.zeros((len(nodes), len(nodes)), dtype=int)
+        for u, v in edges:
+            matrix[index[u], index[v]] = matrix[index[v], index[u]] = 1
+        return matrix
+
+    # --- Internals ---
+
+    def _require_node(self, node: int) -> None:
+        if node not in self.adjacency:
+            raise ValueError(f"Node {node} does not exist")
+
+    def _drop_edge(self, u: int, v: int) -> None:
+        self.adjacency[u].discard(v)
+        self.adjacency[v].discard(u)
+        self._shift_degree(len(self.adjacency[u]) + 1, len(self.adjacency[u]))
+        self._shift_degree(len(self.adjacency[v]) + 1, len(self.adjacency[v]))
+        self.num_edges -= 1
+
+    def _shift_degree(self, old: Optional[int], new: Optional[int]) -> None:
+        histogram = self.degree_histogram
+        if old is not None:
+            histogram[old] -= 1
+            if histogram[old] == 0:
+                del histogram[old]
+        if new is not None:
+            histogram[new] = histogram.get(new, 0) + 1
+
+    def _rebuild_components(self) -> None:
+        components = DisjointSet()
+        for node in self.adjacency:
+            components.add(node)
+        for u, neighbors in self.adjacency.items():
+            for v in neighbors:
+                if u < v:
+                    components.union(u, v)
+        self._components = components
+        self._components_stale = False
+
+class GraphSessionStore:
+    """Bounded in-memory registry of graph sessions, evicting the least recently used."""
+
+    def __init__(self, max_sessions: int = 64):
+        self.max_sessions = max_sessions
+        self._sessions: 'OrderedDict[str, GraphSession]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, session: GraphSession) -> str:
+        session_id = uuid.uuid4().hex
+        with self._lock:
+            self._sessions[session_id] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return session_id
+
+    def get(self, session_id: str) -> Optional[GraphSession]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
@@ -6,6 +6,7 @@ import matplotlib.pyplot as plt
 import io
 import base64
 from typing import Dict, Any, List, Tuple
+from .graph_session import GraphSession
 
 class GraphTools:
     """Basic graph theory and topology operations."""
@@ -114,6 +115,12 @@ class GraphTools:
             'is_connected': bool(is_connected)
         }
     
+    def create_session(self) -> GraphSession:
+        """Start an editable session from the current graph."""
+        if self.adjacency_matrix is None:
+            raise ValueError('No graph created yet')
+        return GraphSession.from_edges(self.adjacency_matrix.shape[0], self.edges)
+    
     def shortest_paths(self) -> Dict[str, Any]:
         """Calculate shortest paths using Floyd-Warshall algorithm."""
         if self.adjacency_matrix is None:
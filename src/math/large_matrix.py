@@ -0,0 +1,301 @@
+"""
+Large dense and sparse matrix tools: iterative solvers, randomized SVD and a memory guard.
+"""
+import numpy as np
+from scipy import sparse
+from scipy import linalg
+from scipy.sparse.linalg import eigsh, eigs, svds, splu, norm as sparse_norm, ArpackNoConvergence
+from typing import Dict, Any, Optional, Union
+
+Matrix = Union[np.ndarray, sparse.spmatrix]
+
+class MemoryBudgetError(MemoryError):
+    """Raised when an operation would exceed the configured memory budget."""
+
+class LargeMatrixTools:
+    """
+    Matrix operations that scale to 10k x 10k dense or much larger sparse inputs.
+
+    Nothing here forms a full decomposition. Spectra come as the top-k
+    values from ARPACK (eigsh/eigs/svds) or a randomized range finder, and
+    every allocation is checked against memory_budget first. The default
+    1 GB budget holds one 10k x 10k float64 matrix (763 MB) plus the O(n k)
+    solver workspaces; generating 'symmetric' or 'orthogonal' matrices
+    takes about three copies, so those stop near 6k at that budget.
+    """
+
+    DENSE_TYPES = ('random', 'identity', 'zeros', 'ones', 'symmetric', 'diagonal', 'orthogonal')
+    SPARSE_TYPES = ('sparse_random', 'sparse_symmetric', 'sparse_laplacian', 'sparse_identity')
+    OPERATIONS = ('eigenvalues', 'svd', 'randomized_svd', 'norm', 'trace', 'determinant')
+    SPLU_FILL_FACTOR = 10  # estimated LU factor entries per input nonzero
+
+    def __init__(self, memory_budget: int = 1024 ** 3):
+        self.memory_budget = memory_budget
+
+    # --- Memory guard ---
+
+    @staticmethod
+    def matrix_bytes(matrix: Matrix) -> int:
+        if sparse.issparse(matrix):
+            csr = sparse.csr_matrix(matrix)
+            return csr.data.nbytes + csr.indices.nbytes + csr.indptr.nbytes
+        return np.asarray(matrix).nbytes
+
+    def check_budget(self, required_bytes: float, what: str) -> None:
+        """Raise MemoryBudgetError if required_bytes does not fit the budget."""
+        if required_bytes > self.memory_budget:
+            raise MemoryBudgetError(
+                f"{what} needs about {required_bytes / 1024 ** 2:.1f} MB, "
+                f"over the {self.memory_budget / 1024 ** 2:.0f} MB budget"
+            )
+
+    # --- Creation ---
+
+    def create_matrix(self, matrix_type: str = 'random', size: int = 100,
+                      density: float = 0.001, seed: Optional[int] = None) -> Matrix:
+        """Create a dense or sparse test matrix after checking it fits the budget."""
+        rng = np.random.default_rng(seed)
+        if matrix_type in self.DENSE_TYPES:
+            workspace = 3 if matrix_type in ('symmetric', 'orthogonal') else 1
+            self.check_budget(workspace * size * size * 8, f"A dense {size}x{size} '{matrix_type}' matrix")
+            if matrix_type == 'random':
+                return rng.random((size, size)) * 10
+            if matrix_type == 'identity':
+                return np.identity(size)
+            if matrix_type == 'zeros':
+                return np.zeros((size, size))
+            if matrix_type == 'ones':
+                return np.ones((size, size))
+            if matrix_type == 'symmetric':
+                matrix = rng.random((size, size)) * 10
+                matrix += matrix.T
+                matrix /= 2
+                return matrix
+            if matrix_type == 'diagonal':
+                return np.diag(rng.random(size) * 10)
+            q, _ = linalg.qr(rng.random((size, size)), overwrite_a=True)
+            return q
+
+        if matrix_type in self.SPARSE_TYPES:
+            nnz = size if matrix_type == 'sparse_identity' else (
+                3 * size if matrix_type == 'sparse_laplacian' else int(density * size * size))
+            # data (8 bytes) + indices (4-8 bytes) per nonzero, twice for the symmetrized copy
+            self.check_budget(2 * nnz * 16, f"A sparse {size}x{size} '{matrix_type}' matrix")
+            if matrix_type == 'sparse_random':
+                return sparse.random(size, size, density=density, format='csr', random_state=rng) * 10
+            if matrix_type == 'sparse_symmetric':
+                matrix = sparse.random(size, size, density=density / 2, format='csr', random_state=rng) * 10
+                return ((matrix + matrix.T) / 2).tocsr()
+            if matrix_type == 'sparse_laplacian':
+                return sparse.diags([-np.ones(size - 1), 2 * np.ones(size), -np.ones(size - 1)],
+                                    [-1, 0, 1], format='csr')
+            return sparse.identity(size, format='csr')
+
+        raise ValueError(f"Invalid matrix type: {matrix_type}")
+
+    # --- Spectra ---
+
+    @staticmethod
+    def is_symmetric(matrix: Matrix, tolerance: float = 1e-10) -> bool:
+        if matrix.shape[0] != matrix.shape[1]:
+            return False
+        if sparse.issparse(matrix):
+            difference = matrix - matrix.T
+            return difference.nnz == 0 or abs(difference).max() <= tolerance
+        return np.allclose(matrix, matrix.T, atol=tolerance)
+
+    def top_eigenvalues(self, matrix: Matrix, k: int = 6, return_vectors: bool = False,
+                        max_restarts: int = 300, tol: float = 1e-8) -> Dict[str, Any]:
+        """
+        Largest-magnitude k eigenpairs via eigsh (symmetric) or eigs (general).
+
+        ARPACK is capped at max_restarts implicit restarts; if that is not
+        enough (tightly clustered spectra), the eigenvalues that did converge
+        are returned with 'converged': False.
+
+        eigsh needs k < n and eigs needs k < n - 1; requests past that (which
+        only happens for tiny matrices) use a dense eigh/eig instead.
+        """
+        n = matrix.shape[0]
+        if matrix.shape[0] != matrix.shape[1]:
+            raise ValueError("Eigenvalues require a square matrix.")
+        k = max(1, min(k, n))
+        symmetric = self.is_symmetric(matrix)
+        if k >= (n if symmetric else n - 1):
+            self.check_budget(n * n * 16 * 3, "Dense eigendecomposition")
+            dense = matrix.toarray() if sparse.issparse(matrix) else np.asarray(matrix)
+            if symmetric:
+                values, vectors = np.linalg.eigh(dense)
+            else:
+                values, vectors = np.linalg.eig(dense)
+            order = np.argsort(-np.abs(values))[:k]
+            output = {'eigenvalues': values[order], 'method': 'eigh' if symmetric else 'eig',
+                      'k': k, 'converged': True}
+            if return_vectors:
+                output['eigenvectors'] = vectors[:, order]
+            return output
+
+        ncv = min(n, max(2 * k + 1, 20))
+        self.check_budget(ncv * n * 16, f"Lanczos workspace for k={k}")
+
+        solver, method = (eigsh, 'eigsh') if symmetric else (eigs, 'eigs')
+        converged = True
+        try:
+            result = solver(matrix, k=k, which='LM', ncv=ncv, maxiter=max_restarts, tol=tol,
+                            return_eigenvectors=return_vectors)
+            values, vectors = result if return_vectors else (result, None)
+        except ArpackNoConvergence as e:
+            values, vectors = e.eigenvalues, (e.eigenvectors if return_vectors else None)
+            converged = False
+
+        order = np.argsort(-np.abs(values))
+        output = {'eigenvalues': values[order], 'method': method, 'k': k, 'converged': converged}
+        if vectors is not None:
+            output['eigenvectors'] = vectors[:, order]
+        return output
+
+    def top_singular_values(self, matrix: Matrix, k: int = 6, return_vectors: bool = False,
+                            max_restarts: int = 300, tol: float = 1e-8) -> Dict[str, Any]:
+        """
+        Largest k singular triplets via ARPACK svds (same restart cap as top_eigenvalues).
+
+        svds needs k + 1 < min(m, n); smaller matrices use a dense SVD.
+        """
+        m, n = matrix.shape
+        k = max(1, min(k, min(m, n)))
+        if min(m, n) <= k + 1:
+            self.check_budget(m * n * 8 * 3, "Dense SVD")
+            dense = matrix.toarray() if sparse.issparse(matrix) else np.asarray(matrix)
+            if not return_vectors:
+                return {'singular_values': linalg.svdvals(dense)[:k], 'method': 'svd', 'k': k, 'converged': True}
+            u, s, vt = linalg.svd(dense, full_matrices=False)
+            return {'singular_values': s[:k], 'U': u[:, :k], 'Vt': vt[:k],
+                    'method': 'svd', 'k': k, 'converged': True}
+        ncv = min(min(m, n) - 1, max(2 * k + 1, 20))
+        self.check_budget(ncv * (m + n) * 8, f"svds workspace for k={k}")
+
+        try:
+            result = svds(matrix, k=k, ncv=ncv, maxiter=max_restarts, tol=tol,
+                          return_singular_vectors=return_vectors)
+        except ArpackNoConvergence:
+            # Fall back to the randomized estimate rather than failing the request
+            output = self.randomized_svd(matrix, k=k, return_vectors=return_vectors)
+            output['converged'] = False
+            return output
+
+        if return_vectors:
+            u, s, vt = result
+            order = np.argsort(-s)
+            return {'singular_values': s[order], 'U': u[:, order], 'Vt': vt[order],
+                    'method': 'svds', 'k': k, 'converged': True}
+        return {'singular_values': np.sort(result)[::-1], 'method': 'svds', 'k': k, 'converged': True}
+
+    def randomized_svd(self, matrix: Matrix, k: int = 6, oversamples: int = 10,
+                       power_iterations: int = 2, seed: Optional[int] = None,
+                       return_vectors: bool = False) -> Dict[str, Any]:
+        """
+        Randomized truncated SVD (Halko, Martinsson and Tropp).
+
+        A Gaussian sketch of the range is refined by power iterations with QR
+        re-orthonormalization, then the small projected matrix is factored
+        exactly. Cost is O((k + oversamples) * nnz) per pass.
+        """
+        m, n = matrix.shape
+        rank = min(k + oversamples, m, n)
+        self.check_budget(3 * rank * (m + n) * 8, f"Randomized SVD sketch of rank {rank}")
+
+        rng = np.random.default_rng(seed)
+        sketch = matrix @ rng.standard_normal((n, rank))
+        q, _ = linalg.qr(sketch, mode='economic', overwrite_a=True, check_finite=False)
+        for _ in range(power_iterations):
+            z, _ = linalg.qr(matrix.T @ q, mode='economic', overwrite_a=True, check_finite=False)
+            q, _ = linalg.qr(matrix @ z, mode='economic', overwrite_a=True, check_finite=False)
+
+        projected = np.asarray((matrix.T @ q).T)
+        u_small, s, vt = linalg.svd(projected, full_matrices=False, check_finite=False)
+        k = min(k, len(s))
+        output = {'singular_values': s[:k], 'method': 'randomized_svd', 'k': k}
+        if return_vectors:
+            output['U'] = (q @ u_small)[:, :k]
+            output['Vt'] = vt[:k]
+        return output
+
+    # --- Scalar properties ---
+
+    def determinant(self, matrix: Matrix) -> Dict[str, Any]:
+        """
+        Sign and log-determinant (the plain determinant overflows for large n).
+
+        Sparse inputs are factored with SuperLU. Its fill-in is unknown until
+        the factorization runs, so the budget is checked against an estimate
+        of SPLU_FILL_FACTOR factor entries per nonzero (capped at a dense
+        n x n factor); matrices that fill in further can still grow past it.
+        """
+        if matrix.shape[0] != matrix.shape[1]:
+            raise ValueError("Determinant requires a square matrix.")
+        if sparse.issparse(matrix):
+            n = matrix.shape[0]
+            # value (8 bytes) + row index (8 bytes) per stored factor entry
+            fill = min(self.SPLU_FILL_FACTOR * max(matrix.nnz, n), n * n)
+            self.check_budget(fill * 16, "Sparse LU factorization (estimated fill-in)")
+            try:
+                lu = splu(sparse.csc_matrix(matrix))
+            except RuntimeError:
+                # SuperLU reports an exactly singular factor
+                return {'sign': 0.0, 'log_abs_determinant': None}
+            diagonal = lu.U.diagonal()
+            permutation_sign = self._permutation_sign(lu.perm_r) * self._permutation_sign(lu.perm_c)
+            sign = permutation_sign * np.prod(np.sign(diagonal))
+            logdet = np.sum(np.log(np.abs(diagonal))) if np.all(diagonal != 0) else -np.inf
+        else:
+            self.check_budget(matrix.nbytes, "Dense LU factorization")
+            sign, logdet = np.linalg.slogdet(matrix)
+        if sign == 0:
+            return {'sign': 0.0, 'log_abs_determinant': None}
+        return {'sign': float(sign), 'log_abs_determinant': float(logdet)}
+
+    @staticmethod
+    def _permutation_sign(permutation: np.ndarray) -> int:
+        """Sign of a permutation from its cycle decomposition."""
+        visited = np.zeros(len(permutation), dtype=bool)
+        sign = 1
+        for start in range(len(permutation)):
+            if visited[start]:
+                continue
+            length = 0
+            node = start
+            while not visited[node]:
+                visited[node] = True
+                node = permutation[node]
+                length += 1
+            if length % 2 == 0:
+                sign = -sign
+        return sign
+
+    def norm(self, matrix: Matrix) -> Dict[str, Any]:
+        """Frobenius norm exactly and the spectral norm from the top singular value."""
+        frobenius = sparse_norm(matrix, 'fro') if sparse.issparse(matrix) else linalg.norm(matrix, 'fro')
+        spectral = self.top_singular_values(matrix, k=1)['singular_values'][0]
+        return {'frobenius_norm': float(frobenius), 'spectral_norm': float(spectral)}
+
+    # --- Dispatcher ---
+
+    def analyze(self, matrix: Matrix, operation: str, k: int = 6,
+                return_vectors: bool = False, **kwargs) -> Dict[str, Any]:
+        """Run one operation; array-valued entries are returned as NumPy arrays."""
+        self.check_budget(self.matrix_bytes(matrix), "The input matrix")
+        if operation == 'eigenvalues':
+            return self.top_eigenvalues(matrix, k=k, return_vectors=return_vectors)
+        if operation == 'svd':
+            return self.top_singular_values(matrix, k=k, return_vectors=return_vectors)
+        if operation == 'randomized_svd':
+            return self.randomized_svd(matrix, k=k, return_vectors=return_vectors, **kwargs)
+        if operation == 'norm':
+            return self.norm(matrix)
+        if operation == 'trace':
+            if matrix.shape[0] != matrix.shape[1]:
+                raise ValueError("Trace requires a square matrix.")
+            return {'trace': float(matrix.diagonal().sum())}
+        if operation == 'determinant':
+            return self.determinant(matrix)
+        raise ValueError(f"Invalid operation: {operation}")
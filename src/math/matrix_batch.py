@@ -0,0 +1,124 @@
+"""
+Batched matrix analysis: many matrices and many operations in one pass.
+"""
+import numpy as np
+from typing import Dict, Any, List
+
+class MatrixBatch:
+    """
+    Run several linear algebra operations over many matrices at once.
+
+    Matrices of the same shape are stacked into a 3D array and handed to
+    NumPy's batched linalg routines (which loop in C over the leading axis).
+    One singular value decomposition per group is shared by every operation
+    that can be derived from it: 'svd', 'rank', 'condition' and 'norm'.
+    """
+
+    OPERATIONS = ('eigenvalues', 'svd', 'determinant', 'inverse', 'rank',
+                  'condition', 'trace', 'norm')
+    SQUARE_ONLY = {
+        'eigenvalues': 'Eigenvalues require a square matrix.',
+        'determinant': 'Determinant requires a square matrix.',
+        'inverse': 'Inverse requires a square matrix.',
+        'trace': 'Trace requires a square matrix.'
+    }
+    SVD_BASED = ('svd', 'rank', 'condition', 'norm')
+
+    def __init__(self, matrices: List[Any]):
+        self.matrices = [np.asarray(matrix, dtype=float) for matrix in matrices]
+        for index, matrix in enumerate(self.matrices):
+            if matrix.ndim != 2 or matrix.size == 0:
+                raise ValueError(f"Matrix {index} is not a non-empty 2D array")
+
+        # Group matrix indices by shape
+        self.groups: Dict[tuple, List[int]] = {}
+        for index, matrix in enumerate(self.matrices):
+            self.groups.setdefault(matrix.shape, []).append(index)
+
+    def analyze(self, operations: List[str]) -> Dict[str, Any]:
+        """Run the operations on every matrix and return per-matrix results."""
+        unknown = [op for op in operations if op not in self.OPERATIONS]
+        if unknown:
+            raise ValueError(f"Invalid operation(s): {', '.join(unknown)}")
+
+        results: List[Dict[str, Any]] = [{} for _ in self.matrices]
+        for shape, indices in self.groups.items():
+            stack = np.stack([self.matrices[i] for i in indices])
+            group_results = self._analyze_group(stack, operations)
+            for position, index in enumerate(indices):
+                for op, values in group_results.items():
+                    results[index][op] = values[position]
+
+        return {
+            'results': results,
+            'groups': [{'shape': list(shape), 'count': len(indices)}
+                       for shape, indices in self.groups.items()]
+        }
+
+    def _analyze_group(self, stack: np.ndarray, operations: List[str]) -> Dict[str, List[Any]]:
+        """Compute the operations for a (batch, rows, cols) stack."""
+        batch, rows, cols = stack.shape
+        square = rows == cols
+        out: Dict[str, List[Any]] = {}
+
+        for op in operations:
+            if op in self.SQUARE_ONLY and not square:
+                out[op] = [{'error': self.SQUARE_ONLY[op]}] * batch
+
+        # Shared SVD (singular values only) for svd, rank, condition and norm
+        if any(op in self.SVD_BASED for op in operations):
+            singular_values = np.linalg.svd(stack, compute_uv=False)
+            largest = singular_values[:, 0]
+            smallest = singular_values[:, -1]
+            if 'svd' in operations:
+                out['svd'] = singular_values.tolist()
+            if 'rank' in operations:
+                tolerance = largest * max(rows, cols) * np.finfo(stack.dtype).eps
+                out['rank'] = (singular_values > tolerance[:, None]).sum(axis=1).tolist()
+            if 'condition' in operations:
+                with np.errstate(divide='ignore'):
+                    condition = np.where(smallest > 0, largest / np.where(smallest > 0, smallest, 1), np.inf)
+                out['condition'] = [float(c) if np.isfinite(c) else None for c in condition]
+            if 'norm' in operations:
+                frobenius = np.sqrt(np.sum(singular_values ** 2, axis=1))
+                out['norm'] = [{'frobenius': float(f), 'spectral': float(s)}
+                               for f, s in zip(frobenius, largest)]
+
+        if not square:
+            return out
+
+        if 'determinant' in operations:
+            out['determinant'] = np.linalg.det(stack).tolist()
+
+        if 'trace' in operations:
+            out['trace'] = np.trace(stack, axis1=1, axis2=2).tolist()
+
+        if 'eigenvalues' in operations:
+            eigenvalues = np.linalg.eigvals(stack)
+            out['eigenvalues'] = [self._format_eigenvalues(values) for values in eigenvalues]
+
+        if 'inverse' in operations:
+            out['inverse'] = self._batched_inverse(stack)
+
+        return out
+
+    @staticmethod
+    def _batched_inverse(stack: np.ndarray) -> List[Any]:
+        """Invert the whole stack at once, falling back per matrix if any is singular."""
+        try:
+            return np.linalg.inv(stack).tolist()
+        except np.linalg.LinAlgError:
+            inverses = []
+            for matrix in stack:
+                try:
+                    inverses.append(np.linalg.inv(matrix).tolist())
+                except np.linalg.LinAlgError:
+                    inverses.append({'error': 'Matrix is singular, cannot compute inverse.'})
+            return inverses
+
+    @staticmethod
+    def _format_eigenvalues(values: np.ndarray) -> List[Any]:
+        """Real eigenvalues as floats, complex ones as [real, imag] pairs."""
+        if np.all(np.isreal(values)):
+            return np.real(values).tolist()
+        return [[float(v.real), float(v.imag)] for v in values]
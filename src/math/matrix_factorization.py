@@ -0,0 +1,212 @@
+"""
+Cached, structure-aware matrix factorizations.
+"""
+import warnings
+import numpy as np
+from scipy import linalg
+from typing import Dict, Any, Tuple
+
+class MatrixFactorization:
+    """
+    Lazily computed factorizations of one matrix, each done at most once.
+
+    The matrix structure is detected up front (diagonal, triangular,
+    symmetric) and every derived property picks the cheapest route:
+
+    - diagonal: eigenvalues, determinant, inverse and singular values come
+      straight from the diagonal
+    - triangular: eigenvalues and determinant from the diagonal, inverse by
+      triangular solves
+    - symmetric: eigh instead of eig, and singular values as |eigenvalues|
+      when eigh has already run
+    - general: LU for determinant, inverse and solves; SVD for rank,
+      condition number and the spectral norm
+    """
+
+    def __init__(self, matrix: np.ndarray, tolerance: float = 1e-12):
+        self.matrix = np.asarray(matrix)
+        self.shape = self.matrix.shape
+        self.tolerance = tolerance
+        self._cache: Dict[str, Any] = {}
+        self.structure = self._detect_structure()
+
+    # --- Structure ---
+
+    def _detect_structure(self) -> str:
+        """
+        Classify as 'diagonal', 'upper', 'lower', 'symmetric', 'general' or 'rectangular'.
+
+        Entries count as zero (and A as symmetric) only within tolerance
+        times the largest |a_ij|, with no further relative slack: a nearly
+        symmetric matrix sent to eigh would get wrong eigenvalues silently.
+        """
+        A = self.matrix
+        if A.ndim != 2 or A.shape[0] != A.shape[1]:
+            return 'rectangular'
+        limit = self.tolerance * (float(np.max(np.abs(A))) if A.size else 0.0)
+        upper = bool(np.all(np.abs(np.tril(A, -1)) <= limit))
+        lower = bool(np.all(np.abs(np.triu(A, 1)) <= limit))
+        if upper and lower:
+            return 'diagonal'
+        if upper:
+            return 'upper'
+        if lower:
+            return 'lower'
+        if np.all(np.abs(A - A.T) <= limit):
+            return 'symmetric'
+        return 'general'
+
+    @property
+    def is_square(self) -> bool:
+        return self.structure != 'rectangular'
+
+    @property
+    def is_symmetric(self) -> bool:
+        return self.structure in ('diagonal', 'symmetric')
+
+    @property
+    def is_triangular(self) -> bool:
+        return self.structure in ('diagonal', 'upper', 'lower')
+
+    def _require_square(self, name: str) -> None:
+        if not self.is_square:
+            raise ValueError(f"{name} requires a square matrix")
+
+    # --- Factorizations (each computed once) ---
+
+    def lu(self) -> Tuple[np.ndarray, np.ndarray]:
+        """LU factorization in LAPACK form (lu, piv)."""
+        self._require_square('LU factorization')
+        if 'lu' not in self._cache:
+            with warnings.catch_warnings():
+                # Singular matrices are reported by solve()/inverse(), not as a warning here
+                warnings.simplefilter('ignore', linalg.LinAlgWarning)
+                self._cache['lu'] = linalg.lu_factor(self.matrix, check_finite=False)
+        return self._cache['lu']
+
+    def qr(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Economic QR factorization (Q, R)."""
+        if 'qr' not in self._cache:
+            self._cache['qr'] = linalg.qr(self.matrix, mode='economic', check_finite=False)
+        return self._cache['qr']
+
+    def svd(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Reduced singular value decomposition (U, s, Vt)."""
+        if 'svd' not in self._cache:
+            self._cache['svd'] = linalg.svd(self.matrix, full_matrices=False, check_finite=False)
+            self._cache['singular_values'] = self._cache['svd'][1]
+        return self._cache['svd']
+
+    def eigh(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Symmetric eigendecomposition (ascending eigenvalues, eigenvectors)."""
+        if not self.is_symmetric:
+            raise ValueError("eigh requires a symmetric matrix")
+        if 'eigh' not in self._cache:
+            self._cache['eigh'] = linalg.eigh(self.matrix, check_finite=False)
+        return self._cache['eigh']
+
+    def eig(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Eigendecomposition using the cheapest routine for the structure."""
+        self._require_square('Eigendecomposition')
+        if 'eig' not in self._cache:
+            if self.is_symmetric:
+                self._cache['eig'] = self.eigh()
+            else:
+                self._cache['eig'] = linalg.eig(self.matrix, check_finite=False)
+        return self._cache['eig']
+
+    # --- Derived properties ---
+
+    def eigenvalues(self) -> np.ndarray:
+        """Eigenvalues without eigenvectors when the structure allows it."""
+        self._require_square('Eigenvalues')
+        if 'eig' in self._cache:
+            return self._cache['eig'][0]
+        if self.is_triangular:
+            return np.diag(self.matrix).copy()
+        if 'eigenvalues' not in self._cache:
+            if self.is_symmetric:
+                self._cache['eigenvalues'] = linalg.eigvalsh(self.matrix, check_finite=False)
+            else:
+                self._cache['eigenvalues'] = linalg.eigvals(self.matrix, check_finite=False)
+        return self._cache['eigenvalues']
+
+    def singular_values(self) -> np.ndarray:
+        """Singular values in descending order."""
+        if 'singular_values' not in self._cache:
+            if self.structure == 'diagonal':
+                values = np.abs(np.diag(self.matrix))
+            elif self.is_symmetric and ('eigh' in self._cache or 'eigenvalues' in self._cache):
+                values = np.abs(self._cache['eigh'][0] if 'eigh' in self._cache
+                                else self._cache['eigenvalues'])
+            else:
+                values = linalg.svdvals(self.matrix, check_finite=False)
+            self._cache['singular_values'] = np.sort(values)[::-1]
+        return self._cache['singular_values']
+
+    def determinant(self) -> float:
+        self._require_square('Determinant')
+        if 'determinant' not in self._cache:
+            if self.is_triangular:
+                det = np.prod(np.diag(self.matrix))
+            elif 'eig' in self._cache or 'eigenvalues' in self._cache:
+                det = np.real(np.prod(self.eigenvalues()))
+            else:
+                lu, piv = self.lu()
+                swaps = np.count_nonzero(piv != np.arange(len(piv)))
+                det = np.prod(np.diag(lu)) * (-1) ** swaps
+            self._cache['determinant'] = float(det)
+        return self._cache['determinant']
+
+    def rank(self) -> int:
+        s = self.singular_values()
+        if s.size == 0:
+            return 0
+        tolerance = s[0] * max(self.shape) * np.finfo(float).eps
+        return int(np.count_nonzero(s > tolerance))
+
+    def condition_number(self) -> float:
+        """2-norm condition number, sigma_max / sigma_min."""
+        s = self.singular_values()
+        if s.size == 0 or s[-1] == 0:
+            return float('inf')
+        return float(s[0] / s[-1])
+
+    def frobenius_norm(self) -> float:
+        return float(np.linalg.norm(self.matrix, 'fro'))
+
+    def spectral_norm(self) -> float:
+        s = self.singular_values()
+        return float(s[0]) if s.size else 0.0
+
+    def trace(self) -> float:
+        return float(np.trace(self.matrix))
+
+    def inverse(self) -> np.ndarray:
+        """Inverse via the structure-specific solver; raises LinAlgError if singular."""
+        self._require_square('Inverse')
+        if 'inverse' not in self._cache:
+            self._cache['inverse'] = self.solve(np.eye(self.shape[0]))
+        return self._cache['inverse']
+
+    def solve(self, b: np.ndarray) -> np.ndarray:
+        """Solve A x = b reusing the cached factorization."""
+        self._require_square('Solve')
+        A = self.matrix
+        if self.structure == 'diagonal':
+            diagonal = np.diag(A)
+            if np.any(diagonal == 0):
+                raise linalg.LinAlgError("Matrix is singular")
+            return b / (diagonal[:, None] if np.ndim(b) == 2 else diagonal)
+        if self.structure in ('upper', 'lower'):
+            if np.any(np.diag(A) == 0):
+                raise linalg.LinAlgError("Matrix is singular")
+            return linalg.solve_triangular(A, b, lower=self.structure == 'lower', check_finite=False)
+        lu, piv = self.lu()
+        if np.any(np.diag(lu) == 0):
+            raise linalg.LinAlgError("Matrix is singular")
+        return linalg.lu_solve((lu, piv), b, check_finite=False)
+
+    def cached(self) -> list:
+        """Names of the factorizations computed so far."""
+        return sorted(self._cache)
@@ -6,14 +6,48 @@ import matplotlib.pyplot as plt
 from scipy import linalg
 import io
 import base64
+import hashlib
+import threading
+from collections import OrderedDict
 from typing import Dict, Any, Tuple, Optional
+from .matrix_factorization import MatrixFactorization
 
 class MatrixTools:
     """Advanced matrix operations using NumPy and SciPy."""
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 32):
         self.last_matrix = None
         self.last_result = None
+        self.cache_size = cache_size
+        self._factorizations: 'OrderedDict[tuple, MatrixFactorization]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def factorize(self, matrix: np.ndarray) -> MatrixFactorization:
+        """
+        Return the cached factorization object for this matrix, creating it if needed.
+
+        The factorization keeps a read-only private copy, so later in-place
+        edits of the caller's array cannot corrupt an entry keyed by its old
+        contents. The LRU is shared by request threads and guarded by a lock.
+        """
+        matrix = np.ascontiguousarray(matrix)
+        key = (matrix.shape, matrix.dtype.str, hashlib.blake2b(matrix.tobytes(), digest_size=16).digest())
+        with self._lock:
+            factorization = self._factorizations.get(key)
+            if factorization is not None:
+                self._factorizations.move_to_end(key)
+                return factorization
+
+        snapshot = matrix.copy()
+        snapshot.setflags(write=False)
+        factorization = MatrixFactorization(snapshot)
+        with self._lock:
+            # Another thread may have built the same entry meanwhile; keep the first
+            factorization = self._factorizations.setdefault(key, factorization)
+            self._factorizations.move_to_end(key)
+            while len(self._factorizations) > self.cache_size:
+                self._factorizations.popitem(last=False)
+        return factorization
     
     def create_matrix(self, matrix_type: str = "random", size: int = 3, **kwargs) -> np.ndarray:
         """Create different types of matrices."""
@@ -50,21 +84,24 @@ class MatrixTools:
         }
         
         try:
+            factorization = self.factorize(matrix)
+            results['structure'] = factorization.structure
+            
             if operation == "eigenvalues":
-                eigenvals, eigenvecs = linalg.eig(matrix)
+                eigenvals, eigenvecs = factorization.eig()
                 results['eigenvalues'] = eigenvals.tolist()
                 results['eigenvectors'] = eigenvecs.tolist()
                 results['description'] = f"Matrix has eigenvalues: {eigenvals}"
                 
             elif operation == "svd":
-                U, s, Vt = linalg.svd(matrix)
+                U, s, Vt = factorization.svd()
                 results['U'] = U.tolist()
                 results['singular_values'] = s.tolist()
                 results['Vt'] = Vt.tolist()
                 results['description'] = f"SVD decomposition completed. Singular values: {s}"
                 
             elif operation == "determinant":
-                det = linalg.det(matrix)
+                det = factorization.determinant()
                 results['determinant'] = float(det)
                 results['description'] = f"Determinant: {det:.6f}"
                 
@@ -73,28 +110,28 @@ class MatrixTools:
                     results['error'] = "Matrix must be square for inversion"
                     results['success'] = False
                 else:
-                    inv_matrix = linalg.inv(matrix)
+                    inv_matrix = factorization.inverse()
                     results['inverse'] = inv_matrix.tolist()
                     results['description'] = "Matrix inverse computed successfully"
                     
             elif operation == "rank":
-                rank = np.linalg.matrix_rank(matrix)
+                rank = factorization.rank()
                 results['rank'] = int(rank)
                 results['description'] = f"Matrix rank: {rank}"
                 
             elif operation == "condition":
-                cond = linalg.norm(matrix) * linalg.norm(linalg.pinv(matrix))
+                cond = factorization.condition_number()
                 results['condition_number'] = float(cond)
                 results['description'] = f"Condition number: {cond:.6f}"
                 
             elif operation == "trace":
-                trace = np.trace(matrix)
+                trace = factorization.trace()
                 results['trace'] = float(trace)
                 results['description'] = f"Matrix trace: {trace}"
                 
             elif operation == "norm":
-                frobenius_norm = linalg.norm(matrix, 'fro')
-                spectral_norm = linalg.norm(matrix, 2)
+                frobenius_norm = factorization.frobenius_norm()
+                spectral_norm = factorization.spectral_norm()
                 results['frobenius_norm'] = float(frobenius_norm)
                 results['spectral_norm'] = float(spectral_norm)
                 results['description'] = f"Frobenius norm: {frobenius_norm:.6f}, Spectral norm: {spectral_norm:.6f}"
@@ -107,6 +144,8 @@ class MatrixTools:
     
     def visualize_matrix(self, matrix: np.ndarray, visualization_type: str = "heatmap") -> str:
         """Create visualizations for matrices."""
+        factorization = self.factorize(matrix)
+        
         fig, axes = plt.subplots(2, 2, figsize=(12, 10))
         fig.suptitle('Matrix Analysis Visualization', fontsize=16, fontweight='bold')
         
@@ -119,7 +158,7 @@ class MatrixTools:
         
         # Eigenvalue plot
         try:
-            eigenvals, _ = linalg.eig(matrix)
+            eigenvals = factorization.eigenvalues()
             if np.all(np.isreal(eigenvals)):
                 eigenvals = np.real(eigenvals)
                 axes[0, 1].bar(range(len(eigenvals)), eigenvals, color='skyblue', edgecolor='navy')
@@ -141,7 +180,7 @@ class MatrixTools:
         
         # Singular values
         try:
-            _, s, _ = linalg.svd(matrix)
+            s = factorization.singular_values()
             axes[1, 0].semilogy(s, 'o-', color='orange', markersize=6)
             axes[1, 0].set_title('Singular Values (Log Scale)')
             axes[1, 0].set_xlabel('Index')
@@ -154,10 +193,10 @@ class MatrixTools:
         
         # Matrix properties summary
         try:
-            det = linalg.det(matrix)
-            trace = np.trace(matrix)
-            rank = np.linalg.matrix_rank(matrix)
-            frobenius_norm = linalg.norm(matrix, 'fro')
+            det = factorization.determinant()
+            trace = factorization.trace()
+            rank = factorization.rank()
+            frobenius_norm = factorization.frobenius_norm()
             
             properties_text = f"""Matrix Properties:
 Shape: {matrix.shape}
@@ -165,8 +204,9 @@ Determinant: {det:.4f}
 Trace: {trace:.4f}
 Rank: {rank}
 Frobenius Norm: {frobenius_norm:.4f}
-Is Square: {matrix.shape[0] == matrix.shape[1]}
-Is Symmetric: {np.allclose(matrix, matrix.T) if matrix.shape[0] == matrix.shape[1] else False}"""
+Is Square: {factorization.is_square}
+Is Symmetric: {factorization.is_symmetric}
+Structure: {factorization.structure}"""
             
             axes[1, 1].text(0.05, 0.95, properties_text, 
                            transform=axes[1, 1].transAxes, fontsize=10,
@@ -206,7 +246,8 @@ Is Symmetric: {np.allclose(matrix, matrix.T) if matrix.shape[0] == matrix.shape[
             
             # Property comparisons
             if matrix1.shape == matrix2.shape and matrix1.shape[0] == matrix1.shape[1]:
-                det1, det2 = linalg.det(matrix1), linalg.det(matrix2)
+                det1 = self.factorize(matrix1).determinant()
+                det2 = self.factorize(matrix2).determinant()
                 trace1, trace2 = np.trace(matrix1), np.trace(matrix2)
                 
                 results['determinant_diff'] = float(abs(det1 - det2))
@@ -27,7 +27,7 @@ except ImportError as e:
     print(f"Warning: Qiskit not available: {e}")
 
 from ..ui.base_module import BaseModule
-from ..utils.file_loader import FileLoader
+from ..services.circuit_service import get_circuit_service
 
 class CircuitExecutionThread(QThread):
     """Thread for executing quantum circuits without blocking UI."""
@@ -36,29 +36,24 @@ class CircuitExecutionThread(QThread):
     result_ready = pyqtSignal(object)   # Execution results
     error_occurred = pyqtSignal(str)    # Error message
     
-    def __init__(self, file_path):
+    def __init__(self, file_path, shots=1024, seed=None, method='automatic', precision='double', noise='ideal'):
         super().__init__()
         self.file_path = file_path
+        self.options = {'shots': shots, 'seed': seed, 'method': method, 'precision': precision, 'noise': noise}
         
     def run(self):
         """Execute the circuit file in a separate thread."""
         try:
-            # Load and execute the circuit file
-            loader = FileLoader()
-            circuit_data = loader.load_circuit_file(self.file_path)
+            # Load (or reuse) the compiled circuit and execute it
+            service = get_circuit_service()
+            artifact = service.load_file(self.file_path)
+            circuit = artifact.circuit
+            self.circuit_ready.emit(circuit)
             
-            if 'circuit' in circuit_data:
-                circuit = circuit_data['circuit']
-                self.circuit_ready.emit(circuit)
-                
-                # Execute circuit if it has measurements
-                if circuit.num_clbits > 0:
-                    simulator = AerSimulator()
-                    transpiled_circuit = transpile(circuit, simulator)
-                    job = simulator.run(transpiled_circuit, shots=1024)
-                    result = job.result()
-                    counts = result.get_counts()
-                    self.result_ready.emit(counts)
+            # Execute circuit if it has measurements
+            if circuit.num_clbits > 0:
+                counts, _ = service.counts(artifact, **self.options)
+                self.result_ready.emit(counts)
                     
         except Exception as e:
             self.error_occurred.emit(f"Circuit execution failed: {str(e)}\n{traceback.format_exc()}")
@@ -5,7 +5,7 @@ Based on the TypeScript ElectroMag class with electromagnetic calculations.
 
 import math
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Sequence
 from .quantum_wave import PhysicsConstants
 
 class ElectroMag:
@@ -240,12 +240,29 @@ class ElectroMagUtil:
     Extended electromagnetic utilities with visualization helpers.
     """
     
+    # Dormand-Prince 5(4) tableau
+    _RK45_C = np.array([0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1, 1])
+    _RK45_A = [
+        [],
+        [1 / 5],
+        [3 / 40, 9 / 40],
+        [44 / 45, -56 / 15, 32 / 9],
+        [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+        [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+        [35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84]
+    ]
+    _RK45_B5 = np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0])
+    _RK45_B4 = np.array([5179 / 57600, 0, 7571 / 16695, 393 / 640, -92097 / 339200, 187 / 2100, 1 / 40])
+    
     @staticmethod
     def create_field_line_points(charge: float, center_x: float = 0, center_y: float = 0, 
                                 num_lines: int = 8, max_distance: float = 5) -> Dict[str, Any]:
         """
         Generate points for electric field line visualization.
         
+        The lines are traced with trace_field_lines; for a lone charge they
+        are the radial rays from r = 0.1 to max_distance.
+        
         Args:
             charge: Charge magnitude (positive or negative)
             center_x: X coordinate of charge
@@ -256,29 +273,190 @@ class ElectroMagUtil:
         Returns:
             Dictionary with field line coordinates
         """
-        field_lines = []
+        margin = 2 * max_distance
+        traced = ElectroMagUtil.trace_field_lines(
+            [charge if charge != 0 else 1.0], [(center_x, center_y)],
+            lines_per_charge=num_lines,
+            bounds=(center_x - margin, center_x + margin, center_y - margin, center_y + margin),
+            seed_radius=0.1, max_length=max_distance - 0.1, max_step=max_distance / 49
+        )
+        direction = 'outward' if charge > 0 else 'inward'
+        field_lines = [{'x': line['x'], 'y': line['y'], 'direction': direction}
+                       for line in traced['field_lines']]
+        
+        return {
+            'field_lines': field_lines,
+            'charge': charge,
+            'center': [center_x, center_y]
+        }
+    
+    @staticmethod
+    def _field_direction(q: np.ndarray, sources: np.ndarray, points: np.ndarray,
+                         signs: np.ndarray) -> tuple:
+        """Unit field direction (times each line's sign) at a batch of points, and |E|/k."""
+        delta = points[:, None, :] - sources[None, :, :]
+        r_squared = np.einsum('ijk,ijk->ij', delta, delta)
+        np.maximum(r_squared, 1e-300, out=r_squared)
+        weights = q / (r_squared * np.sqrt(r_squared))
+        field = np.einsum('ij,ijk->ik', weights, delta)
+        magnitude = np.hypot(field[:, 0], field[:, 1])
+        safe = np.where(magnitude > 0, magnitude, 1.0)
+        return field * (signs / safe)[:, None], magnitude
+    
+    @staticmethod
+    def trace_field_lines(charges: Sequence[float], positions: Sequence[Sequence[float]],
+                          lines_per_charge: int = 16, bounds: Optional[Sequence[float]] = None,
+                          seed_radius: Optional[float] = None, max_length: Optional[float] = None,
+                          max_steps: int = 2000, tolerance: float = 1e-5,
+                          min_step: Optional[float] = None,
+                          max_step: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Trace electric field lines of point charges with adaptive RK45 steps.
+        
+        Lines are seeded on a small circle around every charge, their number
+        proportional to |q| (lines_per_charge for the largest charge). Lines
+        from positive charges follow E and lines from negative charges follow
+        -E, integrated in arc length with the Dormand-Prince 5(4) pair.
         
-        for i in range(num_lines):
-            angle = 2 * math.pi * i / num_lines
-            line_points_x = []
-            line_points_y = []
+        All lines advance in lockstep as one NumPy batch with a step size per
+        line; each iteration only evaluates the lines still running. A line
+        stops when it reaches another charge, leaves bounds, runs max_length,
+        hits a null of the field or uses max_steps steps.
+        
+        Args:
+            charges: Charge values in Coulombs
+            positions: (x, y) position of each charge in meters
+            lines_per_charge: Lines for the largest |q|
+            bounds: (xmin, xmax, ymin, ymax); defaults to a box around the charges
+            seed_radius: Seed circle radius (default 1% of the bounds diagonal)
+            max_length: Optional arc length limit per line
+            max_steps: Maximum accepted steps per line
+            tolerance: Local error tolerance per step (in meters)
+            min_step: Smallest step (default seed_radius / 100)
+            max_step: Largest step (default 2% of the bounds diagonal)
+            
+        Returns:
+            Dictionary with field_lines (x, y, start_charge, end, end_charge),
+            bounds and the number of RK45 iterations
+        """
+        q = np.asarray(charges, dtype=float).ravel()
+        sources = np.asarray(positions, dtype=float).reshape(-1, 2)
+        if len(q) == 0 or len(q) != len(sources):
+            raise ValueError("Each charge needs exactly one (x, y) position")
+        
+        if bounds is None:
+            margin = max(1.0, 0.5 * float(np.ptp(sources, axis=0).max()))
+            low, high = sources.min(axis=0) - margin, sources.max(axis=0) + margin
+            bounds = (low[0], high[0], low[1], high[1])
+        x_min, x_max, y_min, y_max = (float(b) for b in bounds)
+        diagonal = math.hypot(x_max - x_min, y_max - y_min)
+        seed_radius = seed_radius if seed_radius is not None else 0.01 * diagonal
+        min_step = min_step if min_step is not None else seed_radius / 100
+        max_step = max_step if max_step is not None else 0.02 * diagonal
+        max_length = max_length if max_length is not None else np.inf
+        
+        # Seeds: evenly spaced angles, count proportional to |q|
+        strongest = np.abs(q).max()
+        seed_points, signs, origins = [], [], []
+        for index, (value, center) in enumerate(zip(q, sources)):
+            if value == 0:
+                continue
+            count = max(1, int(round(lines_per_charge * abs(value) / strongest)))
+            angles = 2 * np.pi * np.arange(count) / count
+            seed_points.append(center + seed_radius * np.column_stack((np.cos(angles), np.sin(angles))))
+            signs.append(np.full(count, np.sign(value)))
+            origins.append(np.full(count, index))
+        points = np.concatenate(seed_points)
+        signs = np.concatenate(signs)
+        origins = np.concatenate(origins)
+        num_lines = len(points)
+        
+        # Preallocated path storage and per-line state
+        paths = np.empty((num_lines, max_steps + 1, 2))
+        paths[:, 0] = points
+        counts = np.ones(num_lines, dtype=int)
+        steps = np.full(num_lines, min(max_step, max(min_step, seed_radius)))
+        lengths = np.zeros(num_lines)
+        end_reason = np.full(num_lines, 'max_steps', dtype=object)
+        end_charge = np.full(num_lines, -1)
+        active = np.arange(num_lines)
+        
+        A, B5, B4 = ElectroMagUtil._RK45_A, ElectroMagUtil._RK45_B5, ElectroMagUtil._RK45_B4
+        iterations = 0
+        while len(active) and iterations < 50 * max_steps:
+            iterations += 1
+            current = points[active]
+            # The last step of a length-limited line lands exactly on max_length
+            h = np.minimum(steps[active], max_length - lengths[active])[:, None]
+            line_signs = signs[active]
+            
+            # Seven stages for every active line at once
+            stages = []
+            null_field = None
+            for stage in range(7):
+                position = current.copy()
+                for coefficient, derivative in zip(A[stage], stages):
+                    if coefficient:
+                        position += h * coefficient * derivative
+                direction, magnitude = ElectroMagUtil._field_direction(q, sources, position, line_signs)
+                if stage == 0:
+                    null_field = magnitude == 0
+                stages.append(direction)
+            stacked = np.stack(stages)
+            fifth = current + h * np.einsum('s,sij->ij', B5, stacked)
+            error = np.hypot(*(h * np.einsum('s,sij->ij', B5 - B4, stacked)).T)
+            
+            accepted = (error <= tolerance) | (h[:, 0] <= min_step)
+            scale = 0.9 * (tolerance / np.maximum(error, 1e-300)) ** 0.2
+            steps[active] = np.clip(h[:, 0] * np.clip(scale, 0.2, 5.0), min_step, max_step)
             
-            for r in np.linspace(0.1, max_distance, 50):
-                x = center_x + r * math.cos(angle)
-                y = center_y + r * math.sin(angle)
-                line_points_x.append(x)
-                line_points_y.append(y)
+            moved = active[accepted]
+            points[moved] = fifth[accepted]
+            lengths[moved] += h[accepted, 0]
+            paths[moved, counts[moved]] = points[moved]
+            counts[moved] += 1
             
+            # Stopping conditions
+            done = np.zeros(num_lines, dtype=bool)
+            end_reason[active[null_field]] = 'null_field'
+            done[active[null_field]] = True
+            
+            moved_points = points[moved]
+            distance = np.hypot(*(moved_points[:, None, :] - sources[None, :, :]).transpose(2, 0, 1))
+            distance[np.arange(len(moved)), origins[moved]] = np.inf
+            nearest = distance.argmin(axis=1)
+            captured = distance[np.arange(len(moved)), nearest] <= seed_radius
+            end_reason[moved[captured]] = 'charge'
+            end_charge[moved[captured]] = nearest[captured]
+            done[moved[captured]] = True
+            
+            outside = ((moved_points[:, 0] < x_min) | (moved_points[:, 0] > x_max) |
+                       (moved_points[:, 1] < y_min) | (moved_points[:, 1] > y_max))
+            end_reason[moved[outside & ~captured]] = 'bounds'
+            done[moved[outside]] = True
+            
+            too_long = lengths[moved] >= max_length * (1 - 1e-12)
+            end_reason[moved[too_long & ~captured & ~outside]] = 'max_length'
+            done[moved[too_long]] = True
+            
+            done[moved[counts[moved] > max_steps]] = True
+            active = active[~done[active]]
+        
+        field_lines = []
+        for line in range(num_lines):
+            path = paths[line, :counts[line]]
             field_lines.append({
-                'x': line_points_x,
-                'y': line_points_y,
-                'direction': 'outward' if charge > 0 else 'inward'
+                'x': path[:, 0].tolist(),
+                'y': path[:, 1].tolist(),
+                'start_charge': int(origins[line]),
+                'end': end_reason[line],
+                'end_charge': int(end_charge[line]) if end_charge[line] >= 0 else None
             })
         
         return {
             'field_lines': field_lines,
-            'charge': charge,
-            'center': [center_x, center_y]
+            'bounds': [x_min, x_max, y_min, y_max],
+            'iterations': iterations
         }
     
     @staticmethod
@@ -315,4 +493,88 @@ class ElectroMagUtil:
                 Ex_total += sign * E_magnitude * unit_x
                 Ey_total += sign * E_magnitude * unit_y
         
-        return (Ex_total, Ey_total)
\ No newline at end of file
+        return (Ex_total, Ey_total)
+    
+    @staticmethod
+    def calculate_field_grid(charges: Sequence[float], positions: Sequence[Sequence[float]],
+                             x: Sequence[float], y: Sequence[float],
+                             memory_budget: int = 64 * 1024 ** 2,
+                             dtype: str = 'float64') -> Dict[str, Any]:
+        """
+        Calculate the electric field and potential of point charges over a grid.
+        
+        Grid points are processed in chunks; each chunk broadcasts against all
+        charges at once, so the charges x points loop runs in NumPy. The chunk
+        size is chosen so the (points x charges) temporaries stay within
+        memory_budget. Points that coincide with a charge get no contribution
+        from it, as in calculate_field_at_point.
+        
+        Args:
+            charges: Charge values in Coulombs
+            positions: (x, y) position of each charge in meters
+            x: Grid x coordinates (1D, columns)
+            y: Grid y coordinates (1D, rows)
+            memory_budget: Bytes allowed for the per-chunk temporaries
+            dtype: 'float64' or 'float32' (halves memory and doubles the chunk size)
+            
+        Returns:
+            Dictionary with Ex, Ey and potential arrays of shape (len(y), len(x)),
+            plus the chunk size used
+        """
+        if dtype not in ('float64', 'float32'):
+            raise ValueError("dtype must be 'float64' or 'float32'")
+        float_type = np.dtype(dtype)
+        q = np.asarray(charges, dtype=float_type).ravel()
+        sources = np.asarray(positions, dtype=float_type).reshape(-1, 2)
+        if len(q) != len(sources):
+            raise ValueError("Each charge needs exactly one (x, y) position")
+        x = np.asarray(x, dtype=float_type).ravel()
+        y = np.asarray(y, dtype=float_type).ravel()
+        k = float_type.type(8.99e9)  # Coulomb's constant, as in calculate_field_at_point
+        
+        num_points = len(x) * len(y)
+        Ex = np.zeros(num_points, dtype=float_type)
+        Ey = np.zeros(num_points, dtype=float_type)
+        potential = np.zeros(num_points, dtype=float_type)
+        if len(q) == 0 or num_points == 0:
+            shape = (len(y), len(x))
+            return {'Ex': Ex.reshape(shape), 'Ey': Ey.reshape(shape),
+                    'potential': potential.reshape(shape), 'chunk_size': 0}
+        
+        # Four (chunk x charges) temporaries are alive at once: dx, dy, r² and the weights
+        chunk_size = max(1, int(memory_budget // (4 * len(q) * float_type.itemsize)))
+        grid_x = np.broadcast_to(x, (len(y), len(x))).ravel()
+        grid_y = np.broadcast_to(y[:, None], (len(y), len(x))).ravel()
+        
+        for start in range(0, num_points, chunk_size):
+            stop = min(start + chunk_size, num_points)
+            dx = grid_x[start:stop, None] - sources[:, 0]
+            dy = grid_y[start:stop, None] - sources[:, 1]
+            r_squared = dx * dx
+            r_squared += dy * dy
+            
+            # weights = 1/r (0 where the point sits on a charge)
+            coincident = r_squared == 0
+            r_squared[coincident] = 1
+            weights = np.sqrt(r_squared)
+            np.reciprocal(weights, out=weights)
+            weights[coincident] = 0
+            weights *= q
+            np.sum(weights, axis=1, out=potential[start:stop])
+            
+            # q/r³ for the field components
+            np.reciprocal(r_squared, out=r_squared)
+            weights *= r_squared
+            np.einsum('ij,ij->i', dx, weights, out=Ex[start:stop])
+            np.einsum('ij,ij->i', dy, weights, out=Ey[start:stop])
+        
+        shape = (len(y), len(x))
+        Ex *= k
+        Ey *= k
+        potential *= k
+        return {
+            'Ex': Ex.reshape(shape),
+            'Ey': Ey.reshape(shape),
+            'potential': potential.reshape(shape),
+            'chunk_size': chunk_size
+        }
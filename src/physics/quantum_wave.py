@@ -5,7 +5,7 @@ Based on the TypeScript WaveDef class with quantum mechanical properties.
 
 import math
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 class PhysicsConstants:
     """Physical constants for quantum calculations."""
@@ -182,6 +182,146 @@ class QuantumWave:
         wave_value = self.get_wave_function(distance, time)
         return wave_value ** 2
 
+    # --- Vectorized (ufunc-style) evaluation ---
+
+    @staticmethod
+    def _output_buffer(shape: tuple, out: Optional[np.ndarray]) -> np.ndarray:
+        """Return out if it matches the broadcast shape, otherwise allocate a new buffer."""
+        if out is None:
+            return np.empty(shape, dtype=np.float64)
+        if out.shape != shape:
+            raise ValueError(f"out has shape {out.shape}, expected {shape}")
+        return out
+
+    def phase_array(self, distance, time, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Vectorized phase φ(x, t) = kx - ωt + φ.
+        
+        Args:
+            distance: Positions in meters (array-like, broadcast against time)
+            time: Times in seconds (array-like)
+            out: Optional preallocated float64 buffer of the broadcast shape
+            
+        Returns:
+            Phase array (the out buffer when given)
+        """
+        distance = np.asarray(distance, dtype=np.float64)
+        time = np.asarray(time, dtype=np.float64)
+        out = self._output_buffer(np.broadcast_shapes(distance.shape, time.shape), out)
+        np.multiply(self.wave_number, distance, out=out)
+        out -= self.angular_frequency * time
+        out += self.phase
+        return out
+
+    def wave_function_array(self, distance, time, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Vectorized wave function ψ(x,t) = A * cos(kx - ωt + φ).
+        
+        Args:
+            distance: Positions in meters (array-like, broadcast against time)
+            time: Times in seconds (array-like)
+            out: Optional preallocated float64 buffer of the broadcast shape
+            
+        Returns:
+            Wave function values
+        """
+        out = self.phase_array(distance, time, out=out)
+        np.cos(out, out=out)
+        out *= self.amplitude_max
+        return out
+
+    def probability_density_array(self, distance, time, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Vectorized probability density |ψ(x,t)|².
+        
+        Args:
+            distance: Positions in meters (array-like, broadcast against time)
+            time: Times in seconds (array-like)
+            out: Optional preallocated float64 buffer of the broadcast shape
+            
+        Returns:
+            Probability density values
+        """
+        out = self.wave_function_array(distance, time, out=out)
+        np.square(out, out=out)
+        return out
+
+    def _temporal_phase(self, time, out: Optional[np.ndarray]) -> np.ndarray:
+        """Compute ωt + φ into the output buffer."""
+        time = np.asarray(time, dtype=np.float64)
+        out = self._output_buffer(time.shape, out)
+        np.multiply(self.angular_frequency, time, out=out)
+        out += self.phase
+        return out
+
+    def amplitude_array(self, time, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Vectorized temporal amplitude A * cos(ωt + φ).
+        
+        Args:
+            time: Times in seconds (array-like)
+            out: Optional preallocated float64 buffer
+            
+        Returns:
+            Amplitude values
+        """
+        out = self._temporal_phase(time, out)
+        np.cos(out, out=out)
+        out *= self.amplitude_max
+        return out
+
+    def oscillation_velocity_array(self, time, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Vectorized oscillation velocity -Aω * sin(ωt + φ).
+        
+        Args:
+            time: Times in seconds (array-like)
+            out: Optional preallocated float64 buffer
+            
+        Returns:
+            Velocity values
+        """
+        out = self._temporal_phase(time, out)
+        np.sin(out, out=out)
+        out *= -self.amplitude_max * self.angular_frequency
+        return out
+
+    def oscillation_acceleration_array(self, time, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Vectorized oscillation acceleration -Aω² * cos(ωt + φ).
+        
+        Args:
+            time: Times in seconds (array-like)
+            out: Optional preallocated float64 buffer
+            
+        Returns:
+            Acceleration values
+        """
+        out = self._temporal_phase(time, out)
+        np.cos(out, out=out)
+        out *= -self.amplitude_max * self.angular_frequency ** 2
+        return out
+
+    def wave_field(self, positions, times, out: Optional[np.ndarray] = None,
+                   probability: bool = False) -> np.ndarray:
+        """
+        Evaluate ψ(x,t) (or |ψ|²) over a whole space-time grid in one pass.
+        
+        Args:
+            positions: 1D array of positions in meters (grid columns)
+            times: 1D array of times in seconds (grid rows)
+            out: Optional preallocated float64 buffer of shape (len(times), len(positions))
+            probability: Return |ψ|² instead of ψ
+            
+        Returns:
+            2D array indexed as field[time_index, position_index]
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(1, -1)
+        times = np.asarray(times, dtype=np.float64).reshape(-1, 1)
+        if probability:
+            return self.probability_density_array(positions, times, out=out)
+        return self.wave_function_array(positions, times, out=out)
+
     def get_group_velocity(self) -> float:
         """
         Calculate group velocity for wave packet.
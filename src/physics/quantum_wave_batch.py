@@ -0,0 +1,180 @@
+"""
+Struct-of-arrays QuantumWave for parameter sweeps.
+Evaluates the QuantumWave relations for whole arrays of frequencies and masses at once.
+"""
+
+import numpy as np
+from typing import Dict, Any, List, Optional
+
+from src.physics.quantum_wave import PhysicsConstants, QuantumWave
+
+# Arrow export is optional
+PYARROW_AVAILABLE = False
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+
+class QuantumWaveBatch:
+    """
+    Many quantum waves stored column by column.
+
+    Each attribute of QuantumWave (energy, momentum, wavelength, ...) is a
+    NumPy array with one entry per wave, so a sweep over thousands of
+    frequency/mass pairs is a handful of vectorized operations instead of
+    thousands of Python objects.
+    """
+
+    COLUMNS = (
+        'frequency', 'amplitude_max', 'particle_mass', 'phase', 'energy', 'momentum',
+        'wavelength', 'period', 'wave_velocity', 'particle_velocity', 'angular_frequency',
+        'wave_number', 'group_velocity', 'phase_velocity'
+    )
+
+    def __init__(self, frequencies, amplitudes=1.0, masses=None, phases=0.0):
+        """
+        Initialize a batch of waves; scalar arguments broadcast against the arrays.
+
+        Args:
+            frequencies: Wave frequencies in Hz
+            amplitudes: Maximum amplitudes
+            masses: Particle masses in kg (optional, defaults to electron mass)
+            phases: Phase offsets in radians
+        """
+        if masses is None:
+            masses = PhysicsConstants.ELECTRON_MASS
+        columns = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(frequencies, dtype=np.float64)),
+            np.asarray(amplitudes, dtype=np.float64),
+            np.asarray(masses, dtype=np.float64),
+            np.asarray(phases, dtype=np.float64)
+        )
+        if columns[0].ndim != 1:
+            raise ValueError("QuantumWaveBatch expects one-dimensional parameter arrays")
+        if np.any(columns[0] <= 0) or np.any(columns[2] <= 0):
+            raise ValueError("Frequencies and masses must be positive")
+
+        # Broadcast views are read-only and may alias; take owned copies
+        self.frequency, self.amplitude_max, self.particle_mass, self.phase = (
+            np.array(column) for column in columns)
+        self._calculate_all_parameters()
+
+    @classmethod
+    def sweep(cls, frequencies, masses=None, amplitude: float = 1.0) -> 'QuantumWaveBatch':
+        """
+        Build the Cartesian product of a frequency range and a mass range.
+
+        Args:
+            frequencies: Frequencies in Hz
+            masses: Particle masses in kg (optional, defaults to electron mass)
+            amplitude: Amplitude shared by every wave
+
+        Returns:
+            Batch ordered mass-major (all frequencies for the first mass, then the next)
+        """
+        frequencies = np.atleast_1d(np.asarray(frequencies, dtype=np.float64))
+        if masses is None:
+            masses = [PhysicsConstants.ELECTRON_MASS]
+        masses = np.atleast_1d(np.asarray(masses, dtype=np.float64))
+        mass_grid, frequency_grid = np.meshgrid(masses, frequencies, indexing='ij')
+        return cls(frequency_grid.ravel(), amplitude, mass_grid.ravel())
+
+    def _calculate_all_parameters(self) -> None:
+        """Vectorized counterpart of QuantumWave._calculate_all_parameters."""
+        # Angular frequency: ω = 2πf
+        self.angular_frequency = 2 * np.pi * self.frequency
+
+        # Quantum energy relation: E = ℏω
+        self.energy = PhysicsConstants.PLANCK_REDUCED * self.angular_frequency
+
+        # Free particle: p = √(2mE)
+        self.momentum = np.sqrt(2 * self.particle_mass * self.energy)
+
+        # de Broglie wavelength: λ = h/p
+        self.wavelength = PhysicsConstants.PLANCK_CONSTANT / self.momentum
+
+        # Wave number: k = 2π/λ
+        self.wave_number = 2 * np.pi / self.wavelength
+
+        # Period: T = 1/f
+        self.period = 1.0 / self.frequency
+
+        # Phase velocity: v = λf
+        self.wave_velocity = self.wavelength * self.frequency
+
+        # Particle velocity: v = p/m
+        self.particle_velocity = self.momentum / self.particle_mass
+
+    def __len__(self) -> int:
+        return len(self.frequency)
+
+    @property
+    def group_velocity(self) -> np.ndarray:
+        """Group velocity v_g = p/m for every wave."""
+        return self.particle_velocity
+
+    @property
+    def phase_velocity(self) -> np.ndarray:
+        """Phase velocity v_p = ω/k for every wave."""
+        return self.angular_frequency / self.wave_number
+
+    def wave(self, index: int) -> QuantumWave:
+        """
+        Materialize a single entry as a QuantumWave.
+
+        Args:
+            index: Position in the batch
+
+        Returns:
+            QuantumWave with the same parameters
+        """
+        wave = QuantumWave(float(self.frequency[index]), float(self.amplitude_max[index]),
+                           float(self.particle_mass[index]))
+        wave.phase = float(self.phase[index])
+        return wave
+
+    def columns(self, names: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Return the requested columns as NumPy arrays.
+
+        Args:
+            names: Column names (defaults to all of COLUMNS)
+
+        Returns:
+            Dictionary of column name to array
+        """
+        names = list(names) if names is not None else list(self.COLUMNS)
+        unknown = [name for name in names if name not in self.COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown column(s): {', '.join(unknown)}")
+        return {name: getattr(self, name) for name in names}
+
+    def to_dict(self, names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Convert the batch to a columnar dictionary for JSON serialization.
+
+        Args:
+            names: Column names (defaults to all of COLUMNS)
+
+        Returns:
+            Dictionary of column name to list of floats, plus the row count
+        """
+        data = {name: values.tolist() for name, values in self.columns(names).items()}
+        data['count'] = len(self)
+        return data
+
+    def to_arrow(self, names: Optional[List[str]] = None):
+        """
+        Export the batch as a pyarrow Table (zero-copy from the float64 columns).
+
+        Args:
+            names: Column names (defaults to all of COLUMNS)
+
+        Returns:
+            pyarrow.Table with one float64 column per property
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for Arrow export")
+        columns = self.columns(names)
+        return pa.table({name: pa.array(values) for name, values in columns.items()})
@@ -0,0 +1,163 @@
+"""
+Spectral analysis for the quantum waves module.
+Real-input FFT spectra and Welch power spectral density with cached grids and windows.
+"""
+
+import inspect
+import numpy as np
+from functools import lru_cache, wraps
+from scipy import fft, signal
+from typing import Dict, Any, Tuple
+
+WINDOWS = ('rectangular', 'hann', 'hamming', 'blackman')
+WAVE_DURATION = 4 * np.pi  # quantum units, the span plotted by /api/waves/generate
+
+# At most GRID_CACHE_SIZE entries of up to MAX_CACHED_SAMPLES float64 values per cache (8 MB);
+# longer grids (generate_wave allows 10^6 samples) are rebuilt on every call
+GRID_CACHE_SIZE = 16
+MAX_CACHED_SAMPLES = 65536
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    """Freeze a cached array so callers cannot corrupt the cache."""
+    array.setflags(write=False)
+    return array
+
+def _grid_cache(function):
+    """lru_cache for a builder with a 'samples' argument, bypassed above MAX_CACHED_SAMPLES."""
+    cached = lru_cache(maxsize=GRID_CACHE_SIZE)(function)
+    signature = inspect.signature(function)
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        if signature.bind(*args, **kwargs).arguments['samples'] > MAX_CACHED_SAMPLES:
+            return function(*args, **kwargs)
+        return cached(*args, **kwargs)
+
+    wrapper.cache_info = cached.cache_info
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
+
+@_grid_cache
+def time_grid(samples: int, duration: float = WAVE_DURATION) -> np.ndarray:
+    """
+    Sample times from 0 to duration inclusive (cached, read-only).
+
+    Args:
+        samples: Number of samples
+        duration: Span in quantum units
+
+    Returns:
+        Array of sample times
+    """
+    return _read_only(np.linspace(0, duration, samples))
+
+@_grid_cache
+def frequency_axis(samples: int, spacing: float) -> np.ndarray:
+    """
+    Non-negative frequency bins of an rfft of length samples (cached, read-only).
+
+    Args:
+        samples: Signal length
+        spacing: Sample spacing
+
+    Returns:
+        Array of samples // 2 + 1 frequencies
+    """
+    return _read_only(fft.rfftfreq(samples, spacing))
+
+@_grid_cache
+def window(name: str, samples: int) -> np.ndarray:
+    """
+    Periodic analysis window (cached, read-only).
+
+    Args:
+        name: One of WINDOWS
+        samples: Window length
+
+    Returns:
+        Window coefficients
+    """
+    if name not in WINDOWS:
+        raise ValueError(f"Unknown window: {name}")
+    if name == 'rectangular':
+        return _read_only(np.ones(samples))
+    return _read_only(signal.get_window(name, samples))
+
+def amplitude_spectrum(values: np.ndarray, spacing: float,
+                       window_name: str = 'rectangular') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Magnitude spectrum of a real signal via rfft.
+
+    Only the non-negative half is computed, which is all a real signal
+    carries. Magnitudes are unnormalized |X_k| as in np.fft.fft and the
+    output keeps the first samples // 2 bins (rfft's last bin is dropped),
+    so the rectangular window reproduces the previous full-FFT plot.
+
+    Args:
+        values: Real signal
+        spacing: Sample spacing
+        window_name: One of WINDOWS
+
+    Returns:
+        Tuple (frequencies, magnitudes), samples // 2 bins each
+    """
+    samples = len(values)
+    half = samples // 2
+    if window_name != 'rectangular':
+        values = values * window(window_name, samples)
+    magnitude = np.abs(fft.rfft(values)[:half])
+    return frequency_axis(samples, spacing)[:half], magnitude
+
+def welch_psd(values: np.ndarray, spacing: float, segment_length: int = 1024,
+              overlap: float = 0.5, window_name: str = 'hann') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Welch power spectral density for long signals.
+
+    The signal is cut into overlapping windowed segments whose periodograms
+    are averaged: the output has segment_length // 2 + 1 bins whatever the
+    signal length, with much lower variance than a single periodogram.
+
+    Args:
+        values: Real signal
+        spacing: Sample spacing
+        segment_length: Samples per segment (capped at the signal length)
+        overlap: Fraction of overlap between segments, in [0, 1)
+        window_name: One of WINDOWS
+
+    Returns:
+        Tuple (frequencies, power spectral density)
+    """
+    segment_length = min(segment_length, len(values))
+    frequencies, psd = signal.welch(
+        values, fs=1.0 / spacing, window=window(window_name, segment_length),
+        nperseg=segment_length, noverlap=int(segment_length * overlap)
+    )
+    return frequencies, psd
+
+def analyze_spectrum(values: np.ndarray, spacing: float, method: str = 'auto',
+                     window_name: str = 'rectangular', welch_threshold: int = 8192,
+                     segment_length: int = 1024) -> Dict[str, Any]:
+    """
+    Spectrum of a real signal with the method picked by length.
+
+    Args:
+        values: Real signal
+        spacing: Sample spacing
+        method: 'fft', 'welch' or 'auto' (Welch above welch_threshold samples)
+        window_name: One of WINDOWS (Welch defaults to hann when rectangular is given)
+        welch_threshold: Length above which 'auto' switches to Welch
+        segment_length: Welch segment length
+
+    Returns:
+        Dictionary with frequencies, values, the method used and the value kind
+    """
+    if method == 'auto':
+        method = 'welch' if len(values) > welch_threshold else 'fft'
+    if method == 'fft':
+        frequencies, magnitude = amplitude_spectrum(values, spacing, window_name)
+        return {'frequencies': frequencies, 'values': magnitude, 'method': 'fft', 'kind': 'magnitude'}
+    if method == 'welch':
+        welch_window = 'hann' if window_name == 'rectangular' else window_name
+        frequencies, psd = welch_psd(values, spacing, segment_length=segment_length, window_name=welch_window)
+        return {'frequencies': frequencies, 'values': psd, 'method': 'welch', 'kind': 'psd'}
+    raise ValueError(f"Unknown spectrum method: {method}")
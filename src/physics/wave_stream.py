@@ -0,0 +1,98 @@
+"""
+Animation frame generators for the quantum waves module.
+Frames are produced lazily so a stream never holds more than the current one.
+"""
+
+import numpy as np
+from typing import Dict, Any, Iterator, Optional
+
+from src.physics.quantum_wave import QuantumWave
+from src.physics.wave_packet import WavePacketSimulation
+
+WAVE_TYPES = ('sine', 'cosine', 'square', 'probability')
+
+def evaluate_wave_type(wave_type: str, argument: np.ndarray, amplitude: float,
+                       out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Evaluate the module's wave shapes for a phase argument.
+
+    Args:
+        wave_type: 'sine', 'cosine', 'square' or 'probability' (anything else is sine)
+        argument: Phase argument in radians
+        amplitude: Peak amplitude
+        out: Optional float64 buffer of the argument's shape
+
+    Returns:
+        Wave values (the out buffer when given)
+    """
+    out = np.empty_like(argument, dtype=np.float64) if out is None else out
+    if wave_type == 'cosine':
+        np.cos(argument, out=out)
+    else:
+        np.sin(argument, out=out)
+        if wave_type == 'square':
+            np.sign(out, out=out)
+        elif wave_type == 'probability':
+            np.square(out, out=out)
+    out *= amplitude
+    return out
+
+def traveling_wave_frames(frequency: float, amplitude: float, phase: float, wave_type: str,
+                          points: int = 512, num_frames: int = 300,
+                          time_per_frame: float = 0.05) -> Iterator[Dict[str, Any]]:
+    """
+    Frames of the traveling wave u(x,t) = A f(kx - ωt + φπ) in quantum units.
+
+    Args:
+        frequency: Wave frequency (k = ω = frequency, as in the static plot)
+        amplitude: Peak amplitude
+        phase: Phase offset in multiples of π
+        wave_type: One of WAVE_TYPES
+        points: Samples over x in [0, 4π]
+        num_frames: Number of frames to produce
+        time_per_frame: Time advanced per frame
+
+    Yields:
+        Dictionary with frame index, time and float32 values (a fresh array
+        per frame, so frames can be kept)
+    """
+    x = np.linspace(0, 4 * np.pi, points)
+    scaled_x = frequency * x + phase * np.pi
+    argument = np.empty(points)
+    values = np.empty(points)
+    for index in range(num_frames):
+        t = index * time_per_frame
+        np.subtract(scaled_x, frequency * t, out=argument)
+        evaluate_wave_type(wave_type, argument, amplitude, out=values)
+        yield {'frame': index, 'time': t, 'values': values.astype(np.float32)}
+
+def packet_frames(frequency: float, num_frames: int = 300, points: int = 1024, steps_per_frame: int = 10,
+                  potential: str = 'free', potential_params: Optional[Dict[str, Any]] = None):
+    """
+    Build a wave packet simulation and its frame generator.
+
+    The slider frequency f is mapped to f × 10¹⁵ Hz for an electron, which
+    gives de Broglie wavelengths of a few nanometres.
+
+    Args:
+        frequency: Slider frequency
+        num_frames: Number of frames to produce
+        points: Grid points
+        steps_per_frame: Split-step iterations between frames
+        potential: Named potential (see WavePacketSimulation.POTENTIALS)
+        potential_params: Parameters for the named potential
+
+    Returns:
+        Tuple (simulation, generator of dicts with frame, time and float32
+        values, a fresh array per frame)
+    """
+    wave = QuantumWave(frequency * 1e15, 1.0)
+    simulation = WavePacketSimulation.from_quantum_wave(wave, grid_points=points)
+    simulation.set_potential(potential, **(potential_params or {}))
+
+    def generate() -> Iterator[Dict[str, Any]]:
+        for frame in simulation.frames(num_frames, steps_per_frame=steps_per_frame):
+            yield {'frame': frame['frame'], 'time': frame['time'], 'values': frame['density'].astype(np.float32),
+                   'norm': frame['norm'], 'expectation_position': frame['expectation_position']}
+
+    return simulation, generate()
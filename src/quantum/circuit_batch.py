@@ -0,0 +1,160 @@
+"""
+Batched execution of several circuits for the quantum circuits module.
+Circuits are grouped by simulation target and qubit count, transpiled per group and sampled in one multi-experiment run per method.
+"""
+
+import time
+from collections import defaultdict
+from typing import Dict, Any, List, Optional
+
+from src.quantum.circuit_execution import (ProgressCallback, select_simulation_method, get_simulator,
+                                           get_pass_manager, transpile_target)
+from src.quantum.noise_profiles import IDEAL, noise_run_options
+from src.quantum.transpilation import DEFAULT_OPTIMIZATION_LEVEL, SIMULATOR_BASIS, run_many
+
+MAX_BATCH_CIRCUITS = 64
+MAX_BATCH_SHOTS = 16_000_000  # circuits x shots for one batch
+MAX_SYNC_BATCH_SHOTS = 1_000_000  # larger batches run as background jobs
+
+def check_batch_budget(num_circuits: int, shots: int) -> int:
+    """
+    Total shots (circuits x shots) of a batch.
+
+    Raises:
+        ValueError: When the batch has too many circuits or the total exceeds MAX_BATCH_SHOTS
+    """
+    if num_circuits > MAX_BATCH_CIRCUITS:
+        raise ValueError(f"Batch has {num_circuits} circuits, the limit is {MAX_BATCH_CIRCUITS}")
+    total_shots = num_circuits * shots
+    if total_shots > MAX_BATCH_SHOTS:
+        raise ValueError(f"Batch needs {num_circuits} circuits x {shots} shots = {total_shots} shots, "
+                         f"the limit is {MAX_BATCH_SHOTS}")
+    return total_shots
+
+def batch_skip_reason(circuit) -> Optional[str]:
+    """Why a circuit cannot be sampled in a batch (None when it can)."""
+    if circuit.num_clbits == 0:
+        return "Circuit has no measurements to sample"
+    if circuit.parameters:
+        names = ', '.join(parameter.name for parameter in circuit.parameters)
+        return f"Circuit has unbound parameters ({names}); run it through /api/circuits/sweep"
+    return None
+
+def run_circuit_batch(circuits: Dict[str, Any], shots: int = 1024, seed: Optional[int] = None,
+                      method: str = 'automatic', precision: str = 'double', noise: str = IDEAL,
+                      optimization_level: int = DEFAULT_OPTIMIZATION_LEVEL, basis: str = SIMULATOR_BASIS,
+                      progress: Optional[ProgressCallback] = None,
+                      transpiled_caches: Optional[Dict[str, Dict[Any, Any]]] = None) -> Dict[str, Any]:
+    """
+    Sample many circuits with one simulator job per method.
+
+    Args:
+        circuits: {name: QuantumCircuit}, in the order results should be listed
+        shots, seed, method, precision, noise, optimization_level, basis:
+            Simulation options (see simulate_counts); with 'automatic' each
+            circuit gets its own method
+        progress: Optional stage callback
+        transpiled_caches: Optional {name: per-circuit transpile cache}
+            (see simulate_counts); cached circuits skip transpilation
+
+    Returns:
+        Dictionary with 'results' ({name: counts, num_qubits, method, reason}),
+        'skipped' ({name: reason}), 'groups' (per method and qubit count:
+        circuits, transpiled, transpile_time; method is None for explicit
+        basis presets, which compile independently of the simulator) and
+        'simulation' (per method job timings and totals)
+    """
+    check_batch_budget(len(circuits), shots)
+    report = progress or (lambda stage, fraction: None)
+    transpiled_caches = transpiled_caches or {}
+    simulator_basis = basis == SIMULATOR_BASIS
+
+    skipped: Dict[str, str] = {}
+    selected: Dict[str, tuple] = {}
+    groups: Dict[tuple, List[str]] = defaultdict(list)
+    for name, circuit in circuits.items():
+        reason = batch_skip_reason(circuit)
+        if reason is not None:
+            skipped[name] = reason
+            continue
+        # Explicit bases compile first and pick the method for the transpiled gates
+        circuit_method = None
+        if simulator_basis:
+            circuit_method, method_reason = (select_simulation_method(circuit, noise=noise) if method == 'automatic'
+                                             else (method, 'requested'))
+            selected[name] = (circuit_method, method_reason)
+        groups[(circuit_method, circuit.num_qubits)].append(name)
+
+    # Transpile each group with one pass manager run (Qiskit spreads a list of circuits over worker processes)
+    report('transpile', 0.2)
+    transpiled: Dict[str, Any] = {}
+    group_info = []
+    ordered_groups = sorted(groups.items(), key=lambda item: (item[0][1], item[0][0] or ''))
+    for index, ((group_method, num_qubits), names) in enumerate(ordered_groups):
+        key = transpile_target(group_method, precision, noise, optimization_level, basis)
+        pending = [name for name in names if key not in transpiled_caches.get(name, {})]
+        start_time = time.time()
+        if pending:
+            pass_manager, lock = get_pass_manager(*key)
+            with lock:
+                outputs = run_many(pass_manager, [circuits[name] for name in pending])
+            for name, transpiled_circuit in zip(pending, outputs):
+                if name in transpiled_caches:
+                    transpiled_caches[name][key] = transpiled_circuit
+                transpiled[name] = transpiled_circuit
+        for name in names:
+            if name not in transpiled:
+                transpiled[name] = transpiled_caches[name][key]
+            if name not in selected:
+                selected[name] = (select_simulation_method(transpiled[name], noise=noise) if method == 'automatic'
+                                  else (method, 'requested'))
+        group_info.append({
+            'method': group_method,
+            'num_qubits': num_qubits,
+            'circuits': names,
+            'transpiled': len(pending),
+            'transpile_time': time.time() - start_time
+        })
+        report('transpile', 0.2 + 0.3 * (index + 1) / len(groups))
+
+    # One multi-experiment job per method; Aer runs the experiments in parallel
+    report('simulate', 0.5)
+    results: Dict[str, Dict[str, Any]] = {}
+    jobs = []
+    by_method: Dict[str, List[str]] = defaultdict(list)
+    for name in circuits:
+        if name in selected:
+            by_method[selected[name][0]].append(name)
+    for index, (job_method, names) in enumerate(by_method.items()):
+        simulator = get_simulator(job_method, precision, noise)
+        start_time = time.time()
+        result = simulator.run([transpiled[name] for name in names], shots=shots, seed_simulator=seed,
+                               max_parallel_experiments=0, **noise_run_options(job_method, noise)).result()
+        jobs.append({'method': job_method, 'circuits': len(names), 'simulation_time': time.time() - start_time})
+        for position, name in enumerate(names):
+            results[name] = {
+                'counts': result.get_counts(position),
+                'num_qubits': circuits[name].num_qubits,
+                'method': job_method,
+                'reason': selected[name][1]
+            }
+        report('simulate', 0.5 + 0.4 * (index + 1) / len(by_method))
+
+    report('collect', 0.95)
+    return {
+        'results': {name: results[name] for name in circuits if name in results},
+        'skipped': skipped,
+        'groups': group_info,
+        'simulation': {
+            'precision': precision,
+            'noise': noise,
+            'optimization_level': optimization_level,
+            'basis': basis,
+            'shots': shots,
+            'seed': seed,
+            'circuits': len(results),
+            'jobs': jobs,
+            'transpile_time': sum(group['transpile_time'] for group in group_info),
+            'simulation_time': sum(job['simulation_time'] for job in jobs)
+        }
+    }
@@ -0,0 +1,430 @@
+"""
+Circuit execution pipeline for the quantum circuits module.
+Draw, transpile, simulate and plot a loaded circuit, reporting progress between stages.
+"""
+
+import io
+import base64
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Any, Callable, Optional, Tuple
+
+import numpy as np
+from matplotlib.figure import Figure
+
+from src.quantum.graph_circuit import render_circuit_diagram
+from src.quantum.noise_profiles import IDEAL, NOISE_PROFILES, get_noise_model, is_pauli_profile, noise_run_options
+from src.quantum.transpilation import (DEFAULT_OPTIMIZATION_LEVEL, SIMULATOR_BASIS, build_pass_manager,
+                                      parse_transpile_options, run_timed)
+from src.quantum.counts_processing import (MAX_HISTOGRAM_BARS, MAX_TEXT_OUTCOMES, OTHER_LABEL, summarize_counts,
+                                           summarize_probabilities, summary_items)
+
+# progress(stage, fraction); it may raise a BaseException (e.g. JobCancelled) to abort
+# between stages, which the pipeline's own `except Exception` handlers let through
+ProgressCallback = Callable[[str, float], None]
+
+SIMULATION_METHODS = ('automatic', 'statevector', 'density_matrix', 'matrix_product_state', 'stabilizer')
+PRECISIONS = ('double', 'single')
+MAX_SHOTS = 1_000_000
+
+# Gates the stabilizer engine simulates exactly (plus non-unitary bookkeeping)
+CLIFFORD_GATES = frozenset({
+    'id', 'x', 'y', 'z', 'h', 's', 'sdg', 'sx', 'sxdg', 'cx', 'cy', 'cz', 'swap', 'iswap', 'ecr', 'dcx'
+})
+NON_GATE_OPERATIONS = frozenset({'measure', 'barrier', 'reset', 'delay'})
+
+# Automatic selection: statevector memory doubles per qubit (2^n amplitudes), MPS cost grows with
+# the entanglement across a cut, bounded by the two-qubit gates that cross it
+MPS_MIN_QUBITS = 20
+MPS_MAX_CUT_CROSSINGS = 12
+STATEVECTOR_MAX_QUBITS = 28
+EXACT_PREVIEW_QUBITS = 12  # circuits without measurements get an exact probability plot up to this width
+DENSITY_MATRIX_MAX_QUBITS = 12  # noisy circuits up to this width evolve one density matrix for all shots
+
+def parse_simulation_options(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate request-level simulation options.
+
+    Args:
+        data: Mapping with optional shots, seed, method, precision, noise,
+            optimization_level and basis
+
+    Returns:
+        Dictionary with shots, seed (int or None), method, precision, noise
+        (a NOISE_PROFILES name), optimization_level and basis (see
+        parse_transpile_options)
+
+    Raises:
+        ValueError: On out-of-range or unknown values
+    """
+    shots = data.get('shots')
+    shots = 1024 if shots in (None, '') else int(shots)
+    if not 1 <= shots <= MAX_SHOTS:
+        raise ValueError(f"shots must be between 1 and {MAX_SHOTS}")
+    seed = data.get('seed')
+    seed = None if seed in (None, '') else int(seed)
+    if seed is not None and seed < 0:
+        raise ValueError("seed must be a non-negative integer")
+    method = data.get('method') or 'automatic'
+    if method not in SIMULATION_METHODS:
+        raise ValueError(f"Unknown method: {method}. Available: {', '.join(SIMULATION_METHODS)}")
+    precision = data.get('precision') or 'double'
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision: {precision}. Available: {', '.join(PRECISIONS)}")
+    noise = data.get('noise') or IDEAL
+    if noise not in NOISE_PROFILES:
+        raise ValueError(f"Unknown noise profile: {noise}. Available: {', '.join(NOISE_PROFILES)}")
+    return {'shots': shots, 'seed': seed, 'method': method, 'precision': precision, 'noise': noise,
+            **parse_transpile_options(data)}
+
+def circuit_features(circuit) -> Dict[str, Any]:
+    """
+    Structural features used to pick a simulation method.
+
+    Args:
+        circuit: QuantumCircuit
+
+    Returns:
+        Dictionary with num_qubits, operation counts, is_clifford,
+        two_qubit_gates and max_cut_crossings (two-qubit gates spanning the
+        busiest cut between neighbouring qubits in a linear layout)
+    """
+    num_qubits = circuit.num_qubits
+    crossings = [0] * max(num_qubits - 1, 0)
+    is_clifford = True
+    two_qubit_gates = 0
+    for instruction in circuit.data:
+        operation = instruction.operation
+        if operation.name in NON_GATE_OPERATIONS:
+            continue
+        if operation.name not in CLIFFORD_GATES or getattr(operation, 'condition', None) is not None:
+            is_clifford = False
+        indices = [circuit.find_bit(qubit).index for qubit in instruction.qubits]
+        if len(indices) >= 2:
+            two_qubit_gates += 1
+            for cut in range(min(indices), max(indices)):
+                crossings[cut] += 1
+    return {
+        'num_qubits': num_qubits,
+        'operations': dict(circuit.count_ops()),
+        'is_clifford': is_clifford,
+        'two_qubit_gates': two_qubit_gates,
+        'max_cut_crossings': max(crossings, default=0)
+    }
+
+def select_simulation_method(circuit, features: Optional[Dict[str, Any]] = None,
+                             noise: str = IDEAL) -> Tuple[str, str]:
+    """
+    Pick the Aer method for a circuit.
+
+    Clifford-only circuits go to the stabilizer engine (polynomial in the
+    qubit count), wide circuits with little entanglement across any cut go
+    to matrix product states, everything else to statevector. With a noise
+    profile the stabilizer engine is only used for Pauli noise, and small
+    circuits use one density-matrix evolution instead of per-shot trajectories.
+
+    Returns:
+        Tuple (method, reason)
+    """
+    features = features or circuit_features(circuit)
+    noisy = noise != IDEAL
+    if features['is_clifford'] and (not noisy or is_pauli_profile(noise)):
+        return 'stabilizer', 'Clifford-only circuit' + (' with Pauli noise' if noisy else '')
+    if noisy and features['num_qubits'] <= DENSITY_MATRIX_MAX_QUBITS:
+        return 'density_matrix', f"noisy circuit with {features['num_qubits']} qubits"
+    wide = features['num_qubits'] >= MPS_MIN_QUBITS
+    if wide and features['max_cut_crossings'] <= MPS_MAX_CUT_CROSSINGS:
+        return 'matrix_product_state', (f"{features['num_qubits']} qubits with at most "
+                                        f"{features['max_cut_crossings']} two-qubit gates across any cut")
+    if features['num_qubits'] > STATEVECTOR_MAX_QUBITS:
+        return 'matrix_product_state', f"{features['num_qubits']} qubits exceed the statevector limit"
+    return 'statevector', 'general circuit'
+
+@lru_cache(maxsize=32)
+def get_simulator(method: str = 'automatic', precision: str = 'double', noise: str = IDEAL):
+    """
+    Shared AerSimulator per (method, precision, noise profile).
+
+    Run options (shots, seed, parameter binds) are passed per call, so one
+    backend instance serves every request instead of being rebuilt each time.
+    Noisy simulators carry the cached NoiseModel of their profile.
+    """
+    from qiskit_aer import AerSimulator
+
+    noise_model = get_noise_model(noise)
+    if noise_model is None:
+        return AerSimulator(method=method, precision=precision)
+    return AerSimulator(method=method, precision=precision, noise_model=noise_model)
+
+@lru_cache(maxsize=64)
+def get_pass_manager(method: Optional[str], precision: Optional[str] = 'double', noise: Optional[str] = IDEAL,
+                     optimization_level: int = DEFAULT_OPTIMIZATION_LEVEL, basis: str = SIMULATOR_BASIS):
+    """
+    Shared preset pass manager per target, with the lock that serializes its runs.
+
+    'simulator' basis pass managers compile for get_simulator(method,
+    precision, noise); other basis presets do not depend on the simulator
+    and are requested with method, precision and noise set to None (see
+    transpile_target). Passes keep per-run state on themselves, so a pass
+    manager must not run in two threads at once.
+
+    Returns:
+        Tuple (StagedPassManager, threading.Lock)
+    """
+    simulator = get_simulator(method, precision, noise) if basis == SIMULATOR_BASIS else None
+    return build_pass_manager(simulator, optimization_level, basis), threading.Lock()
+
+def transpile_target(method: str, precision: str = 'double', noise: str = IDEAL,
+                     optimization_level: int = DEFAULT_OPTIMIZATION_LEVEL, basis: str = SIMULATOR_BASIS) -> tuple:
+    """get_pass_manager arguments (and transpile cache key) for a simulation target."""
+    if basis == SIMULATOR_BASIS:
+        return (method, precision, noise, optimization_level, basis)
+    return (None, None, None, optimization_level, basis)
+
+def transpile_for(circuit, method: str, precision: str = 'double', noise: str = IDEAL,
+                  optimization_level: int = DEFAULT_OPTIMIZATION_LEVEL, basis: str = SIMULATOR_BASIS,
+                  cache: Optional[Dict[Any, Any]] = None) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Transpile with the cached pass manager of a target, reusing cache entries.
+
+    Returns:
+        Tuple (transpiled circuit, info with optimization_level, basis,
+        pass_manager_time (building the pass manager, ~0 once cached),
+        transpile_time, transpile_cached and passes, the slowest passes
+        with their time; empty when the circuit came from the cache)
+    """
+    key = transpile_target(method, precision, noise, optimization_level, basis)
+    info = {'optimization_level': optimization_level, 'basis': basis}
+    if cache is not None and key in cache:
+        return cache[key], {**info, 'pass_manager_time': 0.0, 'transpile_time': 0.0, 'transpile_cached': True,
+                            'passes': []}
+
+    start_time = time.time()
+    pass_manager, lock = get_pass_manager(*key)
+    info['pass_manager_time'] = time.time() - start_time
+    start_time = time.time()
+    with lock:
+        transpiled_circuit, passes = run_timed(pass_manager, circuit)
+    elapsed = time.time() - start_time
+    if cache is not None:
+        cache[key] = transpiled_circuit
+    return transpiled_circuit, {**info, 'transpile_time': elapsed, 'transpile_cached': False, 'passes': passes}
+
+def prepare_circuit(circuit, method: str = 'automatic', precision: str = 'double', noise: str = IDEAL,
+                    optimization_level: int = DEFAULT_OPTIMIZATION_LEVEL, basis: str = SIMULATOR_BASIS,
+                    cache: Optional[Dict[Any, Any]] = None) -> Tuple[Any, str, str, Dict[str, Any]]:
+    """
+    Pick the simulation method and transpile for it.
+
+    With the 'simulator' basis the method is picked first and the circuit is
+    compiled for that simulator; with an explicit basis the circuit is
+    compiled first and the method is picked for the gates that will run.
+
+    Returns:
+        Tuple (transpiled circuit, method, reason, transpile info)
+    """
+    reason = 'requested'
+    if basis != SIMULATOR_BASIS:
+        transpiled_circuit, info = transpile_for(circuit, method, precision, noise, optimization_level, basis, cache)
+        if method == 'automatic':
+            method, reason = select_simulation_method(transpiled_circuit, noise=noise)
+        return transpiled_circuit, method, reason, info
+    if method == 'automatic':
+        method, reason = select_simulation_method(circuit, noise=noise)
+    transpiled_circuit, info = transpile_for(circuit, method, precision, noise, optimization_level, basis, cache)
+    return transpiled_circuit, method, reason, info
+
+def simulate_counts(circuit, shots: int = 1024, seed: Optional[int] = None, method: str = 'automatic',
+                    precision: str = 'double', noise: str = IDEAL,
+                    optimization_level: int = DEFAULT_OPTIMIZATION_LEVEL, basis: str = SIMULATOR_BASIS,
+                    progress: Optional[ProgressCallback] = None,
+                    transpiled_cache: Optional[Dict[Any, Any]] = None) -> Tuple[Dict[str, int], Dict[str, Any]]:
+    """
+    Transpile and sample a circuit on AerSimulator.
+
+    Args:
+        circuit: QuantumCircuit with measurements
+        shots: Measurement shots
+        seed: Simulator seed for reproducible counts (None for random)
+        method: One of SIMULATION_METHODS ('automatic' uses select_simulation_method)
+        precision: 'double' or 'single' (single halves statevector memory)
+        noise: NOISE_PROFILES name ('ideal' for a noiseless run)
+        optimization_level: Transpiler optimization level (0-3); higher
+            levels spend more compile time to shrink the circuit
+        basis: BASIS_PRESETS name ('simulator' compiles for the simulator's own gates)
+        progress: Optional stage callback
+        transpiled_cache: Optional dict holding transpiled versions of this
+            circuit by target (see transpile_target), e.g. a CircuitArtifact's
+
+    Returns:
+        Tuple (counts, simulation info with the method used, timings and
+        the slowest transpiler passes)
+    """
+    report = progress or (lambda stage, fraction: None)
+
+    report('transpile', 0.4)
+    transpiled_circuit, method, reason, transpile_info = prepare_circuit(
+        circuit, method, precision, noise, optimization_level, basis, transpiled_cache)
+    simulator = get_simulator(method, precision, noise)
+
+    report('simulate', 0.6)
+    start_time = time.time()
+    result = simulator.run(transpiled_circuit, shots=shots, seed_simulator=seed,
+                           **noise_run_options(method, noise)).result()
+    simulation_time = time.time() - start_time
+
+    info = {
+        'method': method,
+        'reason': reason,
+        'precision': precision,
+        'noise': noise,
+        'shots': shots,
+        'seed': seed,
+        **transpile_info,
+        'simulation_time': simulation_time
+    }
+    return result.get_counts(), info
+
+def figure_to_base64(fig: Figure) -> str:
+    """Render a figure to a base64 PNG string."""
+    img_buffer = io.BytesIO()
+    fig.savefig(img_buffer, format='png', bbox_inches='tight', dpi=100)
+    img_buffer.seek(0)
+    return base64.b64encode(img_buffer.getvalue()).decode()
+
+def render_summary_histogram(summary: Dict[str, Any], ylabel: str = 'Counts',
+                             title: str = 'Measurement Results', label_format: str = '{:.0f}') -> str:
+    """Bar chart of a counts summary (see summarize_counts) as base64 PNG."""
+    result_fig = Figure(figsize=(10, 6), dpi=100)
+    result_ax = result_fig.add_subplot(111)
+
+    items = summary_items(summary)
+    states = [label for label, _ in items]
+    values = np.array([value for _, value in items])
+    colors = ['skyblue'] * len(summary['labels']) + ['lightgray'] * (len(items) - len(summary['labels']))
+
+    bars = result_ax.bar(np.arange(len(values)), values, color=colors, edgecolor='navy', alpha=0.7)
+    rotation = 90 if len(states) > 8 or max((len(state) for state in states), default=0) > 6 else 0
+    result_ax.set_xticks(np.arange(len(values)), states, rotation=rotation, fontsize=9 if rotation else 10)
+    result_ax.set_xlabel('Measurement States', fontsize=12)
+    result_ax.set_ylabel(ylabel, fontsize=12)
+    title_suffix = (f" (top {len(summary['labels'])} of {summary['num_outcomes']} outcomes)"
+                    if summary['other_outcomes'] else '')
+    result_ax.set_title(title + title_suffix, fontsize=14, fontweight='bold')
+    result_ax.grid(True, alpha=0.3)
+
+    # Value labels for every bar in one call
+    result_ax.bar_label(bars, labels=[label_format.format(value) for value in values.tolist()],
+                        padding=2, fontweight='bold', fontsize=8 if len(values) > 16 else 10)
+
+    result_fig.tight_layout()
+    return figure_to_base64(result_fig)
+
+def render_counts_histogram(counts: Dict[str, Any], ylabel: str = 'Counts', title: str = 'Measurement Results',
+                            label_format: str = '{:.0f}', max_bars: int = MAX_HISTOGRAM_BARS) -> str:
+    """Bar chart of measurement counts (or probabilities) as base64 PNG, top max_bars outcomes plus 'other'."""
+    return render_summary_histogram(summarize_counts(counts, max_bars), ylabel=ylabel, title=title,
+                                    label_format=label_format)
+
+def format_summary_text(summary: Dict[str, Any], header: str, line_format: str) -> str:
+    """
+    Text listing of a counts summary.
+
+    line_format is formatted with state (|outcome⟩, or the 'other' bucket),
+    value, total and probability.
+    """
+    total = summary['total']
+    states = [f"|{label}⟩" for label in summary['labels']]
+    if summary['other_outcomes']:
+        states.append(f"{OTHER_LABEL} ({summary['other_outcomes']} outcomes)")
+    values = [value for _, value in summary_items(summary)]
+    lines = [header]
+    lines += [line_format.format(state=state, value=value, total=total, probability=value / total if total else 0.0)
+              for state, value in zip(states, values)]
+    return '\n'.join(lines) + '\n'
+
+def format_counts_text(counts: Dict[str, int], max_outcomes: int = MAX_TEXT_OUTCOMES) -> str:
+    """Text summary of measurement counts and probabilities (top max_outcomes outcomes plus 'other')."""
+    summary = summarize_counts(counts, max_outcomes)
+    total_shots = int(summary['total'])
+    header = f"Total shots: {total_shots}\nMeasurement probabilities:"
+    if summary['other_outcomes']:
+        header += f" (top {len(summary['labels'])} of {summary['num_outcomes']} outcomes)"
+    return format_summary_text(summary, header, "  {state}: {value:.0f}/{total:.0f} ({probability:.3f})")
+
+def execute_circuit(circuit, progress: Optional[ProgressCallback] = None, shots: int = 1024,
+                    seed: Optional[int] = None, method: str = 'automatic', precision: str = 'double',
+                    noise: str = IDEAL, optimization_level: int = DEFAULT_OPTIMIZATION_LEVEL,
+                    basis: str = SIMULATOR_BASIS, diagram_mode: str = 'auto',
+                    transpiled_cache: Optional[Dict[Any, Any]] = None) -> Dict[str, Any]:
+    """
+    Draw, transpile, simulate and plot an already loaded circuit.
+
+    Args:
+        circuit: QuantumCircuit
+        progress: Optional callback called with (stage, fraction) before each stage
+        shots, seed, method, precision, noise, optimization_level, basis:
+            Simulation options (see simulate_counts);
+            the exact preview of circuits without measurements is always noiseless
+        diagram_mode: 'auto', 'mpl', 'text' or 'summary' (see render_circuit_diagram)
+        transpiled_cache: Optional per-circuit transpile cache (see simulate_counts)
+
+    Returns:
+        Dictionary with circuit_info, circuit_image (PNG, or None for text
+        diagrams), circuit_text, diagram (mode, hash, cached, render_time),
+        result_image, result_text and simulation (method used and timings)
+    """
+    report = progress or (lambda stage, fraction: None)
+
+    report('draw', 0.2)
+    diagram = render_circuit_diagram(circuit, mode=diagram_mode)
+
+    # Execute circuit if it has measurements
+    result_img = None
+    result_text = ""
+    simulation = None
+    if circuit.num_clbits > 0 and circuit.parameters:
+        names = ', '.join(parameter.name for parameter in circuit.parameters)
+        result_text = f"Circuit has unbound parameters ({names}); run it through /api/circuits/sweep"
+    elif circuit.num_clbits > 0:
+        try:
+            counts, simulation = simulate_counts(circuit, shots=shots, seed=seed, method=method,
+                                                 precision=precision, noise=noise,
+                                                 optimization_level=optimization_level, basis=basis, progress=report,
+                                                 transpiled_cache=transpiled_cache)
+
+            report('plot', 0.9)
+            result_img = render_counts_histogram(counts)
+            result_text = format_counts_text(counts)
+        except Exception as e:
+            result_text = f"Execution error: {str(e)}"
+    elif circuit.num_qubits <= EXACT_PREVIEW_QUBITS and not circuit.parameters:
+        # No measurements to sample: show the exact outcome distribution instead
+        try:
+            from src.quantum.exact_state import compute_exact_outputs
+
+            report('simulate', 0.6)
+            exact = compute_exact_outputs(circuit, ('probabilities',), method=method, precision=precision)
+            simulation = exact['simulation']
+
+            report('plot', 0.9)
+            summary = summarize_probabilities(exact['probabilities'], circuit.num_qubits, MAX_HISTOGRAM_BARS)
+            result_img = render_summary_histogram(summary, ylabel='Probability', title='Exact Probabilities',
+                                                  label_format='{:.3f}')
+            summary = summarize_probabilities(exact['probabilities'], circuit.num_qubits, MAX_TEXT_OUTCOMES)
+            result_text = format_summary_text(summary, "Exact probabilities (circuit has no measurements):",
+                                              "  {state}: {value:.6f}")
+        except Exception as e:
+            result_text = f"Execution error: {str(e)}"
+
+    report('done', 1.0)
+    return {
+        'circuit_info': f"Circuit: {circuit.num_qubits} qubits, {circuit.num_clbits} classical bits",
+        'circuit_image': diagram['image'],
+        'circuit_text': diagram['text'],
+        'diagram': {name: diagram[name] for name in ('mode', 'hash', 'cached', 'render_time')},
+        'result_image': result_img,
+        'result_text': result_text,
+        'simulation': simulation
+    }
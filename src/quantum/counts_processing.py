@@ -0,0 +1,79 @@
+"""
+Counts post-processing for the quantum circuits module.
+Counts and probability vectors are reduced with numpy to the top-k outcomes plus an 'other' bucket before plotting or printing.
+"""
+
+import numpy as np
+from typing import Dict, Any, Tuple
+
+MAX_HISTOGRAM_BARS = 32
+MAX_TEXT_OUTCOMES = 64
+OTHER_LABEL = 'other'
+
+def counts_to_arrays(counts: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """Outcome labels (object array) and values (float64) of a counts dictionary."""
+    labels = np.fromiter(counts.keys(), dtype=object, count=len(counts))
+    values = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+    return labels, values
+
+def top_k_indices(values: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest values, largest first (all indices when there are at most k)."""
+    if len(values) <= k:
+        return np.arange(len(values))
+    top = np.argpartition(values, -k)[-k:]
+    return top[np.argsort(-values[top], kind='stable')]
+
+def _summary(labels, values: np.ndarray, total: float, num_outcomes: int) -> Dict[str, Any]:
+    return {
+        'labels': list(labels),
+        'values': values,
+        'other': float(total - values.sum()),
+        'other_outcomes': num_outcomes - len(values),
+        'total': float(total),
+        'num_outcomes': num_outcomes
+    }
+
+def summarize_counts(counts: Dict[str, Any], k: int = MAX_HISTOGRAM_BARS) -> Dict[str, Any]:
+    """
+    Reduce counts to at most k outcomes.
+
+    Small distributions are kept whole and ordered by outcome; larger ones
+    keep the k most frequent outcomes (most frequent first) and fold the
+    rest into an 'other' bucket.
+
+    Returns:
+        Dictionary with labels, values (float64 array), other (folded
+        total), other_outcomes, total and num_outcomes
+    """
+    labels, values = counts_to_arrays(counts)
+    total = values.sum()
+    if len(values) <= k:
+        order = np.argsort(labels.astype(str), kind='stable')
+    else:
+        order = top_k_indices(values, k)
+    return _summary(labels[order], values[order], total, len(values))
+
+def summarize_probabilities(probabilities: np.ndarray, num_qubits: int, k: int = MAX_HISTOGRAM_BARS,
+                            threshold: float = 1e-12) -> Dict[str, Any]:
+    """
+    summarize_counts for a dense probability vector indexed by basis state.
+
+    Outcomes below threshold are dropped and bitstring labels are only
+    formatted for the outcomes that are kept.
+    """
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    support = np.flatnonzero(probabilities > threshold)
+    values = probabilities[support]
+    if len(support) > k:
+        top = top_k_indices(values, k)
+        support, values = support[top], values[top]
+    labels = [format(int(index), f"0{num_qubits}b") for index in support]
+    return _summary(labels, values, probabilities[probabilities > threshold].sum(),
+                    int(np.count_nonzero(probabilities > threshold)))
+
+def summary_items(summary: Dict[str, Any]):
+    """(label, value) pairs of a summary, with the 'other' bucket last when present."""
+    items = list(zip(summary['labels'], summary['values'].tolist()))
+    if summary['other_outcomes']:
+        items.append((f"{OTHER_LABEL} ({summary['other_outcomes']})", summary['other']))
+    return items
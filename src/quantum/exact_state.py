@@ -0,0 +1,127 @@
+"""
+Exact (shot-free) circuit outputs through Aer save instructions.
+Statevector amplitudes, outcome probabilities and Pauli expectation values.
+"""
+
+import time
+import numpy as np
+from typing import Dict, Any, List, Optional, Sequence, Union
+
+from src.quantum.circuit_execution import select_simulation_method, get_simulator, transpile_for
+from src.quantum.noise_profiles import IDEAL
+
+EXACT_OUTPUTS = ('statevector', 'probabilities', 'expectation')
+MAX_DENSE_QUBITS = 24  # 2^24 complex128 amplitudes = 256 MB
+STATEVECTOR_METHODS = ('statevector', 'matrix_product_state')
+
+ObservableSpec = Union[str, Sequence[Sequence[Any]]]
+
+def parse_observable(spec: ObservableSpec, num_qubits: int):
+    """
+    Build a SparsePauliOp from a Pauli label or a list of [label, coefficient] terms.
+
+    Labels follow Qiskit's order: the rightmost character acts on qubit 0.
+
+    Raises:
+        ValueError: On malformed labels or a width different from the circuit
+    """
+    from qiskit.quantum_info import SparsePauliOp
+
+    terms = [(spec, 1.0)] if isinstance(spec, str) else [(str(term[0]), complex(term[1])) for term in spec]
+    if not terms:
+        raise ValueError("Observables need at least one Pauli term")
+    for label, _ in terms:
+        if len(label) != num_qubits or set(label.upper()) - set('IXYZ'):
+            raise ValueError(f"Invalid Pauli label '{label}': expected {num_qubits} characters from I, X, Y, Z")
+    return SparsePauliOp.from_list([(label.upper(), coeff) for label, coeff in terms])
+
+def observable_label(spec: ObservableSpec) -> str:
+    """Readable name of an observable spec, e.g. 'ZZ' or '1.0*ZZ + 0.5*XX'."""
+    if isinstance(spec, str):
+        return spec.upper()
+    return ' + '.join(f"{complex(term[1]).real:g}*{str(term[0]).upper()}" for term in spec)
+
+def compute_exact_outputs(circuit, outputs: Sequence[str] = ('probabilities',),
+                          observables: Optional[List[ObservableSpec]] = None,
+                          method: str = 'automatic', precision: str = 'double') -> Dict[str, Any]:
+    """
+    Simulate a circuit once and read exact quantities instead of sampling.
+
+    Final measurements are stripped; mid-circuit measurements are rejected
+    since the state after them is itself random.
+
+    Args:
+        circuit: QuantumCircuit
+        outputs: Any of EXACT_OUTPUTS
+        observables: Pauli specs for 'expectation' (see parse_observable)
+        method: Simulation method ('automatic' picks one; statevector output
+            needs statevector or matrix_product_state)
+        precision: 'double' or 'single'
+
+    Returns:
+        Dictionary with 'statevector' (complex128 for double precision,
+        complex64 for single), 'probabilities'
+        (float64 array indexed by basis state), 'expectation_values'
+        (list of {observable, value}) as requested, plus simulation info
+    """
+    unknown = [name for name in outputs if name not in EXACT_OUTPUTS]
+    if unknown or not outputs:
+        raise ValueError(f"Outputs must be chosen from: {', '.join(EXACT_OUTPUTS)}")
+    if 'expectation' in outputs and not observables:
+        raise ValueError("The 'expectation' output needs at least one observable")
+
+    state_circuit = circuit.remove_final_measurements(inplace=False)
+    if any(instruction.operation.name == 'measure' for instruction in state_circuit.data):
+        raise ValueError("Exact outputs need a circuit without mid-circuit measurements")
+    num_qubits = state_circuit.num_qubits
+    dense = [name for name in ('statevector', 'probabilities') if name in outputs]
+    if dense and num_qubits > MAX_DENSE_QUBITS:
+        raise ValueError(f"{', '.join(dense)} output is limited to {MAX_DENSE_QUBITS} qubits "
+                         f"(circuit has {num_qubits}); use expectation values instead")
+    operators = [parse_observable(spec, num_qubits) for spec in (observables or [])] \
+        if 'expectation' in outputs else []
+
+    reason = 'requested'
+    if method == 'automatic':
+        method, reason = select_simulation_method(state_circuit)
+        if 'statevector' in outputs and method not in STATEVECTOR_METHODS:
+            method, reason = 'statevector', 'statevector output requested'
+    elif 'statevector' in outputs and method not in STATEVECTOR_METHODS:
+        raise ValueError(f"Statevector output needs one of: {', '.join(STATEVECTOR_METHODS)}")
+
+    # Importing qiskit_aer (inside get_simulator) registers the save_* circuit methods
+    simulator = get_simulator(method, precision, IDEAL)
+    qubits = list(range(num_qubits))
+    if 'statevector' in outputs:
+        state_circuit.save_statevector(label='statevector')
+    if 'probabilities' in outputs:
+        state_circuit.save_probabilities(qubits, label='probabilities')
+    for index, operator in enumerate(operators):
+        state_circuit.save_expectation_value(operator, qubits, label=f"expectation_{index}")
+
+    transpiled_circuit, transpile_info = transpile_for(state_circuit, method, precision, IDEAL)
+    start_time = time.time()
+    result = simulator.run(transpiled_circuit, shots=1).result()
+    simulation_time = time.time() - start_time
+    data = result.data(0)
+
+    exact: Dict[str, Any] = {}
+    if 'statevector' in outputs:
+        exact['statevector'] = np.asarray(data['statevector'],
+                                          dtype=np.complex64 if precision == 'single' else np.complex128)
+    if 'probabilities' in outputs:
+        exact['probabilities'] = np.asarray(data['probabilities'], dtype=np.float64)
+    if operators:
+        exact['expectation_values'] = [
+            {'observable': observable_label(spec), 'value': float(np.real(data[f"expectation_{index}"]))}
+            for index, spec in enumerate(observables)
+        ]
+    exact['simulation'] = {
+        'method': method,
+        'reason': reason,
+        'precision': precision,
+        'num_qubits': num_qubits,
+        'transpile_time': transpile_info['transpile_time'],
+        'simulation_time': simulation_time
+    }
+    return exact
@@ -1,12 +1,51 @@
 # src\quantum\graph_circuit.py
 
+import io
+import base64
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
 import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
-from qiskit import QuantumCircuit
+from qiskit import ClassicalRegister, QuantumCircuit
 from qiskit.visualization import circuit_drawer
 
+# Diagram modes by circuit size: the mpl drawer costs roughly 5 ms per gate,
+# the text drawer about a tenth of that, and the summary a fixed prefix.
+# There is no SVG mode: Qiskit only produces SVG by saving the mpl figure,
+# which pays the same per-gate layout cost as the PNG, so text is the cheap path.
+MPL_MAX_OPERATIONS = 150
+MPL_MAX_QUBITS = 20
+TEXT_MAX_OPERATIONS = 1500
+TEXT_MAX_QUBITS = 64
+SUMMARY_PREFIX_OPERATIONS = 200
+TEXT_FOLD = 120
+DIAGRAM_MODES = ('auto', 'mpl', 'text', 'summary')
+DIAGRAM_CACHE_SIZE = 64
+
 # --- ELIMINADO: Ya no necesitamos el diccionario DEFAULT_CIRCUIT_STYLE ---
 
+def _draw_mpl_figure(quantum_circuit: QuantumCircuit, fig_dpi: int, fig_size: tuple) -> Figure:
+    """Dibuja el circuito con el estilo mpl de Qiskit; propaga cualquier error."""
+    # Crea una nueva figura de Matplotlib con el tamaño y DPI especificados.
+    fig = Figure(figsize=fig_size, dpi=fig_dpi)
+
+    # Añade unos Ejes que llenan toda la figura.
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.axis('off') # Desactiva las líneas y etiquetas de los ejes.
+
+    # Dibuja el circuito sobre los Ejes creados con el estilo por defecto de Qiskit.
+    circuit_drawer(
+        quantum_circuit,
+        output='mpl',
+        ax=ax,
+        interactive=False
+    )
+    return fig
+
 def generate_circuit_diagram_figure(
     quantum_circuit: QuantumCircuit,
     # Eliminamos el parámetro 'style' para usar los estilos por defecto de Qiskit.
@@ -34,24 +73,7 @@ def generate_circuit_diagram_figure(
         return None
 
     try:
-        # Crea una nueva figura de Matplotlib con el tamaño y DPI especificados.
-        fig = Figure(figsize=fig_size, dpi=fig_dpi)
-        
-        # ELIMINADO: fig.patch.set_facecolor() para usar el fondo por defecto (transparente/blanco)
-        # o el color de fondo del widget de CustomTkinter.
-
-        # Añade unos Ejes que llenan toda la figura.
-        ax = fig.add_axes([0, 0, 1, 1])
-        ax.axis('off') # Desactiva las líneas y etiquetas de los ejes.
-
-        # Dibuja el circuito sobre los Ejes creados.
-        # Se elimina el parámetro 'style' para usar el estilo por defecto de Qiskit.
-        circuit_drawer(
-            quantum_circuit,
-            output='mpl',
-            ax=ax,
-            interactive=False
-        )
+        fig = _draw_mpl_figure(quantum_circuit, fig_dpi, fig_size)
         
         print(f"[GraphCircuit] Circuit diagram figure generated for: {quantum_circuit.name if hasattr(quantum_circuit, 'name') else 'Unnamed'}")
         return fig
@@ -68,4 +90,145 @@ def generate_circuit_diagram_figure(
                       horizontalalignment='center', verticalalignment='center',
                       fontsize=10, color='red', wrap=True)
         error_ax.axis('off')
-        return error_fig
\ No newline at end of file
+        return error_fig
+
+# --- Caché de diagramas y rutas rápidas (texto / resumen) ---
+
+_diagram_cache: 'OrderedDict[tuple, Dict[str, Any]]' = OrderedDict()
+_diagram_cache_lock = threading.Lock()
+_diagram_cache_stats = {'hits': 0, 'misses': 0}
+
+def circuit_structure_hash(quantum_circuit: QuantumCircuit) -> str:
+    """
+    Hash estructural del circuito: registros, instrucciones, qubits/clbits,
+    parámetros, etiquetas y condiciones clásicas.
+
+    Dos circuitos con el mismo hash se dibujan igual, aunque sean objetos
+    distintos (por ejemplo, al recargar el mismo archivo). Por eso entra
+    todo lo que cambia el dibujo: las etiquetas de las puertas, los estados
+    de control, la condición c_if (registro o bit y valor) y el registro
+    (nombre e índice) de cada bit tocado.
+    """
+    def bit_location(bit):
+        location = quantum_circuit.find_bit(bit)
+        return location.index, tuple((register.name, index) for register, index in location.registers)
+
+    def condition_key(condition):
+        # c_if guarda (registro o bit, valor); las expresiones clásicas se comparan por su texto
+        if condition is None:
+            return None
+        if isinstance(condition, tuple) and len(condition) == 2:
+            target, value = condition
+            if isinstance(target, ClassicalRegister):
+                return ('register', target.name, target.size, value)
+            return ('clbit', bit_location(target), value)
+        return ('expr', str(condition))
+
+    digest = hashlib.sha1()
+    digest.update(repr((quantum_circuit.num_qubits, quantum_circuit.num_clbits,
+                        [(reg.name, reg.size) for reg in quantum_circuit.qregs],
+                        [(reg.name, reg.size) for reg in quantum_circuit.cregs],
+                        str(quantum_circuit.global_phase))).encode())
+    for instruction in quantum_circuit.data:
+        operation = instruction.operation
+        digest.update(repr((
+            operation.name,
+            getattr(operation, 'label', None),
+            getattr(operation, 'ctrl_state', None),
+            condition_key(getattr(operation, 'condition', None)),
+            tuple(bit_location(qubit) for qubit in instruction.qubits),
+            tuple(bit_location(clbit) for clbit in instruction.clbits),
+            tuple(str(param) for param in operation.params)
+        )).encode())
+    return digest.hexdigest()
+
+def choose_diagram_mode(quantum_circuit: QuantumCircuit) -> str:
+    """'mpl' para circuitos pequeños, 'text' para medianos y 'summary' por encima de eso."""
+    operations = quantum_circuit.size()
+    if operations <= MPL_MAX_OPERATIONS and quantum_circuit.num_qubits <= MPL_MAX_QUBITS:
+        return 'mpl'
+    if operations <= TEXT_MAX_OPERATIONS and quantum_circuit.num_qubits <= TEXT_MAX_QUBITS:
+        return 'text'
+    return 'summary'
+
+def circuit_summary_text(quantum_circuit: QuantumCircuit,
+                         prefix_operations: int = SUMMARY_PREFIX_OPERATIONS) -> str:
+    """Resumen del circuito (tamaño, profundidad, puertas) y el dibujo en texto de sus primeras operaciones."""
+    operations = quantum_circuit.count_ops()
+    lines = [
+        f"Circuit: {quantum_circuit.num_qubits} qubits, "
+        f"{quantum_circuit.num_clbits} classical bits, {quantum_circuit.size()} operations, "
+        f"depth {quantum_circuit.depth()}",
+        "Operations: " + ', '.join(f"{name}={count}" for name, count in operations.items())
+    ]
+    if quantum_circuit.num_qubits <= TEXT_MAX_QUBITS:
+        prefix = quantum_circuit.copy_empty_like()
+        for instruction in quantum_circuit.data[:prefix_operations]:
+            prefix.append(instruction)
+        lines.append(f"\nFirst {min(prefix_operations, quantum_circuit.size())} operations:")
+        lines.append(str(circuit_drawer(prefix, output='text', fold=TEXT_FOLD)))
+    return '\n'.join(lines)
+
+def render_circuit_diagram(quantum_circuit: QuantumCircuit, mode: str = 'auto', fig_dpi: int = 100,
+                           fig_size: tuple = (6, 4)) -> Dict[str, Any]:
+    """
+    Diagrama del circuito con caché por hash estructural.
+
+    Args:
+        quantum_circuit: El circuito a dibujar.
+        mode: 'auto' (según el tamaño), 'mpl' (PNG), 'text' (texto plegado) o 'summary'.
+        fig_dpi, fig_size: Parámetros de la figura mpl.
+
+    Returns:
+        Diccionario con mode, format ('png' o 'text'), image (PNG en base64),
+        text, hash, cached y render_time. Si el dibujo mpl falla se usa el texto.
+    """
+    if mode not in DIAGRAM_MODES:
+        raise ValueError(f"Unknown diagram mode: {mode}. Available: {', '.join(DIAGRAM_MODES)}")
+    if mode == 'auto':
+        mode = choose_diagram_mode(quantum_circuit)
+
+    structure_hash = circuit_structure_hash(quantum_circuit)
+    key = (structure_hash, mode, fig_dpi, tuple(fig_size))
+    with _diagram_cache_lock:
+        cached = _diagram_cache.get(key)
+        if cached is not None:
+            _diagram_cache.move_to_end(key)
+            _diagram_cache_stats['hits'] += 1
+            return {**cached, 'cached': True}
+        _diagram_cache_stats['misses'] += 1
+
+    start_time = time.time()
+    diagram = {'mode': mode, 'format': 'text', 'image': None, 'text': None, 'hash': structure_hash}
+    if mode == 'mpl':
+        try:
+            fig = _draw_mpl_figure(quantum_circuit, fig_dpi, fig_size)
+            img_buffer = io.BytesIO()
+            fig.savefig(img_buffer, format='png', bbox_inches='tight', dpi=fig_dpi)
+            diagram['format'] = 'png'
+            diagram['image'] = base64.b64encode(img_buffer.getvalue()).decode()
+        except Exception as e:
+            print(f"[GraphCircuit] mpl drawer failed, falling back to text: {e}")
+            diagram['mode'] = mode = 'text'
+    if mode == 'text':
+        diagram['text'] = str(circuit_drawer(quantum_circuit, output='text', fold=TEXT_FOLD))
+    elif mode == 'summary':
+        diagram['text'] = circuit_summary_text(quantum_circuit)
+    diagram['render_time'] = time.time() - start_time
+
+    with _diagram_cache_lock:
+        _diagram_cache[key] = diagram
+        while len(_diagram_cache) > DIAGRAM_CACHE_SIZE:
+            _diagram_cache.popitem(last=False)
+    print(f"[GraphCircuit] Diagram ({diagram['mode']}) rendered in {diagram['render_time']:.3f}s")
+    return {**diagram, 'cached': False}
+
+def diagram_cache_info() -> Dict[str, Any]:
+    """Tamaño y aciertos de la caché de diagramas."""
+    with _diagram_cache_lock:
+        return {'size': len(_diagram_cache), 'max_size': DIAGRAM_CACHE_SIZE, **_diagram_cache_stats}
+
+def clear_diagram_cache() -> None:
+    with _diagram_cache_lock:
+        _diagram_cache.clear()
+        _diagram_cache_stats.update(hits=0, misses=0)
@@ -0,0 +1,117 @@
+"""
+Named noise profiles for circuit simulation.
+Each profile is built into a qiskit-aer NoiseModel once and shared by every simulator that uses it.
+"""
+
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+
+IDEAL = 'ideal'
+
+# Gates the noisy simulators transpile to; Clifford gates are kept so Pauli-noise
+# profiles can still run Clifford circuits on the stabilizer method
+NOISY_ONE_QUBIT_GATES = ('x', 'y', 'z', 'h', 's', 'sdg', 'sx', 'sxdg', 'rz')
+NOISY_TWO_QUBIT_GATES = ('cx', 'cz')
+NOISY_BASIS_GATES = ('id',) + NOISY_ONE_QUBIT_GATES + NOISY_TWO_QUBIT_GATES
+
+# depolarizing: (one-qubit, two-qubit) probabilities
+# readout: probability of flipping a measured bit
+# thermal: T1/T2 and gate/measure durations in nanoseconds
+NOISE_PROFILES: Dict[str, Dict[str, Any]] = {
+    IDEAL: {
+        'description': 'Noiseless simulation'
+    },
+    'depolarizing': {
+        'description': 'Depolarizing gate errors (0.1% one-qubit, 1% two-qubit)',
+        'depolarizing': (1e-3, 1e-2)
+    },
+    'depolarizing_strong': {
+        'description': 'Strong depolarizing gate errors (1% one-qubit, 5% two-qubit)',
+        'depolarizing': (1e-2, 5e-2)
+    },
+    'readout': {
+        'description': 'Readout errors only (2% bit flip on measurement)',
+        'readout': 0.02
+    },
+    'thermal': {
+        'description': 'Thermal relaxation (T1 50 us, T2 70 us; 50 ns / 300 ns gates, 1 us readout)',
+        'thermal': {'t1': 50e3, 't2': 70e3, 'gate_time_1q': 50, 'gate_time_2q': 300, 'measure_time': 1000}
+    },
+    'device_like': {
+        'description': 'Thermal relaxation plus depolarizing (0.05% / 0.8%) and 1.5% readout errors',
+        'thermal': {'t1': 100e3, 't2': 80e3, 'gate_time_1q': 35, 'gate_time_2q': 400, 'measure_time': 1500},
+        'depolarizing': (5e-4, 8e-3),
+        'readout': 0.015
+    }
+}
+
+def is_pauli_profile(name: str) -> bool:
+    """Whether a profile only uses Pauli channels, which the stabilizer method can simulate."""
+    return 'thermal' not in NOISE_PROFILES[name]
+
+def list_noise_profiles() -> List[Dict[str, Any]]:
+    """Name, description and stabilizer compatibility of every profile."""
+    return [{'name': name, 'description': spec['description'], 'stabilizer': is_pauli_profile(name)}
+            for name, spec in NOISE_PROFILES.items()]
+
+def _gate_error(spec: Dict[str, Any], num_qubits: int):
+    """Composed thermal and depolarizing error for a gate of num_qubits qubits (None when noiseless)."""
+    from qiskit_aer.noise import depolarizing_error, thermal_relaxation_error
+
+    error = None
+    thermal = spec.get('thermal')
+    if thermal:
+        gate_time = thermal['gate_time_1q'] if num_qubits == 1 else thermal['gate_time_2q']
+        error = thermal_relaxation_error(thermal['t1'], thermal['t2'], gate_time)
+        if num_qubits == 2:
+            error = error.expand(thermal_relaxation_error(thermal['t1'], thermal['t2'], gate_time))
+    if spec.get('depolarizing'):
+        depolarizing = depolarizing_error(spec['depolarizing'][num_qubits - 1], num_qubits)
+        error = depolarizing if error is None else error.compose(depolarizing)
+    return error
+
+@lru_cache(maxsize=None)
+def get_noise_model(name: str = IDEAL):
+    """
+    Cached NoiseModel for a profile (None for 'ideal').
+
+    Errors apply to every qubit, so one model serves circuits of any width.
+
+    Raises:
+        ValueError: On an unknown profile name
+    """
+    if name not in NOISE_PROFILES:
+        raise ValueError(f"Unknown noise profile: {name}. Available: {', '.join(NOISE_PROFILES)}")
+    if name == IDEAL:
+        return None
+    from qiskit_aer.noise import NoiseModel, ReadoutError, thermal_relaxation_error
+
+    spec = NOISE_PROFILES[name]
+    noise_model = NoiseModel(basis_gates=list(NOISY_BASIS_GATES))
+    one_qubit_error = _gate_error(spec, 1)
+    if one_qubit_error is not None:
+        noise_model.add_all_qubit_quantum_error(one_qubit_error, list(NOISY_ONE_QUBIT_GATES))
+    two_qubit_error = _gate_error(spec, 2)
+    if two_qubit_error is not None:
+        noise_model.add_all_qubit_quantum_error(two_qubit_error, list(NOISY_TWO_QUBIT_GATES))
+    thermal = spec.get('thermal')
+    if thermal:
+        noise_model.add_all_qubit_quantum_error(
+            thermal_relaxation_error(thermal['t1'], thermal['t2'], thermal['measure_time']), 'measure')
+    if spec.get('readout'):
+        p = spec['readout']
+        noise_model.add_all_qubit_readout_error(ReadoutError([[1 - p, p], [p, 1 - p]]))
+    print(f"[NoiseProfiles] Built noise model '{name}'")
+    return noise_model
+
+def noise_run_options(method: str, noise: Optional[str]) -> Dict[str, Any]:
+    """
+    Extra simulator run options for noisy runs.
+
+    Statevector trajectories use Aer's shot branching, which evolves shots
+    together until a noise channel samples different branches, and spread
+    the branches over the parallel shot executor.
+    """
+    if noise in (None, IDEAL) or method != 'statevector':
+        return {}
+    return {'shot_branching_enable': True, 'max_parallel_shots': 0}
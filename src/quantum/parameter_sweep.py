@@ -0,0 +1,165 @@
+"""
+Parameter sweeps for Qiskit Parameter-based circuits.
+The circuit is transpiled once and every parameter set is bound inside a single AerSimulator run.
+"""
+
+import math
+import time
+import itertools
+import numpy as np
+from typing import Dict, Any, List, Optional, Union
+
+from src.quantum.circuit_execution import ProgressCallback, get_simulator, prepare_circuit
+from src.quantum.noise_profiles import IDEAL, noise_run_options
+from src.quantum.transpilation import DEFAULT_OPTIMIZATION_LEVEL, SIMULATOR_BASIS
+
+MAX_SWEEP_SETS = 10000
+MAX_SWEEP_SHOTS = 100_000_000  # sets x shots for one sweep
+MAX_SYNC_SWEEP_SHOTS = 1_000_000  # larger sweeps run as background jobs
+SWEEP_MODES = ('zip', 'product')
+
+def expand_parameter_values(spec: Union[List[float], Dict[str, Any]]) -> np.ndarray:
+    """
+    Values for one parameter: an explicit list or a {start, stop, num} range.
+
+    Returns:
+        1D float array
+    """
+    if isinstance(spec, dict):
+        num = int(spec.get('num', 10))
+        if not 1 <= num <= MAX_SWEEP_SETS:
+            raise ValueError(f"num must be between 1 and {MAX_SWEEP_SETS}")
+        return np.linspace(float(spec['start']), float(spec['stop']), num)
+    values = np.asarray(spec, dtype=float).reshape(-1)
+    if values.size == 0:
+        raise ValueError("Parameter value lists cannot be empty")
+    return values
+
+def build_parameter_table(circuit, parameters: Dict[str, Any], mode: str = 'zip') -> Dict[str, np.ndarray]:
+    """
+    One column of values per circuit parameter, all of the same length.
+
+    Args:
+        circuit: Parameterized QuantumCircuit
+        parameters: {parameter name: values or {start, stop, num}}
+        mode: 'zip' pairs the i-th values of every parameter (scalars
+            broadcast); 'product' takes the Cartesian product
+
+    Returns:
+        Dictionary {parameter name: values}, in the circuit's parameter order
+
+    Raises:
+        ValueError: On unknown or missing parameters, mismatched lengths or too many sets
+    """
+    if mode not in SWEEP_MODES:
+        raise ValueError(f"Unknown sweep mode: {mode}. Available: {', '.join(SWEEP_MODES)}")
+    names = [parameter.name for parameter in circuit.parameters]
+    unknown = sorted(set(parameters) - set(names))
+    if unknown:
+        raise ValueError(f"Unknown parameter(s): {', '.join(unknown)}. Circuit parameters: {', '.join(names)}")
+    missing = [name for name in names if name not in parameters]
+    if missing:
+        raise ValueError(f"Missing values for parameter(s): {', '.join(missing)}")
+
+    columns = [expand_parameter_values(parameters[name]) for name in names]
+    if mode == 'product':
+        # Python ints: np.prod wraps around in int64 for very large products
+        total = math.prod(len(column) for column in columns) if columns else 0
+        if total > MAX_SWEEP_SETS:
+            raise ValueError(f"Sweep has {total} parameter sets, the limit is {MAX_SWEEP_SETS}")
+        grids = np.meshgrid(*columns, indexing='ij')
+        return {name: grid.reshape(-1) for name, grid in zip(names, grids)}
+
+    lengths = {len(column) for column in columns if len(column) != 1}
+    if len(lengths) > 1:
+        raise ValueError(f"Parameter value lists have different lengths: {sorted(lengths)}")
+    total = lengths.pop() if lengths else 1
+    if total > MAX_SWEEP_SETS:
+        raise ValueError(f"Sweep has {total} parameter sets, the limit is {MAX_SWEEP_SETS}")
+    return {name: np.broadcast_to(column, (total,)).copy() for name, column in zip(names, columns)}
+
+def check_sweep_budget(num_sets: int, shots: int) -> int:
+    """
+    Total shots (sets x shots) of a sweep.
+
+    Raises:
+        ValueError: When the total exceeds MAX_SWEEP_SHOTS
+    """
+    total_shots = num_sets * shots
+    if total_shots > MAX_SWEEP_SHOTS:
+        raise ValueError(f"Sweep needs {num_sets} sets x {shots} shots = {total_shots} shots, "
+                         f"the limit is {MAX_SWEEP_SHOTS}")
+    return total_shots
+
+def run_parameter_sweep(circuit, parameters: Dict[str, Any], mode: str = 'zip', shots: int = 1024,
+                        seed: Optional[int] = None, method: str = 'automatic', precision: str = 'double',
+                        noise: str = IDEAL, optimization_level: int = DEFAULT_OPTIMIZATION_LEVEL,
+                        basis: str = SIMULATOR_BASIS, progress: Optional[ProgressCallback] = None,
+                        transpiled_cache: Optional[Dict[Any, Any]] = None) -> Dict[str, Any]:
+    """
+    Sample a parameterized circuit for every parameter set in one batched run.
+
+    Args:
+        circuit: QuantumCircuit with Parameters and measurements
+        parameters: See build_parameter_table
+        mode: 'zip' or 'product'
+        shots, seed, method, precision, noise, optimization_level, basis:
+            Simulation options (see simulate_counts)
+        progress: Optional stage callback
+        transpiled_cache: Optional per-circuit transpile cache (see simulate_counts)
+
+    Returns:
+        Dictionary with parameter names, the values table (sets x parameters),
+        the observed outcomes (bitstrings), counts (sets x outcomes, int64)
+        and simulation info
+    """
+    if circuit.num_clbits == 0:
+        raise ValueError("The circuit has no measurements to sample")
+    if not circuit.parameters:
+        raise ValueError("The circuit has no parameters to sweep")
+    report = progress or (lambda stage, fraction: None)
+
+    table = build_parameter_table(circuit, parameters, mode)
+    names = list(table)
+    num_sets = len(table[names[0]])
+    check_sweep_budget(num_sets, shots)
+
+    report('transpile', 0.2)
+    transpiled_circuit, method, reason, transpile_info = prepare_circuit(
+        circuit, method, precision, noise, optimization_level, basis, transpiled_cache)
+    simulator = get_simulator(method, precision, noise)
+
+    # Aer binds the values per experiment inside one run: {Parameter: [values of every set]}
+    report('simulate', 0.4)
+    binds = {parameter: table[parameter.name].tolist() for parameter in circuit.parameters}
+    start_time = time.time()
+    result = simulator.run(transpiled_circuit, shots=shots, seed_simulator=seed,
+                           parameter_binds=[binds], **noise_run_options(method, noise)).result()
+    simulation_time = time.time() - start_time
+
+    report('collect', 0.9)
+    all_counts = [result.get_counts(index) for index in range(num_sets)]
+    outcomes = sorted(set(itertools.chain.from_iterable(all_counts)))
+    column = {outcome: position for position, outcome in enumerate(outcomes)}
+    counts = np.zeros((num_sets, len(outcomes)), dtype=np.int64)
+    for row, experiment_counts in enumerate(all_counts):
+        for outcome, count in experiment_counts.items():
+            counts[row, column[outcome]] = count
+
+    return {
+        'parameters': names,
+        'values': np.column_stack([table[name] for name in names]),
+        'outcomes': outcomes,
+        'counts': counts,
+        'simulation': {
+            'method': method,
+            'reason': reason,
+            'precision': precision,
+            'noise': noise,
+            'shots': shots,
+            'seed': seed,
+            'num_sets': num_sets,
+            **transpile_info,
+            'simulation_time': simulation_time
+        }
+    }
@@ -15,7 +15,7 @@ QISKIT_AVAILABLE = False
 try:
     from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
     from qiskit_aer import AerSimulator
-    from qiskit.visualization import plot_histogram, circuit_drawer
+    from qiskit.visualization import plot_histogram
     from collections import Counter
     QISKIT_AVAILABLE = True
 except ImportError:
@@ -45,89 +45,55 @@ def is_qiskit_available() -> bool:
 def execute_quantum_circuit(circuit_code: str) -> Tuple[Optional[Dict], Optional[str], bool]:
     """
     Execute quantum circuit code and return results.
-    
+
+    The code is compiled once by the shared CircuitService; running the same
+    code again reuses its circuit and transpilation. A run_quantum_circuit
+    function defined by the code replaces the default simulation.
+
     Returns:
         Tuple of (counts_dict, error_message, success_flag)
     """
     if not QISKIT_AVAILABLE:
         return None, "Qiskit not available", False
-    
+
     try:
-        # Create namespace for execution
-        namespace = {
-            'QuantumCircuit': QuantumCircuit,
-            'QuantumRegister': QuantumRegister, 
-            'ClassicalRegister': ClassicalRegister,
-            'AerSimulator': AerSimulator,
-            'Counter': Counter,
-            'np': np
-        }
-        
-        # Execute the circuit code
-        exec(circuit_code, namespace)
-        
-        # Look for create_circuit function
-        if 'create_circuit' not in namespace:
-            return None, "No create_circuit function found", False
-        
-        # Create the circuit
-        circuit = namespace['create_circuit']()
-        
-        # Look for run_quantum_circuit function
-        if 'run_quantum_circuit' in namespace:
-            counts = namespace['run_quantum_circuit'](circuit)
+        from src.services.circuit_service import get_circuit_service
+        service = get_circuit_service()
+        artifact = service.load_source(circuit_code, name='<circuit_code>')
+
+        if artifact.custom_runner is not None:
+            counts = artifact.custom_runner(artifact.circuit.copy())
         else:
-            # Use default execution
-            simulator = AerSimulator()
-            job = simulator.run(circuit, shots=1024)
-            result = job.result()
-            counts = result.get_counts(circuit)
-        
+            counts, _ = service.counts(artifact, shots=1024)
+
         return counts, None, True
-        
+
     except Exception as e:
         return None, str(e), False
 
 def create_circuit_diagram(circuit_code: str, filename: str) -> Tuple[Optional[str], Optional[str]]:
     """
     Create circuit diagram using Qiskit if available.
-    
+
+    Shares the compiled circuit with execute_quantum_circuit and the
+    diagram cache with the web module.
+
     Returns:
         Tuple of (base64_image, error_message)
     """
     if not QISKIT_AVAILABLE:
         return None, "Qiskit not available"
-    
+
     try:
-        # Execute code and get circuit
-        namespace = {
-            'QuantumCircuit': QuantumCircuit,
-            'QuantumRegister': QuantumRegister,
-            'ClassicalRegister': ClassicalRegister,
-            'AerSimulator': AerSimulator,
-            'Counter': Counter
-        }
-        
-        exec(circuit_code, namespace)
-        
-        if 'create_circuit' not in namespace:
-            return None, "No create_circuit function found"
-        
-        circuit = namespace['create_circuit']()
-        
-        # Create circuit diagram
-        fig = circuit_drawer(circuit, output='mpl', style='iqx')
-        
-        # Convert to base64
-        img_buffer = io.BytesIO()
-        fig.savefig(img_buffer, format='png', bbox_inches='tight', dpi=100)
-        img_buffer.seek(0)
-        img_base64 = base64.b64encode(img_buffer.getvalue()).decode()
-        
-        plt.close(fig)
-        
-        return img_base64, None
-        
+        from src.services.circuit_service import get_circuit_service
+        service = get_circuit_service()
+        artifact = service.load_source(circuit_code, name=filename or '<circuit_code>')
+
+        diagram = service.diagram(artifact, mode='mpl')
+        if diagram['format'] != 'png':
+            return None, "Circuit diagram could not be drawn"
+        return diagram['image'], None
+
     except Exception as e:
         return None, str(e)
 
@@ -0,0 +1,82 @@
+"""
+Transpilation settings and timed pass manager runs for the quantum circuits module.
+Preset pass managers are expensive to build and cheap to run, so callers build them once per target and reuse them.
+"""
+
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+OPTIMIZATION_LEVELS = (0, 1, 2, 3)
+DEFAULT_OPTIMIZATION_LEVEL = 2  # transpile()'s own default
+SIMULATOR_BASIS = 'simulator'
+MAX_REPORTED_PASSES = 8
+
+# 'simulator' compiles for whatever the simulator (and its noise model) supports;
+# the other presets are simulator-independent gate sets
+BASIS_PRESETS: Dict[str, Optional[Tuple[str, ...]]] = {
+    SIMULATOR_BASIS: None,
+    'ibm': ('id', 'rz', 'sx', 'x', 'cx'),
+    'rotations': ('rx', 'ry', 'rz', 'cx'),
+    'clifford_t': ('h', 's', 'sdg', 't', 'tdg', 'x', 'y', 'z', 'cx')
+}
+
+def parse_transpile_options(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate request-level transpilation options.
+
+    Args:
+        data: Mapping with optional optimization_level and basis
+
+    Returns:
+        Dictionary with optimization_level (0-3) and basis (a BASIS_PRESETS name)
+
+    Raises:
+        ValueError: On unknown values
+    """
+    level = data.get('optimization_level')
+    level = DEFAULT_OPTIMIZATION_LEVEL if level in (None, '') else int(level)
+    if level not in OPTIMIZATION_LEVELS:
+        raise ValueError(f"optimization_level must be one of {', '.join(map(str, OPTIMIZATION_LEVELS))}")
+    basis = data.get('basis') or SIMULATOR_BASIS
+    if basis not in BASIS_PRESETS:
+        raise ValueError(f"Unknown basis: {basis}. Available: {', '.join(BASIS_PRESETS)}")
+    return {'optimization_level': level, 'basis': basis}
+
+def build_pass_manager(simulator=None, optimization_level: int = DEFAULT_OPTIMIZATION_LEVEL,
+                       basis: str = SIMULATOR_BASIS):
+    """
+    Preset StagedPassManager for a simulator target or for a basis preset.
+
+    Building one costs tens to hundreds of milliseconds (most of a
+    transpile() call); running it on a small circuit costs about one.
+    """
+    from qiskit.transpiler import generate_preset_pass_manager
+
+    basis_gates = BASIS_PRESETS[basis]
+    if basis_gates is None:
+        return generate_preset_pass_manager(optimization_level=optimization_level, backend=simulator)
+    return generate_preset_pass_manager(optimization_level=optimization_level, basis_gates=list(basis_gates))
+
+def run_timed(pass_manager, circuit) -> Tuple[Any, List[Dict[str, Any]]]:
+    """
+    Run a pass manager on one circuit, timing every pass.
+
+    Returns:
+        Tuple (transpiled circuit, the MAX_REPORTED_PASSES slowest passes as
+        {pass, time, runs}, slowest first)
+    """
+    totals: Dict[str, List[float]] = {}
+
+    def record(pass_, dag, time, property_set, count):
+        entry = totals.setdefault(type(pass_).__name__, [0.0, 0])
+        entry[0] += time
+        entry[1] += 1
+
+    transpiled = pass_manager.run(circuit, callback=record)
+    passes = sorted(({'pass': name, 'time': seconds, 'runs': runs} for name, (seconds, runs) in totals.items()),
+                    key=lambda entry: entry['time'], reverse=True)
+    return transpiled, passes[:MAX_REPORTED_PASSES]
+
+def run_many(pass_manager, circuits: Sequence[Any]) -> List[Any]:
+    """Run a pass manager on several circuits (Qiskit spreads the list over worker processes)."""
+    transpiled = pass_manager.run(list(circuits))
+    return transpiled if isinstance(transpiled, list) else [transpiled]
@@ -0,0 +1,235 @@
+"""
+Circuit service for the quantum circuits module.
+Each circuit source is compiled and executed once; diagrams, counts, sweeps and exact outputs are served from that artifact.
+"""
+
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from src.utils.file_loader import FileLoader
+from src.quantum.graph_circuit import render_circuit_diagram
+from src.quantum.circuit_execution import (ProgressCallback, execute_circuit, simulate_counts,
+                                           render_counts_histogram)
+from src.quantum.parameter_sweep import run_parameter_sweep
+from src.quantum.exact_state import compute_exact_outputs
+from src.quantum.circuit_batch import run_circuit_batch
+from src.quantum.qiskit_integration import get_qiskit_namespace
+
+# sys.path is process-wide: sources that import their neighbours compile one at a time
+_sys_path_lock = threading.RLock()
+
+class CircuitArtifact:
+    """
+    A compiled circuit source: its namespace, the extracted circuit and per-target transpilations.
+
+    The circuit object is shared by every request that loads the same
+    source, so callers must treat it as read-only (copy before mutating).
+    """
+
+    def __init__(self, source_hash: str, name: str, circuit, namespace: Dict[str, Any], load_time: float):
+        self.source_hash = source_hash
+        self.name = name
+        self.circuit = circuit
+        self.namespace = namespace
+        self.load_time = load_time
+        self.created_at = time.time()
+        self.transpiled: Dict[Any, Any] = {}  # (method, precision, noise, level, basis) -> transpiled circuit
+
+    @property
+    def custom_runner(self):
+        """The source's own run_quantum_circuit(circuit) function, if it defines one."""
+        runner = self.namespace.get('run_quantum_circuit')
+        return runner if callable(runner) else None
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'source_hash': self.source_hash,
+            'num_qubits': self.circuit.num_qubits,
+            'num_clbits': self.circuit.num_clbits,
+            'load_time': self.load_time,
+            'transpiled_targets': [list(key) for key in self.transpiled]
+        }
+
+class CircuitService:
+    """
+    Single entry point for loading and running circuit sources.
+
+    Sources are keyed by content hash, so the same code loaded from a file,
+    from an editor string or twice in a row is compiled and executed once.
+    Files are re-read only when their mtime or size changes. Artifacts live
+    in an LRU of max_artifacts entries; the transpiled circuits they carry
+    are reused by every later run on the same pooled simulator target.
+    Sources that build random circuits are frozen at their first load.
+    """
+
+    def __init__(self, max_artifacts: int = 32):
+        self.max_artifacts = max_artifacts
+        self._artifacts: 'OrderedDict[str, CircuitArtifact]' = OrderedDict()
+        self._files: Dict[str, Tuple[int, int, str]] = {}  # path -> (mtime_ns, size, source hash)
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0}
+
+    def _cached(self, source_hash: str) -> Optional[CircuitArtifact]:
+        with self._lock:
+            artifact = self._artifacts.get(source_hash)
+            if artifact is not None:
+                self._artifacts.move_to_end(source_hash)
+                self._stats['hits'] += 1
+            return artifact
+
+    def load_source(self, source: str, name: str = '<circuit>',
+                    module_dir: Optional[str] = None) -> CircuitArtifact:
+        """
+        Compile and execute a circuit source once, or return its cached artifact.
+
+        Args:
+            source: Python code defining a circuit (see FileLoader.find_circuit)
+            name: File name used in tracebacks
+            module_dir: Directory added to sys.path while the source runs,
+                so files can import their neighbours (such loads are serialized)
+
+        Raises:
+            ValueError: When the source fails or defines no circuit
+        """
+        source_hash = hashlib.sha1(source.encode('utf-8')).hexdigest()
+        artifact = self._cached(source_hash)
+        if artifact is not None:
+            return artifact
+
+        start_time = time.time()
+        namespace = {**get_qiskit_namespace(), '__name__': os.path.splitext(os.path.basename(name))[0],
+                     '__file__': name, '__builtins__': __builtins__}
+        if module_dir is None:
+            circuit = self._exec_source(source, name, namespace)
+        else:
+            with _sys_path_lock:
+                path_inserted = module_dir not in sys.path
+                if path_inserted:
+                    sys.path.insert(0, module_dir)
+                try:
+                    circuit = self._exec_source(source, name, namespace)
+                finally:
+                    if path_inserted and module_dir in sys.path:
+                        sys.path.remove(module_dir)
+        if circuit is None or not hasattr(circuit, 'num_qubits'):
+            raise ValueError(f"No QuantumCircuit object found in '{name}'")
+
+        artifact = CircuitArtifact(source_hash, name, circuit, namespace, time.time() - start_time)
+        with self._lock:
+            self._stats['misses'] += 1
+            self._artifacts[source_hash] = artifact
+            while len(self._artifacts) > self.max_artifacts:
+                self._artifacts.popitem(last=False)
+        print(f"[CircuitService] Compiled {name} ({circuit.num_qubits} qubits) in {artifact.load_time:.3f}s")
+        return artifact
+
+    @staticmethod
+    def _exec_source(source: str, name: str, namespace: Dict[str, Any]):
+        try:
+            exec(compile(source, name, 'exec'), namespace)
+            return FileLoader.find_circuit(namespace)
+        except Exception as e:
+            raise ValueError(f"Failed to load circuit '{name}': {e}") from e
+
+    def load_file(self, file_path: str) -> CircuitArtifact:
+        """Artifact for a circuit file, re-reading it only when it changed on disk."""
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        with self._lock:
+            known = self._files.get(file_path)
+        if known is not None and known[:2] == (stat.st_mtime_ns, stat.st_size):
+            artifact = self._cached(known[2])
+            if artifact is not None:
+                return artifact
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            source = f.read()
+        artifact = self.load_source(source, name=file_path, module_dir=os.path.dirname(file_path))
+        with self._lock:
+            self._files[file_path] = (stat.st_mtime_ns, stat.st_size, artifact.source_hash)
+        return artifact
+
+    def diagram(self, artifact: CircuitArtifact, mode: str = 'auto') -> Dict[str, Any]:
+        """Circuit diagram (cached by structural hash in graph_circuit)."""
+        return render_circuit_diagram(artifact.circuit, mode=mode)
+
+    def counts(self, artifact: CircuitArtifact, **options) -> Tuple[Dict[str, int], Dict[str, Any]]:
+        """Measurement counts on the pooled simulator (see simulate_counts for options)."""
+        return simulate_counts(artifact.circuit, transpiled_cache=artifact.transpiled, **options)
+
+    @staticmethod
+    def histogram(counts: Dict[str, int], title: str = 'Measurement Results') -> str:
+        """Counts bar chart as base64 PNG."""
+        return render_counts_histogram(counts, title=title)
+
+    def execute(self, artifact: CircuitArtifact, progress: Optional[ProgressCallback] = None,
+                **options) -> Dict[str, Any]:
+        """Diagram, counts and histogram in one payload (see execute_circuit)."""
+        return execute_circuit(artifact.circuit, progress=progress, transpiled_cache=artifact.transpiled, **options)
+
+    def execute_file(self, file_path: str, progress: Optional[ProgressCallback] = None,
+                     **options) -> Dict[str, Any]:
+        """Load (or reuse) a circuit file and run the execute pipeline on it."""
+        report = progress or (lambda stage, fraction: None)
+        report('load', 0.0)
+        return self.execute(self.load_file(file_path), progress=report, **options)
+
+    def sweep(self, artifact: CircuitArtifact, parameters: Dict[str, Any], mode: str = 'zip',
+              progress: Optional[ProgressCallback] = None, **options) -> Dict[str, Any]:
+        """Batched parameter sweep (see run_parameter_sweep)."""
+        return run_parameter_sweep(artifact.circuit, parameters, mode=mode, progress=progress,
+                                   transpiled_cache=artifact.transpiled, **options)
+
+    def exact(self, artifact: CircuitArtifact, outputs: Sequence[str] = ('probabilities',),
+              observables=None, method: str = 'automatic', precision: str = 'double') -> Dict[str, Any]:
+        """Shot-free outputs (see compute_exact_outputs)."""
+        return compute_exact_outputs(artifact.circuit, outputs, observables=observables,
+                                     method=method, precision=precision)
+
+    def batch(self, file_paths: Sequence[str], progress: Optional[ProgressCallback] = None,
+              **options) -> Dict[str, Any]:
+        """
+        Sample several circuit files in one batch (see run_circuit_batch).
+
+        Results are keyed by file name; files that fail to load are reported
+        under 'skipped' instead of failing the whole batch.
+        """
+        report = progress or (lambda stage, fraction: None)
+        report('load', 0.0)
+        artifacts: Dict[str, CircuitArtifact] = {}
+        failed: Dict[str, str] = {}
+        for file_path in file_paths:
+            name = os.path.basename(file_path)
+            try:
+                artifacts[name] = self.load_file(file_path)
+            except (OSError, ValueError) as e:
+                failed[name] = str(e)
+
+        batch = run_circuit_batch({name: artifact.circuit for name, artifact in artifacts.items()},
+                                  progress=report,
+                                  transpiled_caches={name: artifact.transpiled for name, artifact in artifacts.items()},
+                                  **options)
+        batch['skipped'].update(failed)
+        return batch
+
+    def cache_info(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'artifacts': len(self._artifacts), 'max_artifacts': self.max_artifacts,
+                    'files': len(self._files), **self._stats}
+
+_circuit_service: Optional[CircuitService] = None
+_circuit_service_lock = threading.Lock()
+
+def get_circuit_service() -> CircuitService:
+    """Process-wide CircuitService shared by the web routes and qiskit_integration."""
+    global _circuit_service
+    with _circuit_service_lock:
+        if _circuit_service is None:
+            _circuit_service = CircuitService()
+        return _circuit_service
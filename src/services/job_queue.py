@@ -0,0 +1,259 @@
+"""
+Background job queue for long-running requests.
+A bounded pool of worker threads runs prioritized jobs; finished jobs are kept in a TTL'd result store.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+
+class JobCancelled(BaseException):
+    """
+    Raised inside a running job once cancellation was requested.
+
+    Derives from BaseException so the `except Exception` handlers that job
+    code uses for its own error reporting do not swallow it.
+    """
+
+class QueueFullError(RuntimeError):
+    """Raised by submit when too many jobs are waiting."""
+
+class Job:
+    """A unit of work with status, progress and result, updated by its worker."""
+
+    def __init__(self, func: Callable[..., Any], args: tuple, kwargs: Dict[str, Any],
+                 priority: int = 0, name: str = '', key: Optional[Any] = None):
+        self.id = uuid.uuid4().hex
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.name = name
+        self.key = key
+        self.status = QUEUED
+        self.stage = QUEUED
+        self.progress = 0.0
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.version = 0  # bumped on every change, for long-polling and SSE
+        self._cancel_requested = threading.Event()
+        self._queue: Optional['JobQueue'] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_requested.is_set()
+
+    def report(self, stage: str, progress: float) -> None:
+        """
+        Publish progress from inside the job.
+
+        Raises:
+            JobCancelled: When cancellation was requested; jobs call this
+                between stages, which are the points where they can stop.
+        """
+        if self.cancel_requested:
+            raise JobCancelled()
+        self._update(stage=stage, progress=min(max(float(progress), 0.0), 1.0))
+
+    def _update(self, **fields) -> None:
+        with self._queue._changed:
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self.version += 1
+            self._queue._changed.notify_all()
+
+    def to_dict(self, include_result: bool = False) -> Dict[str, Any]:
+        info = {
+            'job_id': self.id,
+            'name': self.name,
+            'status': self.status,
+            'stage': self.stage,
+            'progress': self.progress,
+            'priority': self.priority,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'version': self.version
+        }
+        if self.started_at is not None:
+            info['elapsed'] = (self.finished_at or time.time()) - self.started_at
+        if include_result and self.status == COMPLETED:
+            info['result'] = self.result
+        return info
+
+class JobQueue:
+    """
+    Priority job queue served by a bounded pool of daemon worker threads.
+
+    Higher priority runs first; equal priorities run in submission order.
+    Workers start lazily on the first submit. A queued job is cancelled
+    immediately; a running one stops at its next report() call. Finished
+    jobs stay readable for result_ttl seconds, and jobs submitted with a
+    key can be found again with find() so repeated requests reuse the
+    in-flight or stored job instead of recomputing it.
+    """
+
+    def __init__(self, max_workers: int = 2, result_ttl: float = 600.0,
+                 max_pending: int = 64, max_jobs: int = 256):
+        self.max_workers = max_workers
+        self.result_ttl = result_ttl
+        self.max_pending = max_pending
+        self.max_jobs = max_jobs
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._keys: Dict[Any, str] = {}
+        self._heap: List[tuple] = []
+        self._sequence = itertools.count()
+        self._changed = threading.Condition()
+        self._workers: List[threading.Thread] = []
+
+    def _start_workers(self) -> None:
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(target=self._worker_loop, name=f"job-worker-{len(self._workers)}",
+                                      daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _purge(self) -> None:
+        """Drop expired finished jobs, then the oldest finished ones beyond max_jobs (lock held)."""
+        now = time.time()
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished and now - job.finished_at > self.result_ttl]
+        overflow = len(self._jobs) - len(expired) - self.max_jobs
+        if overflow > 0:
+            expired += [job_id for job_id, job in self._jobs.items()
+                        if job.finished and job_id not in expired][:overflow]
+        for job_id in expired:
+            job = self._jobs.pop(job_id)
+            if job.key is not None and self._keys.get(job.key) == job_id:
+                del self._keys[job.key]
+
+    def submit(self, func: Callable[..., Any], *args, priority: int = 0, name: str = '',
+               key: Optional[Any] = None, **kwargs) -> Job:
+        """
+        Queue func(job, *args, **kwargs); the job is passed first so it can report progress.
+
+        Raises:
+            QueueFullError: When max_pending jobs are already waiting
+        """
+        job = Job(func, args, kwargs, priority=priority, name=name, key=key)
+        job._queue = self
+        with self._changed:
+            self._purge()
+            pending = sum(1 for queued in self._jobs.values() if queued.status == QUEUED)
+            if pending >= self.max_pending:
+                raise QueueFullError(f"Job queue is full ({pending} jobs waiting)")
+            self._jobs[job.id] = job
+            if key is not None:
+                self._keys[key] = job.id
+            heapq.heappush(self._heap, (-priority, next(self._sequence), job.id))
+            self._start_workers()
+            self._changed.notify_all()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._changed:
+            self._purge()
+            return self._jobs.get(job_id)
+
+    def find(self, key: Any) -> Optional[Job]:
+        """Queued, running or completed job submitted with key (failed and cancelled ones are skipped)."""
+        with self._changed:
+            self._purge()
+            job = self._jobs.get(self._keys.get(key))
+            if job is None or job.status in (FAILED, CANCELLED):
+                return None
+            return job
+
+    def cancel(self, job_id: str) -> bool:
+        """Request cancellation; returns False when the job is unknown or already finished."""
+        with self._changed:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return False
+            job._cancel_requested.set()
+            if job.status == QUEUED:
+                self._finish(job, CANCELLED)
+            return True
+
+    def jobs(self) -> List[Job]:
+        with self._changed:
+            self._purge()
+            return list(self._jobs.values())
+
+    def wait_for_change(self, job: Job, version: int, timeout: float) -> bool:
+        """Block until job.version differs from version; False on timeout."""
+        with self._changed:
+            return self._changed.wait_for(lambda: job.version != version, timeout=timeout)
+
+    def _finish(self, job: Job, status: str, result: Any = None, error: Optional[str] = None) -> None:
+        """Record a final state (lock held)."""
+        job.status = status
+        job.stage = status
+        job.result = result
+        job.error = error
+        job.finished_at = time.time()
+        if status == COMPLETED:
+            job.progress = 1.0
+        job.func = job.args = job.kwargs = None
+        job.version += 1
+        self._changed.notify_all()
+
+    def _next_job(self) -> Job:
+        with self._changed:
+            while True:
+                while self._heap:
+                    _, _, job_id = heapq.heappop(self._heap)
+                    job = self._jobs.get(job_id)
+                    if job is not None and job.status == QUEUED:
+                        job.status = RUNNING
+                        job.stage = RUNNING
+                        job.started_at = time.time()
+                        job.version += 1
+                        self._changed.notify_all()
+                        return job
+                self._changed.wait()
+
+    def _worker_loop(self) -> None:
+        while True:
+            job = self._next_job()
+            try:
+                result = job.func(job, *job.args, **job.kwargs)
+            except JobCancelled:
+                with self._changed:
+                    self._finish(job, CANCELLED)
+            except Exception as e:
+                with self._changed:
+                    self._finish(job, FAILED, error=str(e))
+            except KeyboardInterrupt:
+                with self._changed:
+                    self._finish(job, FAILED, error='Interrupted')
+                raise
+            except BaseException as e:
+                # e.g. SystemExit from a circuit file calling exit(); keep the worker alive
+                with self._changed:
+                    self._finish(job, FAILED, error=f"{type(e).__name__}: {e}")
+            else:
+                with self._changed:
+                    if job.cancel_requested:
+                        self._finish(job, CANCELLED)
+                    else:
+                        self._finish(job, COMPLETED, result=result)
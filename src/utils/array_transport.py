@@ -0,0 +1,127 @@
+"""
+Binary array transport helpers for the HTTP API.
+
+Dense arrays travel as NumPy .npy payloads and sparse matrices (or several
+named arrays) as .npz archives, so large results skip nested JSON lists.
+"""
+
+import io
+import json
+import base64
+import struct
+import zipfile
+import numpy as np
+from scipy import sparse
+from typing import Any, Dict, Tuple, Union
+
+NPY_MIMETYPE = 'application/x-npy'
+NPZ_MIMETYPE = 'application/x-npz'
+FLOAT32_PACK_MIMETYPE = 'application/x-float32-pack'
+
+def encode_npy(array: np.ndarray) -> bytes:
+    """Serialize a dense array to .npy bytes."""
+    buffer = io.BytesIO()
+    np.save(buffer, np.asarray(array), allow_pickle=False)
+    return buffer.getvalue()
+
+def encode_npz(compressed: bool = False, **arrays: np.ndarray) -> bytes:
+    """Serialize named dense arrays to an .npz archive."""
+    buffer = io.BytesIO()
+    if compressed:
+        np.savez_compressed(buffer, **arrays)
+    else:
+        np.savez(buffer, **arrays)
+    return buffer.getvalue()
+
+def encode_sparse(matrix: sparse.spmatrix, compressed: bool = False) -> bytes:
+    """Serialize a SciPy sparse matrix to .npz bytes (scipy.sparse.save_npz layout)."""
+    buffer = io.BytesIO()
+    sparse.save_npz(buffer, sparse.csr_matrix(matrix), compressed=compressed)
+    return buffer.getvalue()
+
+def encode_matrix(matrix: Union[np.ndarray, sparse.spmatrix]) -> tuple:
+    """Encode a dense or sparse matrix, returning (payload, mimetype)."""
+    if sparse.issparse(matrix):
+        return encode_sparse(matrix), NPZ_MIMETYPE
+    return encode_npy(matrix), NPY_MIMETYPE
+
+def encode_float32_base64(array: np.ndarray) -> str:
+    """Encode an array as base64 little-endian float32 (a JS Float32Array buffer)."""
+    return base64.b64encode(np.ascontiguousarray(array, dtype='<f4').tobytes()).decode('ascii')
+
+def pack_float32_arrays(arrays: Dict[str, np.ndarray], metadata: Dict[str, Any] = None) -> bytes:
+    """
+    Pack named arrays as little-endian float32 behind a JSON header.
+
+    Layout: uint32 header length, UTF-8 JSON header padded with spaces to a
+    multiple of 4 bytes, then the arrays back to back. The header holds the
+    metadata plus an 'arrays' list of {name, offset, length, shape}, where
+    offset counts float32 elements from the start of the data block, so a
+    browser can wrap each one with new Float32Array(buffer, start + 4 * offset, length).
+    """
+    layout = []
+    offset = 0
+    for name, array in arrays.items():
+        shape = list(np.shape(array))
+        length = int(np.prod(shape)) if shape else 1
+        layout.append({'name': name, 'offset': offset, 'length': length, 'shape': shape})
+        offset += length
+
+    header = json.dumps({**(metadata or {}), 'arrays': layout}, separators=(',', ':')).encode('utf-8')
+    header += b' ' * (-(4 + len(header)) % 4)
+    data = np.empty(offset, dtype='<f4')
+    for entry, array in zip(layout, arrays.values()):
+        data[entry['offset']:entry['offset'] + entry['length']] = np.ravel(array)
+    return struct.pack('<I', len(header)) + header + data.tobytes()
+
+def unpack_float32_arrays(payload: bytes) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """Inverse of pack_float32_arrays, returning (metadata, arrays)."""
+    (header_length,) = struct.unpack_from('<I', payload)
+    metadata = json.loads(payload[4:4 + header_length].decode('utf-8'))
+    data = np.frombuffer(payload, dtype='<f4', offset=4 + header_length)
+    arrays = {entry['name']: data[entry['offset']:entry['offset'] + entry['length']].reshape(entry['shape'])
+              for entry in metadata.pop('arrays')}
+    return metadata, arrays
+
+def decoded_nbytes(payload: bytes) -> int:
+    """
+    Bytes an .npy or .npz payload occupies once decoded, read from its headers.
+
+    Nothing is loaded, so callers can check the size before decode_matrix.
+    For archives this is the total uncompressed size of the members.
+    """
+    buffer = io.BytesIO(payload)
+    if zipfile.is_zipfile(buffer):
+        with zipfile.ZipFile(buffer) as archive:
+            return sum(info.file_size for info in archive.infolist())
+    buffer.seek(0)
+    version = np.lib.format.read_magic(buffer)
+    if version == (1, 0):
+        shape, _, dtype = np.lib.format.read_array_header_1_0(buffer)
+    else:
+        shape, _, dtype = np.lib.format.read_array_header_2_0(buffer)
+    return int(np.prod(shape, dtype=object)) * dtype.itemsize
+
+def decode_matrix(payload: bytes) -> Union[np.ndarray, sparse.spmatrix]:
+    """
+    Decode an .npy array or an .npz archive.
+
+    A scipy.sparse archive is returned as a CSR matrix; any other archive
+    must hold exactly one array, which is returned dense.
+    """
+    buffer = io.BytesIO(payload)
+    loaded = np.load(buffer, allow_pickle=False)
+    if isinstance(loaded, np.ndarray):
+        return loaded
+    with loaded:
+        if 'format' in loaded.files and 'shape' in loaded.files:
+            buffer.seek(0)
+            return sparse.load_npz(buffer).tocsr()
+        if len(loaded.files) != 1:
+            raise ValueError("Expected a sparse archive or a single array in the .npz payload")
+        return loaded[loaded.files[0]]
+
+def decode_arrays(payload: bytes) -> Dict[str, np.ndarray]:
+    """Decode an .npz archive into a dict of arrays."""
+    with np.load(io.BytesIO(payload), allow_pickle=False) as loaded:
+        return {name: loaded[name] for name in loaded.files}
@@ -16,9 +16,39 @@ import base64
 class FileLoader:
     """Utility class for loading and executing Python script files."""
     
+    CIRCUIT_NAMES = ('circuit', 'qc', 'quantum_circuit', 'main_circuit')
+    CIRCUIT_FUNCTIONS = ('create_circuit', 'build_circuit', 'get_circuit', 'main')
+    
     def __init__(self):
         self.loaded_modules = {}
         
+    @classmethod
+    def find_circuit(cls, namespace: Dict[str, Any]):
+        """Find the circuit in an executed script's namespace (None if there is none)."""
+        # Try different common variable names
+        for name in cls.CIRCUIT_NAMES:
+            if namespace.get(name) is not None:
+                return namespace[name]
+                
+        # Try to call a function that returns a circuit
+        for func_name in cls.CIRCUIT_FUNCTIONS:
+            func = namespace.get(func_name)
+            if callable(func):
+                try:
+                    circuit = func()
+                except Exception:
+                    continue
+                if circuit is not None:
+                    return circuit
+                    
+        # If still no circuit, look for any QuantumCircuit object (not the imported classes)
+        for attr_name in sorted(namespace):
+            if not attr_name.startswith('_'):
+                attr = namespace[attr_name]
+                if not isinstance(attr, type) and hasattr(attr, 'num_qubits') and hasattr(attr, 'num_clbits'):
+                    return attr
+        return None
+        
     def load_circuit_file(self, file_path: str) -> Dict[str, Any]:
         """Load and execute a Qiskit circuit file."""
         try:
@@ -39,38 +69,7 @@ class FileLoader:
                 # Execute the module
                 spec.loader.exec_module(module)
                 
-                # Look for common circuit variable names or functions
-                circuit = None
-                
-                # Try different common variable names
-                circuit_names = ['circuit', 'qc', 'quantum_circuit', 'main_circuit']
-                for name in circuit_names:
-                    if hasattr(module, name):
-                        circuit = getattr(module, name)
-                        break
-                        
-                # Try to call a function that returns a circuit
-                if circuit is None:
-                    function_names = ['create_circuit', 'build_circuit', 'get_circuit', 'main']
-                    for func_name in function_names:
-                        if hasattr(module, func_name):
-                            func = getattr(module, func_name)
-                            if callable(func):
-                                try:
-                                    circuit = func()
-                                    break
-                                except Exception:
-                                    continue
-                                    
-                # If still no circuit, look for any QuantumCircuit object
-                if circuit is None:
-                    for attr_name in dir(module):
-                        if not attr_name.startswith('_'):
-                            attr = getattr(module, attr_name)
-                            if hasattr(attr, 'num_qubits') and hasattr(attr, 'num_clbits'):
-                                circuit = attr
-                                break
-                                
+                circuit = self.find_circuit(vars(module))
                 if circuit is None:
                     raise Exception("No QuantumCircuit object found in the file")
                     
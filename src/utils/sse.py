@@ -0,0 +1,51 @@
+"""
+Server-Sent Events helpers for streaming HTTP responses.
+"""
+
+import json
+import time
+from typing import Any, Iterable, Iterator, Optional
+
+SSE_MIMETYPE = 'text/event-stream'
+SSE_HEADERS = {
+    'Cache-Control': 'no-cache',
+    'X-Accel-Buffering': 'no'  # keep reverse proxies from buffering the stream
+}
+
+def format_sse(data: Any, event: Optional[str] = None, event_id: Optional[Any] = None,
+               retry: Optional[int] = None) -> str:
+    """
+    Format one SSE message; non-string data is JSON encoded.
+
+    Multi-line strings are split over several data: fields as the spec requires.
+    """
+    payload = data if isinstance(data, str) else json.dumps(data, separators=(',', ':'))
+    lines = []
+    if event is not None:
+        lines.append(f"event: {event}")
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if retry is not None:
+        lines.append(f"retry: {retry}")
+    lines.extend(f"data: {line}" for line in payload.split('\n'))
+    return '\n'.join(lines) + '\n\n'
+
+def paced(items: Iterable[Any], rate: float) -> Iterator[Any]:
+    """
+    Yield items no faster than rate per second.
+
+    The source is pulled lazily, one item per tick, so a slow consumer
+    (the WSGI server blocks on each write) holds the producer back too.
+    When the consumer falls behind the schedule is reset instead of
+    bursting to catch up.
+    """
+    interval = 1.0 / rate if rate > 0 else 0.0
+    deadline = time.monotonic()
+    for item in items:
+        now = time.monotonic()
+        if deadline > now:
+            time.sleep(deadline - now)
+        else:
+            deadline = now
+        deadline += interval
+        yield item
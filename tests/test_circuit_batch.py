@@ -0,0 +1,46 @@
+import pytest
+from qiskit import QuantumCircuit
+from qiskit.circuit import Parameter
+
+from src.quantum.circuit_batch import MAX_BATCH_CIRCUITS, check_batch_budget, run_circuit_batch
+
+
+def measured(num_qubits, *flipped, rotate=False):
+    circuit = QuantumCircuit(num_qubits, num_qubits)
+    for qubit in flipped:
+        circuit.x(qubit)
+    if rotate:
+        circuit.rx(0.0, 0)
+    circuit.measure(range(num_qubits), range(num_qubits))
+    return circuit
+
+
+def test_batch_groups_by_method_and_keeps_each_result_apart():
+    unbound = QuantumCircuit(1, 1)
+    unbound.rx(Parameter('theta'), 0)
+    unbound.measure(0, 0)
+    circuits = {'x0': measured(2, 0), 'x1': measured(2, 1), 'rotated': measured(3, 2, rotate=True),
+                'empty': QuantumCircuit(1), 'unbound': unbound}
+    caches = {name: {} for name in circuits}
+
+    batch = run_circuit_batch(circuits, shots=50, seed=2, transpiled_caches=caches)
+    assert list(batch['results']) == ['x0', 'x1', 'rotated']
+    assert batch['results']['x0']['counts'] == {'01': 50}
+    assert batch['results']['x1']['counts'] == {'10': 50}
+    assert batch['results']['rotated']['counts'] == {'100': 50}
+    assert batch['results']['x0']['method'] == 'stabilizer'
+    assert batch['results']['rotated']['method'] == 'statevector'
+    assert set(batch['skipped']) == {'empty', 'unbound'}
+    assert {job['method']: job['circuits'] for job in batch['simulation']['jobs']} == {'stabilizer': 2,
+                                                                                        'statevector': 1}
+
+    again = run_circuit_batch(circuits, shots=50, seed=2, transpiled_caches=caches)
+    assert sum(group['transpiled'] for group in again['groups']) == 0
+    assert again['results']['x1']['counts'] == {'10': 50}
+
+
+def test_batch_budget():
+    with pytest.raises(ValueError, match='circuits'):
+        check_batch_budget(MAX_BATCH_CIRCUITS + 1, 1)
+    with pytest.raises(ValueError, match='shots'):
+        check_batch_budget(2, 10 ** 8)
@@ -0,0 +1,57 @@
+import pytest
+from qiskit import QuantumCircuit
+
+from src.quantum.circuit_execution import (parse_simulation_options, select_simulation_method, simulate_counts,
+                                           transpile_for)
+
+
+def bell_circuit():
+    circuit = QuantumCircuit(2, 2)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.measure([0, 1], [0, 1])
+    return circuit
+
+
+def test_parse_simulation_options_defaults_and_errors():
+    options = parse_simulation_options({'seed': '7'})
+    assert options['shots'] == 1024 and options['seed'] == 7
+    assert (options['method'], options['precision'], options['noise']) == ('automatic', 'double', 'ideal')
+    for bad in [{'shots': 0}, {'seed': -1}, {'method': 'tensor'}, {'precision': 'half'}, {'noise': 'cosmic'}]:
+        with pytest.raises(ValueError):
+            parse_simulation_options(bad)
+
+
+def test_method_selection():
+    clifford = bell_circuit()
+    assert select_simulation_method(clifford)[0] == 'stabilizer'
+    assert select_simulation_method(clifford, noise='depolarizing')[0] == 'stabilizer'
+    assert select_simulation_method(clifford, noise='thermal')[0] == 'density_matrix'
+
+    rotated = bell_circuit()
+    rotated.rx(0.3, 0)
+    assert select_simulation_method(rotated)[0] == 'statevector'
+
+    chain = QuantumCircuit(24)
+    for qubit in range(23):
+        chain.rx(0.1, qubit)
+        chain.cx(qubit, qubit + 1)
+    assert select_simulation_method(chain)[0] == 'matrix_product_state'
+
+
+def test_seeded_counts_are_reproducible_and_reuse_the_transpile_cache():
+    cache = {}
+    counts, info = simulate_counts(bell_circuit(), shots=500, seed=7, transpiled_cache=cache)
+    again, info_again = simulate_counts(bell_circuit(), shots=500, seed=7, transpiled_cache=cache)
+    assert counts == again
+    assert set(counts) <= {'00', '11'} and sum(counts.values()) == 500
+    assert info['method'] == 'stabilizer'
+    assert not info['transpile_cached'] and info_again['transpile_cached']
+
+
+def test_transpile_cache_is_keyed_by_method():
+    cache = {}
+    transpile_for(bell_circuit(), 'statevector', cache=cache)
+    _, info = transpile_for(bell_circuit(), 'stabilizer', cache=cache)
+    assert not info['transpile_cached']
+    assert len(cache) == 2
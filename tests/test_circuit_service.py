@@ -0,0 +1,53 @@
+import os
+import sys
+
+import pytest
+
+from src.services.circuit_service import CircuitService
+
+BELL_SOURCE = """
+qc = QuantumCircuit(2, 2)
+qc.h(0)
+qc.cx(0, 1)
+qc.measure([0, 1], [0, 1])
+"""
+
+
+def test_sources_are_compiled_once_per_content_hash():
+    service = CircuitService(max_artifacts=1)
+    artifact = service.load_source(BELL_SOURCE)
+    assert service.load_source(BELL_SOURCE, name='copy.py') is artifact
+    assert service.cache_info()['hits'] == 1 and service.cache_info()['misses'] == 1
+
+    counts, info = service.counts(artifact, shots=100, seed=3)
+    assert sum(counts.values()) == 100 and set(counts) <= {'00', '11'}
+    assert len(artifact.transpiled) == 1
+
+    service.load_source(BELL_SOURCE + "qc.x(0)\n")
+    assert service.cache_info()['artifacts'] == 1
+    assert service.load_source(BELL_SOURCE) is not artifact
+
+
+def test_load_errors_are_value_errors():
+    service = CircuitService()
+    with pytest.raises(ValueError, match='Failed to load'):
+        service.load_source("1 / 0")
+    with pytest.raises(ValueError, match='No QuantumCircuit'):
+        service.load_source("x = 1")
+
+
+def test_files_import_neighbours_and_reload_when_changed(tmp_path):
+    (tmp_path / 'service_test_helpers.py').write_text("NUM_QUBITS = 3\n")
+    circuit_file = tmp_path / 'circuit.py'
+    circuit_file.write_text("from service_test_helpers import NUM_QUBITS\nqc = QuantumCircuit(NUM_QUBITS)\n")
+    service = CircuitService()
+
+    artifact = service.load_file(str(circuit_file))
+    assert artifact.circuit.num_qubits == 3
+    assert str(tmp_path) not in sys.path
+    assert service.load_file(str(circuit_file)) is artifact
+
+    circuit_file.write_text("qc = QuantumCircuit(5)\n")
+    stat = circuit_file.stat()
+    os.utime(circuit_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert service.load_file(str(circuit_file)).circuit.num_qubits == 5
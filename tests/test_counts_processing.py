@@ -0,0 +1,35 @@
+import numpy as np
+
+from src.quantum.counts_processing import (OTHER_LABEL, summarize_counts, summarize_probabilities, summary_items,
+                                           top_k_indices)
+
+
+def test_top_k_indices_are_sorted_largest_first():
+    values = np.array([3.0, 9.0, 1.0, 7.0, 9.0])
+    np.testing.assert_array_equal(top_k_indices(values, 3), [1, 4, 3])
+    np.testing.assert_array_equal(top_k_indices(values, 10), np.arange(5))
+
+
+def test_small_counts_are_kept_whole_in_outcome_order():
+    summary = summarize_counts({'11': 5, '00': 7, '01': 1})
+    assert summary['labels'] == ['00', '01', '11']
+    assert summary_items(summary) == [('00', 7.0), ('01', 1.0), ('11', 5.0)]
+
+
+def test_large_counts_fold_the_tail_into_other():
+    counts = {format(index, '08b'): index + 1 for index in range(256)}
+    summary = summarize_counts(counts, k=4)
+    assert summary['labels'] == ['11111111', '11111110', '11111101', '11111100']
+    assert summary['total'] == sum(counts.values())
+    assert summary['other'] == summary['total'] - (256 + 255 + 254 + 253)
+    assert summary_items(summary)[-1] == (f"{OTHER_LABEL} (252)", summary['other'])
+
+
+def test_probability_vectors_drop_negligible_outcomes():
+    probabilities = np.zeros(16)
+    probabilities[[0, 5, 15]] = [0.5, 0.3, 0.2]
+    probabilities[3] = 1e-15
+    summary = summarize_probabilities(probabilities, num_qubits=4, k=2)
+    assert summary['labels'] == ['0000', '0101']
+    assert summary['num_outcomes'] == 3 and summary['other_outcomes'] == 1
+    np.testing.assert_allclose(summary['other'], 0.2)
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from src.physics.electromagnetism import ElectroMagUtil
+
+CHARGES = [2e-9, -1e-9, 0.5e-9]
+POSITIONS = [(-1.0, 0.0), (1.0, 0.5), (0.0, -1.5)]
+
+
+@pytest.mark.parametrize('memory_budget', [64 * 1024 ** 2, 512])
+def test_field_grid_matches_point_evaluation(memory_budget):
+    x = np.linspace(-3, 3, 13)
+    y = np.linspace(-2, 2, 9)
+    grid = ElectroMagUtil.calculate_field_grid(CHARGES, POSITIONS, x, y, memory_budget=memory_budget)
+
+    for row, y_value in enumerate(y):
+        for column, x_value in enumerate(x):
+            Ex, Ey = ElectroMagUtil.calculate_field_at_point(CHARGES, POSITIONS, (x_value, y_value))
+            np.testing.assert_allclose(grid['Ex'][row, column], Ex, rtol=1e-12, atol=1e-9)
+            np.testing.assert_allclose(grid['Ey'][row, column], Ey, rtol=1e-12, atol=1e-9)
+
+
+def test_dipole_lines_run_from_positive_to_negative_charge():
+    traced = ElectroMagUtil.trace_field_lines([1e-9, -1e-9], [(-1.0, 0.0), (1.0, 0.0)],
+                                              lines_per_charge=12, bounds=(-20, 20, -20, 20))
+    from_positive = [line for line in traced['field_lines'] if line['start_charge'] == 0]
+    assert len(from_positive) == 12
+    ends = {line['end'] for line in from_positive}
+    assert ends <= {'charge', 'bounds'}
+    # Lines leaving on the side facing the negative charge always land on it
+    facing = [line for line in from_positive if line['x'][0] > -1.0 and abs(line['y'][0]) < 0.1]
+    assert facing and all(line['end'] == 'charge' and line['end_charge'] == 1 for line in facing)
+
+
+def test_traced_lines_follow_the_field_direction():
+    traced = ElectroMagUtil.trace_field_lines(CHARGES, POSITIONS, lines_per_charge=8)
+    for line in traced['field_lines']:
+        points = np.column_stack((line['x'], line['y']))
+        if len(points) < 3:
+            continue
+        sign = np.sign(CHARGES[line['start_charge']])
+        middle = points[len(points) // 2]
+        tangent = points[len(points) // 2 + 1] - points[len(points) // 2 - 1]
+        field = np.array(ElectroMagUtil.calculate_field_at_point(CHARGES, POSITIONS, tuple(middle)))
+        cosine = sign * tangent @ field / (np.linalg.norm(tangent) * np.linalg.norm(field))
+        assert cosine > 0.99
+
+
+def test_lone_charge_lines_are_radial():
+    result = ElectroMagUtil.create_field_line_points(1e-9, center_x=2.0, center_y=-1.0,
+                                                     num_lines=6, max_distance=5)
+    assert len(result['field_lines']) == 6
+    for line in result['field_lines']:
+        radii = np.hypot(np.array(line['x']) - 2.0, np.array(line['y']) + 1.0)
+        angles = np.arctan2(np.array(line['y']) + 1.0, np.array(line['x']) - 2.0)
+        np.testing.assert_allclose(radii[[0, -1]], [0.1, 5.0], rtol=1e-9)
+        np.testing.assert_allclose(angles, angles[0], atol=1e-9)
+        assert line['direction'] == 'outward'
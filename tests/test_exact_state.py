@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Statevector
+
+from src.quantum.exact_state import compute_exact_outputs, parse_observable
+
+
+def rotated_bell():
+    circuit = QuantumCircuit(2, 2)
+    circuit.ry(0.7, 0)
+    circuit.cx(0, 1)
+    circuit.measure([0, 1], [0, 1])
+    return circuit
+
+
+def test_exact_outputs_match_qiskit_statevector():
+    circuit = rotated_bell()
+    expected = Statevector(circuit.remove_final_measurements(inplace=False))
+    exact = compute_exact_outputs(circuit, ['statevector', 'probabilities', 'expectation'],
+                                  observables=['ZZ', [['XX', 0.5], ['ZI', 2.0]]])
+
+    np.testing.assert_allclose(exact['statevector'], expected.data, atol=1e-12)
+    np.testing.assert_allclose(exact['probabilities'], expected.probabilities(), atol=1e-12)
+    values = [entry['value'] for entry in exact['expectation_values']]
+    np.testing.assert_allclose(values, [1.0, 0.5 * np.sin(0.7) + 2.0 * np.cos(0.7)], atol=1e-10)
+    assert exact['expectation_values'][1]['observable'] == '0.5*XX + 2*ZI'
+    assert exact['simulation']['method'] == 'statevector'
+    assert exact['statevector'].dtype == np.complex128
+    single = compute_exact_outputs(circuit, ['statevector'], precision='single')
+    assert single['statevector'].dtype == np.complex64
+
+
+def test_invalid_requests_are_rejected():
+    with pytest.raises(ValueError, match='Invalid Pauli label'):
+        parse_observable('ZQ', 2)
+    with pytest.raises(ValueError, match='observable'):
+        compute_exact_outputs(rotated_bell(), ['expectation'])
+    with pytest.raises(ValueError, match='Statevector output'):
+        compute_exact_outputs(rotated_bell(), ['statevector'], method='stabilizer')
+
+    mid_circuit = QuantumCircuit(1, 1)
+    mid_circuit.measure(0, 0)
+    mid_circuit.h(0)
+    with pytest.raises(ValueError, match='mid-circuit'):
+        compute_exact_outputs(mid_circuit)
@@ -0,0 +1,39 @@
+import struct
+
+import numpy as np
+import pytest
+
+from src.utils.array_transport import FLOAT32_PACK_MIMETYPE, pack_float32_arrays, unpack_float32_arrays
+
+
+@pytest.mark.parametrize('label', ['', 'a', 'ab', 'abc', 'φ', 'π/2 · ψ', '波'])
+def test_header_is_padded_to_float32_alignment(label):
+    arrays = {'scalar': np.float64(2.5), 'vector': np.arange(5), 'grid': np.arange(6.0).reshape(2, 3),
+              'cube': np.ones((2, 1, 2))}
+    payload = pack_float32_arrays(arrays, {'label': label})
+
+    (header_length,) = struct.unpack_from('<I', payload)
+    assert (4 + header_length) % 4 == 0
+    assert len(payload) == 4 + header_length + 4 * (1 + 5 + 6 + 4)
+
+    metadata, unpacked = unpack_float32_arrays(payload)
+    assert metadata == {'label': label}
+    for name, array in arrays.items():
+        assert unpacked[name].dtype == np.float32
+        assert unpacked[name].shape == np.shape(array)
+        np.testing.assert_array_equal(unpacked[name], np.asarray(array, dtype=np.float32))
+
+
+def test_wave_route_returns_a_float32_pack():
+    app = pytest.importorskip('app').app
+    response = app.test_client().post('/api/waves/generate', json={
+        'frequency': 2.0, 'amplitude': 1.5, 'phase': 0.5, 'samples': 256, 'format': 'binary'})
+    assert response.status_code == 200
+    assert response.headers['Content-Type'] == FLOAT32_PACK_MIMETYPE
+
+    metadata, arrays = unpack_float32_arrays(response.get_data())
+    assert metadata['success'] and 'φ=0.5π' in metadata['title']
+    assert {name: array.shape for name, array in arrays.items()} == {
+        't': (256,), 'wave': (256,), 'derivative': (256,), 'frequencies': (128,), 'magnitude': (128,),
+        'energy': (256,)}
+    np.testing.assert_allclose(arrays['wave'], 1.5 * np.sin(2.0 * arrays['t'] + 0.5 * np.pi), atol=1e-5)
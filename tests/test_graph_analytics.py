@@ -0,0 +1,68 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from src.math.graph_analytics import GraphAnalytics
+from src.math.graph_session import GraphSession
+
+
+@pytest.fixture(scope='module')
+def graph():
+    return nx.connected_watts_strogatz_graph(120, 6, 0.2, seed=4)
+
+
+@pytest.fixture(scope='module')
+def analytics(graph):
+    return GraphAnalytics(nx.to_scipy_sparse_array(graph, nodelist=range(graph.number_of_nodes())))
+
+
+def test_exact_measures_match_networkx(graph, analytics):
+    betweenness = analytics.betweenness_centrality(max_sources=graph.number_of_nodes())
+    assert betweenness['exact']
+    expected = nx.betweenness_centrality(graph)
+    np.testing.assert_allclose(betweenness['values'], [expected[i] for i in graph], atol=1e-12)
+
+    pagerank = analytics.pagerank(tol=1e-12, max_iter=500)
+    assert pagerank['converged']
+    expected = nx.pagerank(graph, tol=1e-12)
+    np.testing.assert_allclose(pagerank['values'], [expected[i] for i in graph], atol=1e-8)
+
+    clustering = analytics.clustering()
+    expected = nx.clustering(graph)
+    np.testing.assert_allclose(clustering['values'], [expected[i] for i in graph], atol=1e-12)
+    assert clustering['triangles'] == sum(nx.triangles(graph).values()) // 3
+
+
+def test_sparse_spectrum_matches_dense(analytics):
+    dense = analytics.laplacian_spectrum(k=4)
+    sparse = analytics.laplacian_spectrum(k=4, dense_threshold=10, max_iter=500, seed=0)
+    assert sparse['method'] == 'eigsh+lobpcg' and sparse['converged']
+    np.testing.assert_allclose(sparse['largest'], dense['largest'], rtol=1e-6)
+    np.testing.assert_allclose(sparse['smallest'], dense['smallest'], atol=1e-5)
+
+
+def test_spectrum_reports_unconverged_lobpcg(analytics):
+    result = analytics.laplacian_spectrum(k=4, dense_threshold=10, max_iter=1, seed=0)
+    assert not result['converged']
+    assert result['max_residual'] > 1e-6
+    # eigsh honours the same cap and keeps only the eigenvalues that converged
+    assert len(result['largest']) < 4
+
+
+def test_from_session_indexes_sorted_nodes():
+    session = GraphSession.from_edges(0, [(10, 30), (30, 20)])
+    analytics = GraphAnalytics.from_session(session)
+    assert analytics.nodes == [10, 20, 30]
+    np.testing.assert_array_equal(analytics.degrees, [1, 1, 2])
+
+
+def test_parse_request_whitelists_and_clamps():
+    analyses, options = GraphAnalytics.parse_request(
+        ['spectrum', 'pagerank'], {'spectrum': {'k': 0, 'max_iter': 10 ** 9}, 'pagerank': {'alpha': 2}})
+    assert analyses == ['spectrum', 'pagerank']
+    assert options == {'spectrum': {'k': 1, 'max_iter': 500}, 'pagerank': {'alpha': 0.99}}
+
+    with pytest.raises(ValueError, match='list'):
+        GraphAnalytics.parse_request('spectrum')
+    with pytest.raises(ValueError, match='Unsupported option'):
+        GraphAnalytics.parse_request(['betweenness'], {'betweenness': {'max_iter': 5}})
@@ -0,0 +1,40 @@
+from qiskit import ClassicalRegister, QuantumCircuit, QuantumRegister
+
+from src.quantum.graph_circuit import (choose_diagram_mode, circuit_structure_hash, clear_diagram_cache,
+                                       render_circuit_diagram)
+
+
+def conditioned(value, register_name='c'):
+    qubits, clbits = QuantumRegister(2, 'q'), ClassicalRegister(2, register_name)
+    circuit = QuantumCircuit(qubits, clbits)
+    circuit.h(0)
+    circuit.measure(0, 0)
+    with circuit.if_test((clbits, value)):
+        circuit.x(1)
+    return circuit
+
+
+def test_structure_hash_tracks_everything_that_changes_the_drawing():
+    assert circuit_structure_hash(conditioned(1)) == circuit_structure_hash(conditioned(1))
+    assert circuit_structure_hash(conditioned(1)) != circuit_structure_hash(conditioned(2))
+    assert circuit_structure_hash(conditioned(1)) != circuit_structure_hash(conditioned(1, register_name='m'))
+
+    plain, labelled = QuantumCircuit(1), QuantumCircuit(1)
+    plain.x(0)
+    labelled.x(0, label='flip')
+    assert circuit_structure_hash(plain) != circuit_structure_hash(labelled)
+
+
+def test_diagrams_are_cached_by_structure():
+    clear_diagram_cache()
+    first = render_circuit_diagram(conditioned(1), mode='text')
+    second = render_circuit_diagram(conditioned(1), mode='text')
+    assert not first['cached'] and second['cached']
+    assert second['text'] == first['text']
+    assert not render_circuit_diagram(conditioned(2), mode='text')['cached']
+
+    wide = QuantumCircuit(4)
+    for _ in range(2000):
+        wide.cx(0, 1)
+    assert choose_diagram_mode(wide) == 'summary'
+    assert render_circuit_diagram(wide)['text'].startswith('Circuit: 4 qubits')
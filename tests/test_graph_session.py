@@ -0,0 +1,78 @@
+import random
+import threading
+
+import networkx as nx
+import pytest
+
+from src.math.graph_session import GraphSession
+
+
+def reference_graph(session):
+    graph = nx.Graph()
+    graph.add_nodes_from(session.nodes())
+    graph.add_edges_from(session.edges())
+    return graph
+
+
+def test_connectivity_matches_networkx_after_random_edits():
+    rng = random.Random(7)
+    session = GraphSession.from_edges(30, [(i, i + 1) for i in range(29)])
+    for _ in range(300):
+        u, v = rng.sample(session.nodes(), 2)
+        if rng.random() < 0.4 and session.num_edges:
+            u, v = rng.choice(session.edges())
+            session.apply([{'op': 'remove_edge', 'u': u, 'v': v}])
+        elif rng.random() < 0.05 and session.num_nodes > 5:
+            session.apply([{'op': 'remove_node', 'node': u}])
+        else:
+            session.apply([{'op': 'add_edge', 'u': u, 'v': v}])
+
+        graph = reference_graph(session)
+        summary = session.summary()
+        assert summary['num_edges'] == graph.number_of_edges()
+        assert summary['num_components'] == nx.number_connected_components(graph)
+        degrees = [degree for _, degree in graph.degree()]
+        assert summary['max_degree'] == max(degrees)
+        assert summary['min_degree'] == min(degrees)
+
+
+def test_removal_marks_connectivity_stale_until_requested():
+    session = GraphSession.from_edges(3, [(0, 1), (1, 2)])
+    assert session.summary()['num_components'] == 1
+
+    session.apply([{'op': 'remove_edge', 'u': 1, 'v': 2}])
+    assert session.components_stale
+    assert session.summary(connectivity=False)['num_components'] is None
+    assert session.summary()['num_components'] == 2
+    assert not session.components_stale
+
+
+def test_rejected_batch_leaves_graph_untouched():
+    session = GraphSession.from_edges(3, [(0, 1)])
+    before = (session.edges(), session.version)
+
+    with pytest.raises(ValueError, match='Operation 1'):
+        session.apply([{'op': 'add_edge', 'u': 1, 'v': 2},
+                       {'op': 'remove_node', 'node': 9}])
+    assert (session.edges(), session.version) == before
+
+
+def test_concurrent_batches_do_not_interleave():
+    session = GraphSession(0)
+
+    def worker(offset):
+        for i in range(50):
+            base = 1000 * offset + 2 * i
+            session.apply([{'op': 'add_edge', 'u': base, 'v': base + 1},
+                           {'op': 'remove_edge', 'u': base, 'v': base + 1}])
+            session.summary()
+
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert session.num_edges == 0
+    assert session.num_nodes == 4 * 100
+    assert session.summary()['num_components'] == 4 * 100
@@ -0,0 +1,70 @@
+import threading
+import time
+
+from src.services.job_queue import CANCELLED, COMPLETED, FAILED, JobQueue
+
+
+def wait_until_finished(queue, job, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not job.finished:
+        assert queue.wait_for_change(job, job.version, timeout=deadline - time.monotonic()) or job.finished
+    return job
+
+
+def test_higher_priority_runs_first_and_ties_keep_submission_order():
+    queue = JobQueue(max_workers=1)
+    gate = threading.Event()
+    order = []
+    blocker = queue.submit(lambda job: gate.wait(5))
+    jobs = [queue.submit(lambda job, name=name: order.append(name), priority=priority)
+            for name, priority in [('low', 0), ('high-1', 5), ('mid', 1), ('high-2', 5)]]
+    gate.set()
+    for job in [blocker] + jobs:
+        wait_until_finished(queue, job)
+    assert order == ['high-1', 'high-2', 'mid', 'low']
+
+
+def test_cancel_queued_and_running_jobs():
+    queue = JobQueue(max_workers=1)
+    started = threading.Event()
+
+    def long_job(job):
+        started.set()
+        while True:
+            job.report('working', 0.5)
+            time.sleep(0.01)
+
+    running = queue.submit(long_job)
+    queued = queue.submit(lambda job: 'never')
+    assert started.wait(5)
+
+    assert queue.cancel(queued.id)
+    assert queued.status == CANCELLED
+    assert queue.cancel(running.id)
+    assert wait_until_finished(queue, running).status == CANCELLED
+    assert not queue.cancel(running.id)
+
+
+def test_results_errors_and_system_exit_keep_the_worker_alive():
+    queue = JobQueue(max_workers=1)
+    failing = queue.submit(lambda job: 1 / 0)
+
+    def exits(job):
+        raise SystemExit(3)
+
+    exiting = queue.submit(exits)
+    succeeding = queue.submit(lambda job, value: value * 2, 21)
+    assert wait_until_finished(queue, failing).status == FAILED
+    assert 'division by zero' in failing.error
+    assert wait_until_finished(queue, exiting).status == FAILED
+    assert wait_until_finished(queue, succeeding).status == COMPLETED
+    assert succeeding.to_dict(include_result=True)['result'] == 42
+
+
+def test_finished_jobs_expire_after_ttl_and_keys_are_released():
+    queue = JobQueue(max_workers=1, result_ttl=0.05)
+    job = wait_until_finished(queue, queue.submit(lambda job: 'done', key='sweep-1'))
+    assert queue.find('sweep-1') is job
+    time.sleep(0.1)
+    assert queue.get(job.id) is None
+    assert queue.find('sweep-1') is None
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from src.math.large_matrix import LargeMatrixTools, MemoryBudgetError
+from src.utils.array_transport import (decode_arrays, decode_matrix, decoded_nbytes, encode_matrix, encode_npz,
+                                       pack_float32_arrays, unpack_float32_arrays)
+
+
+@pytest.fixture
+def tools():
+    return LargeMatrixTools()
+
+
+def test_top_eigenvalues_match_dense_spectrum(tools):
+    matrix = tools.create_matrix('sparse_symmetric', 400, density=0.02, seed=1)
+    result = tools.top_eigenvalues(matrix, k=4)
+    assert result['method'] == 'eigsh' and result['converged']
+    dense = np.linalg.eigvalsh(matrix.toarray())
+    expected = dense[np.argsort(-np.abs(dense))][:4]
+    np.testing.assert_allclose(result['eigenvalues'], expected, rtol=1e-8)
+
+
+@pytest.mark.parametrize('matrix', [np.array([[1.0, 2.0], [0.0, 3.0]]), np.array([[5.0]])])
+def test_tiny_eigenproblems_fall_back_to_dense(tools, matrix):
+    result = tools.top_eigenvalues(matrix, k=6)
+    expected = np.linalg.eigvals(matrix)
+    np.testing.assert_allclose(result['eigenvalues'], expected[np.argsort(-np.abs(expected))])
+    assert result['converged']
+
+
+def test_singular_values_and_randomized_svd(tools):
+    rng = np.random.default_rng(2)
+    low_rank = rng.standard_normal((300, 8)) @ rng.standard_normal((8, 200))
+    exact = np.linalg.svd(low_rank, compute_uv=False)[:5]
+    np.testing.assert_allclose(tools.top_singular_values(low_rank, k=5)['singular_values'], exact, rtol=1e-8)
+    np.testing.assert_allclose(tools.randomized_svd(low_rank, k=5, seed=0)['singular_values'], exact, rtol=1e-8)
+
+
+def test_sparse_determinant_matches_dense_slogdet(tools):
+    rng = np.random.default_rng(3)
+    matrix = sparse.random(60, 60, density=0.1, random_state=rng, format='csr') + sparse.diags(rng.random(60) - 2)
+    result = tools.determinant(matrix)
+    sign, logdet = np.linalg.slogdet(matrix.toarray())
+    assert result['sign'] == sign
+    np.testing.assert_allclose(result['log_abs_determinant'], logdet, rtol=1e-10)
+
+
+def test_memory_budget_is_enforced():
+    small = LargeMatrixTools(memory_budget=1024)
+    with pytest.raises(MemoryBudgetError):
+        small.create_matrix('random', 100)
+    laplacian = LargeMatrixTools().create_matrix('sparse_laplacian', 1000)
+    with pytest.raises(MemoryBudgetError, match='Sparse LU'):
+        small.determinant(laplacian)
+
+    # The default budget holds one 10k x 10k dense matrix
+    LargeMatrixTools().check_budget(10_000 * 10_000 * 8, "A dense 10000x10000 matrix")
+
+
+def test_decoded_size_is_read_from_the_headers():
+    dense = np.zeros((30, 40), dtype=np.float32)
+    assert decoded_nbytes(encode_matrix(dense)[0]) == dense.nbytes
+    matrix = sparse.random(100, 100, density=0.05, format='csr', random_state=5)
+    payload, _ = encode_matrix(matrix)
+    assert decoded_nbytes(payload) >= matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+    assert decoded_nbytes(encode_npz(compressed=True, values=np.zeros(10 ** 5))) >= 8 * 10 ** 5
+
+
+def test_binary_transport_round_trips():
+    dense = np.arange(12.0).reshape(3, 4)
+    payload, _ = encode_matrix(dense)
+    np.testing.assert_array_equal(decode_matrix(payload), dense)
+
+    matrix = sparse.random(50, 40, density=0.05, format='csr', random_state=4)
+    payload, _ = encode_matrix(matrix)
+    assert (decode_matrix(payload) != matrix).nnz == 0
+
+    arrays = decode_arrays(encode_npz(values=np.arange(3), vectors=np.eye(2)))
+    assert set(arrays) == {'values', 'vectors'}
+
+    metadata, unpacked = unpack_float32_arrays(pack_float32_arrays({'x': np.arange(5), 'grid': np.ones((2, 3))},
+                                                                   {'samples': 5}))
+    assert metadata == {'samples': 5}
+    np.testing.assert_array_equal(unpacked['x'], np.arange(5, dtype=np.float32))
+    assert unpacked['grid'].shape == (2, 3)
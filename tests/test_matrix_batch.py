@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from src.math.matrix_batch import MatrixBatch
+
+
+def test_batched_results_match_per_matrix_numpy():
+    rng = np.random.default_rng(5)
+    matrices = [rng.standard_normal((3, 3)) for _ in range(4)] + [rng.standard_normal((2, 4))]
+    batch = MatrixBatch(matrices).analyze(['determinant', 'trace', 'svd', 'rank', 'inverse', 'norm'])
+
+    assert batch['groups'] == [{'shape': [3, 3], 'count': 4}, {'shape': [2, 4], 'count': 1}]
+    for matrix, result in zip(matrices[:4], batch['results'][:4]):
+        np.testing.assert_allclose(result['determinant'], np.linalg.det(matrix))
+        np.testing.assert_allclose(result['trace'], np.trace(matrix))
+        np.testing.assert_allclose(result['svd'], np.linalg.svd(matrix, compute_uv=False))
+        np.testing.assert_allclose(result['inverse'], np.linalg.inv(matrix), rtol=1e-10)
+        np.testing.assert_allclose(result['norm']['frobenius'], np.linalg.norm(matrix))
+        assert result['rank'] == 3
+
+    rectangular = batch['results'][4]
+    assert rectangular['rank'] == 2
+    assert 'error' in rectangular['determinant'] and 'error' in rectangular['inverse']
+
+
+def test_singular_matrix_inverse_fails_alone():
+    batch = MatrixBatch([np.eye(2), np.ones((2, 2))]).analyze(['inverse', 'condition'])
+    assert batch['results'][0]['inverse'] == [[1.0, 0.0], [0.0, 1.0]]
+    assert batch['results'][1]['inverse'] == {'error': 'Matrix is singular, cannot compute inverse.'}
+    condition = batch['results'][1]['condition']
+    assert condition is None or condition > 1e15
+    assert MatrixBatch([np.zeros((2, 2))]).analyze(['condition'])['results'][0]['condition'] is None
+
+
+def test_complex_eigenvalues_are_returned_as_pairs():
+    rotation = np.array([[0.0, -1.0], [1.0, 0.0]])
+    eigenvalues = MatrixBatch([rotation]).analyze(['eigenvalues'])['results'][0]['eigenvalues']
+    assert sorted(eigenvalues) == [[0.0, -1.0], [0.0, 1.0]]
+
+
+def test_unknown_operation_is_rejected():
+    with pytest.raises(ValueError, match='Invalid operation'):
+        MatrixBatch([np.eye(2)]).analyze(['transpose'])
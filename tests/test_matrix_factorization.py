@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from src.math.matrix_factorization import MatrixFactorization
+from src.math.matrix_tools import MatrixTools
+
+
+@pytest.mark.parametrize('matrix, structure', [
+    (np.diag([1.0, 2.0, 3.0]), 'diagonal'),
+    (np.triu(np.arange(1.0, 10.0).reshape(3, 3)), 'upper'),
+    (np.tril(np.arange(1.0, 10.0).reshape(3, 3)), 'lower'),
+    (np.array([[2.0, 1.0], [1.0, 3.0]]), 'symmetric'),
+    (np.array([[1.0, 2.0], [2.0 + 1e-6, 1.0]]), 'general'),
+    (np.ones((2, 3)), 'rectangular'),
+])
+def test_structure_detection(matrix, structure):
+    assert MatrixFactorization(matrix).structure == structure
+
+
+def test_nearly_symmetric_matrix_keeps_exact_eigenvalues():
+    matrix = np.array([[1.0, 1e3], [1e3 * (1 + 1e-6), 1.0]])
+    eigenvalues = np.sort(MatrixFactorization(matrix).eigenvalues().real)
+    np.testing.assert_allclose(eigenvalues, np.sort(np.linalg.eigvals(matrix).real), rtol=1e-12)
+
+
+@pytest.mark.parametrize('kind', ['general', 'symmetric', 'upper'])
+def test_derived_properties_match_numpy(kind):
+    rng = np.random.default_rng(3)
+    matrix = rng.standard_normal((6, 6)) + 6 * np.eye(6)
+    if kind == 'symmetric':
+        matrix = matrix + matrix.T
+    elif kind == 'upper':
+        matrix = np.triu(matrix)
+    factorization = MatrixFactorization(matrix)
+    assert factorization.structure == kind
+
+    b = rng.standard_normal(6)
+    np.testing.assert_allclose(factorization.solve(b), np.linalg.solve(matrix, b), rtol=1e-10)
+    np.testing.assert_allclose(factorization.determinant(), np.linalg.det(matrix), rtol=1e-10)
+    np.testing.assert_allclose(factorization.inverse(), np.linalg.inv(matrix), rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(factorization.singular_values(), np.linalg.svd(matrix, compute_uv=False),
+                               rtol=1e-10)
+
+
+def test_factorizations_are_computed_once():
+    factorization = MatrixFactorization(np.array([[4.0, 1.0], [2.0, 3.0]]))
+    factorization.determinant()
+    first_lu = factorization.lu()
+    factorization.solve(np.ones(2))
+    assert factorization.lu() is first_lu
+    assert factorization.cached() == ['determinant', 'lu']
+
+
+def test_matrix_tools_cache_reuses_and_evicts_by_content():
+    tools = MatrixTools(cache_size=2)
+    a = np.array([[1.0, 2.0], [3.0, 4.0]])
+    first = tools.factorize(a)
+    assert tools.factorize(a.copy()) is first
+
+    # The entry keeps its own read-only snapshot of the contents it was keyed by
+    a[0, 0] = 100.0
+    assert first.matrix[0, 0] == 1.0
+    assert not first.matrix.flags.writeable
+
+    tools.factorize(np.eye(2))
+    tools.factorize(np.ones((2, 2)))
+    assert tools.factorize(np.array([[1.0, 2.0], [3.0, 4.0]])) is not first
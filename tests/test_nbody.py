@@ -0,0 +1,76 @@
+import time
+
+import numpy as np
+import pytest
+
+from src.physics.nbody import BarnesHutTree, NBodySimulation, direct_accelerations
+
+
+def naive_accelerations(positions, masses, G, softening):
+    delta = positions[None, :, :] - positions[:, None, :]
+    r_squared = np.einsum('ijk,ijk->ij', delta, delta) + softening ** 2
+    np.fill_diagonal(r_squared, np.inf)
+    return G * np.einsum('ij,ijk->ik', masses[None, :] * r_squared ** -1.5, delta)
+
+
+@pytest.mark.parametrize('dimensions', [2, 3])
+def test_direct_sum_matches_naive_pairwise_sum(dimensions):
+    rng = np.random.default_rng(1)
+    positions = rng.standard_normal((300, dimensions))
+    masses = rng.random(300)
+    expected = naive_accelerations(positions, masses, 1.0, 0.01)
+    # A tiny budget forces many row chunks
+    result = direct_accelerations(positions, masses, G=1.0, softening=0.01, memory_budget=50_000)
+    np.testing.assert_allclose(result, expected, rtol=1e-8, atol=1e-10)
+
+
+@pytest.mark.parametrize('dimensions', [2, 3])
+def test_barnes_hut_approaches_direct_sum(dimensions):
+    rng = np.random.default_rng(2)
+    positions = rng.standard_normal((2000, dimensions))
+    masses = rng.random(2000)
+    expected = direct_accelerations(positions, masses, G=1.0, softening=0.05)
+    tree = BarnesHutTree(positions, masses)
+
+    def relative_error(theta):
+        approx = tree.accelerations(positions, 1.0, softening=0.05, theta=theta)
+        return np.median(np.linalg.norm(approx - expected, axis=1) / np.linalg.norm(expected, axis=1))
+
+    assert relative_error(0.5) < 1e-2
+    assert relative_error(0.2) < relative_error(0.5)
+    np.testing.assert_allclose(tree.accelerations(positions, 1.0, softening=0.05, theta=1e-9),
+                               expected, rtol=1e-8, atol=1e-10)
+
+
+def test_leapfrog_conserves_energy_and_momentum():
+    simulation = NBodySimulation.plummer(200, G=1.0, seed=3, softening=0.05, time_step=1e-3)
+    energy = simulation.total_energy()
+    momentum = simulation.momentum()
+    simulation.step(200)
+    assert abs(simulation.total_energy() - energy) < 1e-3 * abs(energy)
+    np.testing.assert_allclose(simulation.momentum(), momentum, atol=1e-12)
+
+
+def test_coincident_bodies_need_softening():
+    positions = [[0.0, 0.0], [0.0, 0.0], [1.0, 0.0]]
+    velocities = np.zeros((3, 2))
+    with pytest.raises(ValueError, match='softening'):
+        NBodySimulation(positions, velocities, [1.0, 1.0, 1.0], G=1.0)
+    simulation = NBodySimulation(positions, velocities, [1.0, 1.0, 1.0], G=1.0, softening=0.1)
+    assert np.isfinite(simulation.total_energy())
+
+
+def test_deadline_is_checked_between_steps():
+    simulation = NBodySimulation.plummer(50, G=1.0, seed=4, softening=0.05, time_step=1e-3)
+    assert simulation.step(1000, deadline=time.monotonic() - 1) == 1
+    assert simulation.steps == 1 and simulation.time == pytest.approx(1e-3)
+
+    # A frame that overruns the deadline is cut short and sent as the last one
+    chunks = list(simulation.trajectory_chunks(10, steps_per_frame=10 ** 6, deadline=time.monotonic() + 0.1))
+    assert [len(chunk['times']) for chunk in chunks] == [2]
+    assert 1 < simulation.steps < 10 ** 6
+
+
+def test_auto_method_uses_the_measured_crossovers():
+    assert NBodySimulation.plummer(3000, G=1.0, seed=0).method == 'direct'
+    assert NBodySimulation.disk(3000, G=1.0, seed=0).method == 'barnes_hut'
@@ -0,0 +1,30 @@
+import pytest
+from qiskit import QuantumCircuit
+
+from src.quantum.circuit_execution import simulate_counts
+from src.quantum.noise_profiles import IDEAL, get_noise_model, list_noise_profiles, noise_run_options
+
+
+def test_profiles_and_cached_models():
+    profiles = {profile['name']: profile['stabilizer'] for profile in list_noise_profiles()}
+    assert profiles[IDEAL] and profiles['readout'] and not profiles['thermal']
+    assert get_noise_model(IDEAL) is None
+    assert get_noise_model('device_like') is get_noise_model('device_like')
+    with pytest.raises(ValueError, match='Unknown noise profile'):
+        get_noise_model('cosmic')
+    assert noise_run_options('statevector', 'thermal')['shot_branching_enable']
+    assert noise_run_options('statevector', IDEAL) == noise_run_options('density_matrix', 'thermal') == {}
+
+
+@pytest.mark.parametrize('noise, method', [('readout', 'stabilizer'), ('thermal', 'density_matrix')])
+def test_noisy_runs_flip_some_outcomes(noise, method):
+    circuit = QuantumCircuit(3, 3)
+    circuit.x(range(3))
+    circuit.measure(range(3), range(3))
+    ideal, _ = simulate_counts(circuit, shots=4000, seed=5)
+    assert ideal == {'111': 4000}
+
+    counts, info = simulate_counts(circuit, shots=4000, seed=5, noise=noise)
+    assert info['method'] == method
+    assert sum(counts.values()) == 4000
+    assert 0 < 4000 - counts['111'] < 1000
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from qiskit import QuantumCircuit
+from qiskit.circuit import Parameter
+
+from src.quantum.parameter_sweep import (MAX_SWEEP_SETS, MAX_SWEEP_SHOTS, build_parameter_table, check_sweep_budget,
+                                         expand_parameter_values, run_parameter_sweep)
+
+
+def rotation_circuit():
+    theta, phi = Parameter('theta'), Parameter('phi')
+    circuit = QuantumCircuit(2, 2)
+    circuit.rx(theta, 0)
+    circuit.rx(phi, 1)
+    circuit.measure([0, 1], [0, 1])
+    return circuit
+
+
+def test_parameter_tables():
+    circuit = rotation_circuit()
+    np.testing.assert_allclose(expand_parameter_values({'start': 0, 'stop': 1, 'num': 5}), np.linspace(0, 1, 5))
+    table = build_parameter_table(circuit, {'theta': [0, 1, 2], 'phi': {'start': 0, 'stop': 1, 'num': 2}},
+                                  mode='product')
+    assert len(table['theta']) == len(table['phi']) == 6
+
+    broadcast = build_parameter_table(circuit, {'theta': [0, 1, 2], 'phi': [0.5]})
+    np.testing.assert_array_equal(broadcast['phi'], [0.5, 0.5, 0.5])
+
+    with pytest.raises(ValueError, match='different lengths'):
+        build_parameter_table(circuit, {'theta': [0, 1], 'phi': [0, 1, 2]})
+    with pytest.raises(ValueError, match='Unknown parameter'):
+        build_parameter_table(circuit, {'theta': [0], 'phi': [0], 'psi': [0]})
+    with pytest.raises(ValueError, match='shots'):
+        check_sweep_budget(2, MAX_SWEEP_SHOTS)
+
+
+def test_product_size_does_not_overflow():
+    # 10000^8 sets wraps to a negative number in int64 arithmetic
+    circuit = QuantumCircuit(8)
+    for qubit in range(8):
+        circuit.rx(Parameter(f"p{qubit}"), qubit)
+    spec = {'start': 0, 'stop': 1, 'num': MAX_SWEEP_SETS}
+    with pytest.raises(ValueError, match='parameter sets'):
+        build_parameter_table(circuit, {f"p{qubit}": spec for qubit in range(8)}, mode='product')
+
+
+def test_sweep_counts_follow_the_rotation_angle():
+    result = run_parameter_sweep(rotation_circuit(), {'theta': [0, np.pi], 'phi': [np.pi, 0]}, shots=200, seed=1)
+    assert result['parameters'] == ['phi', 'theta']
+    counts = dict(zip(result['outcomes'], result['counts'].T))
+    # Qiskit bitstrings put qubit 1 first
+    np.testing.assert_array_equal(counts['10'], [200, 0])
+    np.testing.assert_array_equal(counts['01'], [0, 200])
+    assert result['simulation']['num_sets'] == 2
@@ -0,0 +1,46 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.physics import electromagnetism
+from src.physics.physics_batch import FORMULAS, PhysicsBatch
+
+VALUES = [0.0, 1e-9, 2.5, 3e4]
+
+
+@pytest.mark.parametrize('formula', sorted(FORMULAS))
+def test_batch_matches_the_scalar_methods(formula):
+    source, inputs, _, _ = FORMULAS[formula]
+    class_name, method_name = source.split('.')
+    scalar = getattr(getattr(electromagnetism, class_name), method_name)
+
+    # Every combination of the sample values, including zero denominators
+    grids = np.meshgrid(*([VALUES] * len(inputs)), indexing='ij')
+    columns = {name: grid.ravel() for name, grid in zip(inputs, grids)}
+    result = PhysicsBatch(columns).evaluate([formula])[formula]
+
+    for row in range(len(result)):
+        expected = scalar(*(float(columns[name][row]) for name in inputs))
+        if math.isinf(expected):
+            assert result[row] == expected
+        else:
+            assert result[row] == pytest.approx(expected, rel=1e-12, abs=1e-300)
+
+
+def test_scalars_broadcast_and_mapping_renames_columns():
+    batch = PhysicsBatch({'mass_kg': [1.0, 2.0, 3.0], 'distance': 2.0, 'mass_a': 5.0},
+                         mapping={'mass_b': 'mass_kg', 'mass': 'mass_kg'})
+    results = batch.evaluate(['attraction_force', 'weight'])
+    assert results['attraction_force'].shape == (3,)
+    np.testing.assert_allclose(results['weight'] / results['weight'][0], [1.0, 2.0, 3.0])
+
+
+def test_invalid_requests_are_rejected():
+    with pytest.raises(ValueError, match='different lengths'):
+        PhysicsBatch({'charge': [1.0, 2.0], 'distance': [1.0, 2.0, 3.0]})
+    with pytest.raises(ValueError, match='needs column'):
+        PhysicsBatch({'charge': [1.0]}).evaluate(['electric_potential'])
+    with pytest.raises(ValueError, match='Unknown formula'):
+        PhysicsBatch({'charge': [1.0]}).evaluate(['lorentz_force'])
+    assert PhysicsBatch.to_json_column(np.array([1.0, np.inf])) == [1.0, None]
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from src.physics.quantum_wave import QuantumWave
+
+
+@pytest.fixture
+def wave():
+    wave = QuantumWave(2.0e14, 1.5)
+    wave.phase = 0.3
+    return wave
+
+
+def test_array_methods_match_scalar_methods(wave):
+    distances = np.linspace(0, 3 * wave.wavelength, 7)
+    times = np.linspace(0, 2 * wave.period, 5)
+    field = wave.wave_field(distances, times)
+    density = wave.wave_field(distances, times, probability=True)
+    for row, t in enumerate(times):
+        assert wave.amplitude_array(t) == pytest.approx(wave.get_amplitude_at(t))
+        assert wave.oscillation_velocity_array(t) == pytest.approx(wave.get_oscillation_velocity_at(t))
+        for column, x in enumerate(distances):
+            assert field[row, column] == pytest.approx(wave.get_wave_function(x, t), abs=1e-12)
+            assert density[row, column] == pytest.approx(wave.get_probability_density(x, t), abs=1e-12)
+
+
+def test_out_buffer_is_reused_and_checked(wave):
+    out = np.empty((3, 4))
+    result = wave.wave_field(np.zeros(4), np.zeros(3), out=out)
+    assert result is out
+    np.testing.assert_allclose(out, 1.5 * np.cos(0.3))
+    with pytest.raises(ValueError, match='shape'):
+        wave.wave_field(np.zeros(4), np.zeros(2), out=out)
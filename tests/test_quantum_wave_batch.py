@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from src.physics.quantum_wave import PhysicsConstants
+from src.physics.quantum_wave_batch import QuantumWaveBatch
+
+
+def test_batch_columns_match_individual_waves():
+    masses = [PhysicsConstants.ELECTRON_MASS, 1836 * PhysicsConstants.ELECTRON_MASS]
+    batch = QuantumWaveBatch.sweep(np.logspace(12, 16, 5), masses)
+    assert len(batch) == 10
+    # Mass-major order: the first five rows share the first mass
+    np.testing.assert_array_equal(batch.particle_mass[:5], masses[0])
+
+    for index in range(len(batch)):
+        wave = batch.wave(index)
+        for name in ('energy', 'momentum', 'wavelength', 'wave_number', 'particle_velocity'):
+            assert getattr(batch, name)[index] == pytest.approx(getattr(wave, name), rel=1e-12)
+        assert batch.phase_velocity[index] == pytest.approx(wave.get_phase_velocity(), rel=1e-12)
+
+
+def test_columns_and_validation():
+    batch = QuantumWaveBatch([1e14, 2e14], amplitudes=[1.0, 2.0])
+    data = batch.to_dict(['frequency', 'amplitude_max'])
+    assert data == {'frequency': [1e14, 2e14], 'amplitude_max': [1.0, 2.0], 'count': 2}
+    with pytest.raises(ValueError, match='Unknown column'):
+        batch.columns(['spin'])
+    with pytest.raises(ValueError, match='positive'):
+        QuantumWaveBatch([1e14, -1.0])
@@ -0,0 +1,42 @@
+import pytest
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Operator
+
+from src.quantum.transpilation import (BASIS_PRESETS, MAX_REPORTED_PASSES, build_pass_manager,
+                                       parse_transpile_options, run_many, run_timed)
+
+
+def sample_circuit():
+    circuit = QuantumCircuit(3)
+    circuit.h(0)
+    circuit.ccx(0, 1, 2)
+    circuit.swap(0, 2)
+    circuit.t(1)
+    return circuit
+
+
+def test_parse_transpile_options():
+    assert parse_transpile_options({}) == {'optimization_level': 2, 'basis': 'simulator'}
+    assert parse_transpile_options({'optimization_level': '0', 'basis': 'ibm'}) == {'optimization_level': 0,
+                                                                                    'basis': 'ibm'}
+    with pytest.raises(ValueError, match='optimization_level'):
+        parse_transpile_options({'optimization_level': 4})
+    with pytest.raises(ValueError, match='Unknown basis'):
+        parse_transpile_options({'basis': 'trapped_ion'})
+
+
+@pytest.mark.parametrize('basis', ['ibm', 'rotations', 'clifford_t'])
+def test_basis_presets_keep_the_unitary(basis):
+    circuit = sample_circuit()
+    transpiled, passes = run_timed(build_pass_manager(optimization_level=1, basis=basis), circuit)
+    assert set(transpiled.count_ops()) <= set(BASIS_PRESETS[basis])
+    assert Operator(transpiled).equiv(Operator(circuit))
+    assert 0 < len(passes) <= MAX_REPORTED_PASSES
+    assert [entry['time'] for entry in passes] == sorted((entry['time'] for entry in passes), reverse=True)
+
+
+def test_run_many_returns_one_circuit_per_input():
+    pass_manager = build_pass_manager(optimization_level=0, basis='ibm')
+    assert len(run_many(pass_manager, [sample_circuit()])) == 1
+    outputs = run_many(pass_manager, [sample_circuit(), QuantumCircuit(1)])
+    assert [output.num_qubits for output in outputs] == [3, 1]
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from src.physics.quantum_wave import PhysicsConstants, QuantumWave
+from src.physics.wave_packet import ELECTRON_VOLT, WavePacketSimulation
+
+
+def test_free_packet_moves_at_the_group_velocity():
+    wave = QuantumWave(1e15, 1.0)
+    simulation = WavePacketSimulation.from_quantum_wave(wave, grid_points=1024)
+    start = simulation.expectation_position()[0]
+    energy = simulation.energy()
+    simulation.step(500)
+
+    velocity = (simulation.expectation_position()[0] - start) / simulation.time
+    assert velocity == pytest.approx(wave.get_group_velocity(), rel=5e-3)
+    assert simulation.norm() == pytest.approx(1.0, abs=1e-12)
+    assert simulation.energy() == pytest.approx(energy, rel=1e-10)
+
+
+def test_barrier_conserves_norm_and_energy_in_2d():
+    simulation = WavePacketSimulation((128, 128), extent=40 * PhysicsConstants.NANOMETER, time_step=2e-17)
+    simulation.set_gaussian_packet((-8e-9, 0.0), 2e-9, (5e9, 0.0))
+    simulation.set_potential('barrier', height=0.5 * ELECTRON_VOLT, width=2e-9)
+    energy = simulation.energy()
+    simulation.step(200)
+    assert simulation.norm() == pytest.approx(1.0, abs=1e-10)
+    assert simulation.energy() == pytest.approx(energy, rel=1e-3)
+
+
+def test_frames_are_strided_copies():
+    simulation = WavePacketSimulation(256)
+    simulation.set_gaussian_packet(0.0, 5e-9, 1e9)
+    frames = list(simulation.frames(3, steps_per_frame=5, stride=4))
+    assert [frame['frame'] for frame in frames] == [0, 1, 2]
+    assert frames[0]['density'].shape == (64,)
+    assert simulation.grid_info(stride=4)['shape'] == [64]
+    assert frames[2]['time'] == pytest.approx(10 * simulation.time_step)
+    assert not np.shares_memory(frames[0]['density'], frames[1]['density'])
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from src.physics.wave_spectrum import (MAX_CACHED_SAMPLES, amplitude_spectrum, analyze_spectrum, frequency_axis,
+                                       time_grid, window)
+
+
+def test_rfft_spectrum_matches_the_full_fft_half():
+    samples, spacing = 1000, 0.01
+    t = np.arange(samples) * spacing
+    values = np.sin(2 * np.pi * 5 * t) + 0.5 * np.cos(2 * np.pi * 12 * t)
+    frequencies, magnitude = amplitude_spectrum(values, spacing)
+    assert len(frequencies) == len(magnitude) == samples // 2
+    np.testing.assert_allclose(frequencies, np.fft.fftfreq(samples, spacing)[:samples // 2])
+    np.testing.assert_allclose(magnitude, np.abs(np.fft.fft(values))[:samples // 2], atol=1e-9)
+    assert sorted(frequencies[np.argsort(magnitude)[-2:]]) == pytest.approx([5.0, 12.0])
+
+
+def test_welch_is_picked_for_long_signals_and_finds_the_peak():
+    spacing = 1e-3
+    t = np.arange(50_000) * spacing
+    values = np.sin(2 * np.pi * 40 * t) + np.random.default_rng(0).normal(0, 1, t.size)
+    result = analyze_spectrum(values, spacing)
+    assert result['method'] == 'welch' and result['kind'] == 'psd'
+    assert len(result['frequencies']) == 1024 // 2 + 1
+    assert result['frequencies'][np.argmax(result['values'])] == pytest.approx(40, abs=1.0)
+
+
+def test_cached_grids_are_read_only():
+    assert time_grid(16) is time_grid(16)
+    for cached in (time_grid(16), frequency_axis(16, 0.1), window('hann', 16)):
+        with pytest.raises(ValueError):
+            cached[0] = 1.0
+    with pytest.raises(ValueError, match='Unknown window'):
+        window('kaiser', 16)
+
+
+def test_long_grids_are_not_cached():
+    samples = MAX_CACHED_SAMPLES + 1
+    assert time_grid(samples) is not time_grid(samples)
+    assert window('hann', samples).shape == (samples,)
+    assert time_grid(samples=16) is time_grid(samples=16)
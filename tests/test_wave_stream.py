@@ -0,0 +1,53 @@
+import json
+import time
+
+import numpy as np
+import pytest
+
+from src.physics.wave_stream import evaluate_wave_type, packet_frames, traveling_wave_frames
+from src.utils.sse import format_sse, paced
+
+
+def test_traveling_wave_frames_follow_the_wave_equation():
+    x = np.linspace(0, 4 * np.pi, 64)
+    frames = traveling_wave_frames(2.0, 1.5, 0.5, 'sine', points=64, num_frames=4, time_per_frame=0.1)
+    for frame in frames:
+        expected = 1.5 * np.sin(2.0 * x + 0.5 * np.pi - 2.0 * frame['time'])
+        np.testing.assert_allclose(frame['values'], expected, atol=1e-6)
+        assert frame['values'].dtype == np.float32
+
+
+def test_kept_frames_are_independent():
+    kept = list(traveling_wave_frames(1.0, 1.0, 0.0, 'sine', points=32, num_frames=3))
+    assert not np.array_equal(kept[0]['values'], kept[2]['values'])
+    _, frames = packet_frames(1.0, num_frames=3, points=128, steps_per_frame=50)
+    kept = list(frames)
+    assert not np.array_equal(kept[0]['values'], kept[2]['values'])
+
+
+@pytest.mark.parametrize('wave_type, expected', [
+    ('cosine', np.cos), ('square', lambda a: np.sign(np.sin(a))), ('probability', lambda a: np.sin(a) ** 2)])
+def test_wave_types(wave_type, expected):
+    argument = np.linspace(0.1, 6, 20)
+    np.testing.assert_allclose(evaluate_wave_type(wave_type, argument, 2.0), 2.0 * expected(argument))
+
+
+def test_packet_frames_keep_the_norm():
+    simulation, frames = packet_frames(1.0, num_frames=5, points=256, steps_per_frame=5)
+    norms = [frame['norm'] for frame in frames]
+    assert len(norms) == 5
+    np.testing.assert_allclose(norms, 1.0, atol=1e-10)
+    assert simulation.time == pytest.approx(20 * simulation.time_step)
+
+
+def test_format_sse_frames_events():
+    message = format_sse({'frame': 3}, event='frame', event_id=3, retry=500)
+    assert message == 'event: frame\nid: 3\nretry: 500\ndata: {"frame":3}\n\n'
+    assert format_sse('a\nb') == 'data: a\ndata: b\n\n'
+    assert json.loads(format_sse([1, 2]).split('data: ')[1]) == [1, 2]
+
+
+def test_paced_limits_the_rate():
+    started = time.monotonic()
+    assert list(paced(range(4), rate=50)) == [0, 1, 2, 3]
+    assert time.monotonic() - started >= 3 / 50 * 0.9